@@ -0,0 +1,89 @@
+# benchmarks/bench_bitsets.py
+"""
+Compara la construcción del DFA global de inputs/lexer.yal con conjuntos de
+posiciones como sets (por defecto) y como máscaras de bits (bitsets=True).
+Mide por separado el árbol sintáctico (firstpos/lastpos) y el DFA (followpos,
+clases y subconjuntos), y comprueba que ambas tablas sean idénticas.
+
+Uso:
+    python benchmarks/bench_bitsets.py [--repeat N] [--copies K] [--literal L]
+
+--copies K repite las reglas K veces para simular una gramática con más posiciones.
+--literal L agrega una regla con un literal de L caracteres: cada estado de
+esa cadena es una máscara con un solo bit, pero tan larga como su posición,
+así que con bitsets el tiempo crece más rápido que con sets a medida que L
+aumenta (con L en decenas de miles, los sets son varias veces más rápidos).
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.controllers.main_controller import expand_rules, rule_marker, rule_postfix
+from src.models.regex_parser import Symbol
+from src.models.syntax_tree import SyntaxTree
+from src.models.dfa import DFA
+from src.models.yalex_parser import YALexParser
+
+
+def global_postfix(rules):
+    """Postfija del DFA global (misma combinación que build_global_dfa)."""
+    postfix = []
+    for i, rule in enumerate(rules):
+        postfix.extend(rule['postfix'])
+        postfix.append(Symbol(rule_marker(i), is_operator=False))
+        postfix.append(Symbol('.', is_operator=True))
+        if i > 0:
+            postfix.append(Symbol('|', is_operator=True))
+    return postfix
+
+
+def best_of(repeat, fn):
+    """Menor tiempo de 'repeat' ejecuciones y el último resultado."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--repeat", type=int, default=20, help="repeticiones (se toma la mejor)")
+    ap.add_argument("--copies", type=int, default=1, help="veces que se repiten las reglas")
+    ap.add_argument("--literal", type=int, default=0, help="largo de un literal extra (0: ninguno)")
+    args = ap.parse_args()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yalex_parser = YALexParser("inputs/lexer.yal")
+        yalex_parser.parse()
+        rules = expand_rules(yalex_parser)
+    rules = rules * args.copies
+    if args.literal:
+        rules.append({'postfix': rule_postfix("x" * args.literal)})
+    postfix = global_postfix(rules)
+
+    results = {}
+    print(f"{'representación':>15} {'árbol ms':>9} {'DFA ms':>9} {'total ms':>9} {'estados':>8}")
+    for name, bitsets in (("sets", False), ("bitsets", True)):
+        t_tree, tree = best_of(args.repeat, lambda: SyntaxTree(postfix, bitsets=bitsets))
+        t_dfa, dfa = best_of(args.repeat, lambda: DFA(tree))
+        results[name] = dfa
+        print(f"{name:>15} {t_tree * 1e3:>9.2f} {t_dfa * 1e3:>9.2f} "
+              f"{(t_tree + t_dfa) * 1e3:>9.2f} {len(dfa.states):>8}")
+
+    same = (results["sets"].class_transitions == results["bitsets"].class_transitions
+            and results["sets"].states == results["bitsets"].states)
+    print("tablas idénticas:", "sí" if same else "NO")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_direct.py
+"""
+Compara tokens/s del lexer con el DFA global recorrido como tabla (modo
+'global') y escrito como código Python (modo 'direct', generate_lexer(direct=True))
+sobre los archivos de inputs/. Comprueba además que ambos modos emitan los
+mismos tokens.
+
+Uso:
+    python benchmarks/bench_direct.py [--repeat N] [--copies K] [archivos...]
+
+--copies K repite el texto de cada archivo K veces para que el tiempo de
+tokenización domine sobre el de construir el lexer.
+"""
+import argparse
+import contextlib
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.controllers.main_controller import generate_lexer
+
+DEFAULT_INPUTS = ["inputs/entrada.txt", "inputs/entrada2.txt"]
+MODES = ("global", "direct")
+
+
+def load_direct_lexer(directory):
+    """Genera un lexer con direct=True en 'directory' y devuelve su clase Lexer."""
+    path = os.path.join(directory, "thelexer_direct.py")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        generate_lexer(output_filename=path, direct=True)
+    spec = importlib.util.spec_from_file_location("thelexer_direct", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.Lexer
+
+
+def best_of(repeat, fns):
+    """
+    Menor tiempo de 'repeat' ejecuciones de cada función y su último
+    resultado: {nombre: (segundos, resultado)}. Las funciones se alternan en
+    cada ronda para que las variaciones de la máquina afecten a todas por igual.
+    """
+    results = {name: (float("inf"), None) for name in fns}
+    for _ in range(repeat):
+        for name, fn in fns.items():
+            start = time.perf_counter()
+            result = fn()
+            results[name] = (min(results[name][0], time.perf_counter() - start), result)
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("inputs", nargs="*", default=DEFAULT_INPUTS, help="archivos a tokenizar")
+    ap.add_argument("--repeat", type=int, default=7, help="repeticiones (se toma la mejor)")
+    ap.add_argument("--copies", type=int, default=200, help="veces que se repite el texto de cada archivo")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        lexer_cls = load_direct_lexer(directory)
+
+    print(f"{'archivo':>20} {'modo':>7} {'tokens':>8} {'tok/s':>12} {'relación':>9}")
+    for filename in args.inputs:
+        with open(filename, encoding="utf-8") as f:
+            text = f.read() * args.copies
+        results = best_of(args.repeat, {
+            mode: lambda mode=mode: lexer_cls(text, mode=mode).get_tokens() for mode in MODES})
+        base_seconds, expected = results["global"]
+        for mode in MODES:
+            seconds, tokens = results[mode]
+            print(f"{os.path.basename(filename):>20} {mode:>7} {len(tokens):>8} "
+                  f"{len(tokens) / seconds:>12.0f} {base_seconds / seconds:>9.2f}")
+        if results["direct"][1] != expected:
+            print(f"tokens distintos entre modos en {filename}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_linear.py
+"""
+Comprueba que el tiempo de lexing crece linealmente con el tamaño de la entrada.
+Parte de --base-kb KB de inputs/entrada2.txt repetido y duplica el tamaño en
+cada paso (--steps veces). Para cada tamaño muestra dos tiempos, en segundos y
+en µs por carácter:
+  lexer  Lexer(texto, mode="global").get_tokens() del thelexer.py generado
+         (acciones y construcción de tokens incluidas)
+  DFA    un recorrido completo de la entrada con
+         DFA.match_prefix_and_token(text, pos, end) del DFA global de
+         depuración (generate_global_dfa), avanzando por índice
+Con el API por desplazamientos (sin text[pos:]) los µs/char de ambas columnas
+deben mantenerse aproximadamente constantes.
+
+Uso:
+    python benchmarks/bench_linear.py [--steps N] [--base-kb K]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.controllers.main_controller import generate_lexer, generate_global_dfa
+
+
+def make_input(sample, size):
+    """Repite el texto de muestra hasta alcanzar 'size' caracteres."""
+    reps = size // len(sample) + 1
+    return (sample * reps)[:size]
+
+
+def time_lexer(lexer_cls, text, mode):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        lexer_cls(text, mode=mode).get_tokens()
+        return time.perf_counter() - start
+
+
+def time_match_prefix(dfa, text):
+    """Escanea toda la entrada con DFA.match_prefix_and_token(text, pos, end) avanzando por índice."""
+    start = time.perf_counter()
+    pos = 0
+    end = len(text)
+    while pos < end:
+        length, _ = dfa.match_prefix_and_token(text, pos, end)
+        pos += length if length > 0 else 1
+    return time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--steps", type=int, default=5, help="número de duplicaciones")
+    ap.add_argument("--base-kb", type=int, default=64, help="tamaño inicial en KB")
+    args = ap.parse_args()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        generate_lexer()
+        global_dfa = generate_global_dfa()
+    from thelexer import Lexer
+
+    with open(os.path.join("inputs", "entrada2.txt"), encoding="utf-8") as f:
+        sample = f.read()
+
+    print(f"{'tamaño':>10} {'lexer s':>9} {'µs/char':>8} {'DFA s':>9} {'µs/char':>8}")
+    for step in range(args.steps):
+        size = args.base_kb * 1024 * (2 ** step)
+        text = make_input(sample, size)
+        t_lexer = time_lexer(Lexer, text, "global")
+        t_dfa = time_match_prefix(global_dfa, text)
+        print(f"{size:>10} {t_lexer:>9.3f} {t_lexer / size * 1e6:>8.3f} "
+              f"{t_dfa:>9.3f} {t_dfa / size * 1e6:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_mindfa.py
+"""
+Escalado de minimize_dfa (Hopcroft, O(m log n)) con DFAs sintéticos.
+Cada DFA se arma a partir de uno aleatorio de n/copias estados, replicado
+'copias' veces con transiciones que saltan al azar entre réplicas; el mínimo
+no puede tener más estados que el DFA base, así también se verifica el resultado.
+
+Uso:
+    python benchmarks/bench_mindfa.py [--sizes 1000,10000,100000] [--classes K] [--copies C]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from src.models.dfa import DFA
+from src.models.mindfa import minimize_dfa
+
+
+def synthetic_dfa(n, classes, copies, seed=0):
+    """DFA de n estados (parcial) con 'classes' clases y estructura repetida 'copies' veces."""
+    rng = random.Random(seed)
+    base = max(1, n // copies)
+    base_rows = [{ c: rng.randrange(base) for c in range(classes) if rng.random() < 0.8 }
+                 for _ in range(base)]
+    base_accepting = { s for s in range(base) if rng.random() < 0.3 }
+
+    dfa = DFA.__new__(DFA)
+    dfa.states = { frozenset({s}): s for s in range(base * copies) }
+    dfa.class_transitions = {
+        copy * base + s: { c: rng.randrange(copies) * base + t for c, t in row.items() }
+        for copy in range(copies)
+        for s, row in enumerate(base_rows)
+    }
+    dfa.accepting_states = { copy * base + s for copy in range(copies) for s in base_accepting }
+    dfa.initial_state = 0
+    dfa.alphabet = { chr(ord('a') + c) for c in range(classes) }
+    dfa.char_classes = [frozenset({chr(ord('a') + c)}) for c in range(classes)]
+    dfa.class_of = { chr(ord('a') + c): c for c in range(classes) }
+    dfa.wide_ranges = []
+    dfa.wide_starts = []
+    dfa.class_ranges = [((ord('a') + c, ord('a') + c),) for c in range(classes)]
+    return dfa, base
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", default="1000,10000,100000",
+                    help="cantidades de estados separadas por coma")
+    ap.add_argument("--classes", type=int, default=8, help="clases de caracteres")
+    ap.add_argument("--copies", type=int, default=4, help="réplicas del DFA base")
+    args = ap.parse_args()
+
+    print(f"{'estados':>9} {'transic.':>9} {'mínimo':>8} {'segundos':>9} {'µs/(m log n)':>13}")
+    for n in (int(size) for size in args.sizes.split(",")):
+        dfa, base = synthetic_dfa(n, args.classes, args.copies)
+        m = sum(len(row) for row in dfa.class_transitions.values())
+        start = time.perf_counter()
+        min_dfa = minimize_dfa(dfa)
+        elapsed = time.perf_counter() - start
+        assert len(min_dfa.states) <= base, "el mínimo no puede superar al DFA base"
+        print(f"{len(dfa.states):>9} {m:>9} {len(min_dfa.states):>8} {elapsed:>9.3f} "
+              f"{elapsed / (m * math.log2(len(dfa.states))) * 1e6:>13.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# benchmarks/bench_suite.py
+"""
+Suite de rendimiento de punta a punta con entradas sintéticas.
+Genera código fuente con las clases de token de inputs/lexer.yal (palabras
+clave, identificadores, números, operadores, puntuación, espacios y saltos
+de línea) en tamaños de 1 KB a 100 MB y mide, para cada tamaño y modo del
+lexer, tokens/s, caracteres/s y memoria pico; además mide la generación
+(generate_lexer en frío y con caché, generate_global_dfa).
+Los resultados se escriben en JSON para comparar corridas entre sí.
+
+Uso:
+    python benchmarks/bench_suite.py [--sizes 1K,10K,100K,1M,10M,100M] [--modes global,rules]
+                                     [--output resultados.json] [--baseline anterior.json]
+                                     [--no-memory] [--seed S]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.controllers.main_controller import (generate_lexer, generate_global_dfa, GENERATOR_VERSION,
+                                             MEMOS, memo_stats)
+
+DEFAULT_SIZES = "1K,10K,100K,1M,10M,100M"
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+# Clases de token de inputs/lexer.yal
+KEYWORDS = ["if", "else", "while", "for", "return", "break", "continue"]
+OPERATORS = [":=", "+", "-", "*", "/", "(", ")", ",", ";", ":", "<", "=", ">", "{", "}", "#"]
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+ALNUM = LETTERS + "0123456789_"
+
+
+def parse_size(text):
+    """'100K' -> 102400; también acepta bytes sin unidad."""
+    text = text.strip().upper()
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def random_token(rng):
+    kind = rng.random()
+    if kind < 0.15:
+        return rng.choice(KEYWORDS)
+    if kind < 0.50:
+        return rng.choice(LETTERS) + "".join(rng.choice(ALNUM) for _ in range(rng.randrange(8)))
+    if kind < 0.70:
+        number = str(rng.randrange(10 ** rng.randrange(1, 6)))
+        if rng.random() < 0.4:
+            number += "." + str(rng.randrange(1000))
+            if rng.random() < 0.3:
+                number += "E" + rng.choice(["", "+", "-"]) + str(rng.randrange(1, 40))
+        return number
+    return rng.choice(OPERATORS)
+
+
+def synthetic_source(size, seed=0):
+    """Texto de exactamente 'size' caracteres, reproducible con la misma semilla."""
+    rng = random.Random(seed)
+    # Se arma un bloque de ~64 KB y se repite: generar 100 MB token a token
+    # tardaría más que tokenizarlos
+    lines = []
+    length = 0
+    while length < min(size, 1 << 16):
+        line = " ".join(random_token(rng) for _ in range(rng.randrange(1, 12)))
+        if rng.random() < 0.2:
+            line = "\t" + line
+        lines.append(line + "\n")
+        length += len(line) + 1
+    block = "".join(lines)
+    return (block * (size // len(block) + 1))[:size]
+
+
+def count_tokens(lexer_cls, text, mode):
+    """Recorre tokens() sin acumular la lista (el lexer no traza por defecto)."""
+    count = 0
+    for _ in lexer_cls(text, mode=mode).tokens():
+        count += 1
+    return count
+
+
+def bench_lexer(lexer_cls, text, mode, memory):
+    start = time.perf_counter()
+    tokens = count_tokens(lexer_cls, text, mode)
+    seconds = time.perf_counter() - start
+    result = {
+        "size": len(text),
+        "mode": mode,
+        "tokens": tokens,
+        "seconds": seconds,
+        "tokens_per_sec": tokens / seconds if seconds else None,
+        "chars_per_sec": len(text) / seconds if seconds else None,
+    }
+    if memory:
+        # Corrida aparte: tracemalloc hace más lento el lexer y no debe afectar la medición de tiempo
+        tracemalloc.start()
+        count_tokens(lexer_cls, text, mode)
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def bench_generation():
+    """
+    Tiempo de generate_lexer en frío, con las memorias en proceso y con caché,
+    y de generate_global_dfa.
+    """
+    for memo in MEMOS:
+        memo.clear()
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "thelexer.py")
+        cache_dir = os.path.join(tmp, "cache")
+        return {
+            "generate_lexer_cold_s": timed(generate_lexer, output_filename=output, cache_dir=None),
+            "generate_lexer_memo_s": timed(generate_lexer, output_filename=output, cache_dir=None),
+            "generate_lexer_store_s": timed(generate_lexer, output_filename=output, cache_dir=cache_dir),
+            "generate_lexer_warm_s": timed(generate_lexer, output_filename=output, cache_dir=cache_dir),
+            "generate_global_dfa_s": timed(generate_global_dfa),
+            "memo": memo_stats(),
+        }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(results, baseline):
+    """Relación de tokens/s contra una corrida anterior (> 1 es más rápido)."""
+    previous = { (r["size"], r["mode"]): r for r in baseline.get("lexer", []) }
+    print(f"\n{'tamaño':>10} {'modo':>7} {'tok/s antes':>12} {'tok/s ahora':>12} {'relación':>9}")
+    for r in results["lexer"]:
+        old = previous.get((r["size"], r["mode"]))
+        if old and old["tokens_per_sec"] and r["tokens_per_sec"]:
+            print(f"{r['size']:>10} {r['mode']:>7} {old['tokens_per_sec']:>12.0f} "
+                  f"{r['tokens_per_sec']:>12.0f} {r['tokens_per_sec'] / old['tokens_per_sec']:>9.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", default=DEFAULT_SIZES, help="tamaños separados por comas (K, M, G)")
+    ap.add_argument("--modes", default="global", help="modos del lexer separados por comas")
+    ap.add_argument("--seed", type=int, default=0, help="semilla de las entradas sintéticas")
+    ap.add_argument("--no-memory", action="store_true", help="no medir la memoria pico")
+    ap.add_argument("--output", default=None, help="archivo JSON de resultados (por defecto, stdout)")
+    ap.add_argument("--baseline", default=None, help="JSON de una corrida anterior para comparar")
+    args = ap.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "generator_version": GENERATOR_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "generation": bench_generation(),
+        "lexer": [],
+    }
+    generate_lexer()
+    from thelexer import Lexer
+
+    for size in (parse_size(s) for s in args.sizes.split(",")):
+        text = synthetic_source(size, args.seed)
+        for mode in args.modes.split(","):
+            r = bench_lexer(Lexer, text, mode, not args.no_memory)
+            results["lexer"].append(r)
+            print(f"{size:>10} {mode:>7} {r['tokens']:>10} tokens {r['seconds']:>8.3f} s "
+                  f"{r['tokens_per_sec']:>10.0f} tok/s", file=sys.stderr)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            print_comparison(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,6 @@ if __name__ == "__main__":
     # global_dfa = generate_global_dfa()
     # min_dfa = minimize_dfa(global_dfa)
     # render_mindfa(min_dfa, "global_dfa_minimized")
-    generate_lexer()
+    generate_lexer(trace=print)
 
     # run_app()
\ No newline at end of file
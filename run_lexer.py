@@ -1,5 +1,7 @@
 import sys
 import os
+import argparse
+import mmap
 from src.controllers.main_controller import generate_lexer, generate_global_dfa
 
 # Asegurarnos de que el directorio raíz y 'src' estén en el path
@@ -7,40 +9,91 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
 
 
-# Generar (o actualizar) el analizador léxico a partir de la especificación YALex
-generate_lexer()
+def main():
+    args = parse_args()
 
-from thelexer import Lexer
+    # Generar (o actualizar) el analizador léxico a partir de la especificación YALex.
+    # Se hace dentro de main: los procesos de --workers importan este módulo
+    trace = print if args.verbose else None
+    generate_lexer(workers=args.workers, trace=trace, lazy=args.lazy, direct=args.direct)
+    from thelexer import Lexer
 
-def main():
-    # 2) Construir y renderizar el DFA global para depuración
-    try:
-        global_dfa = generate_global_dfa()
-        print("DFA global construido con éxito.")
-    except Exception as e:
-        print(f"No pude generar el DFA global: {e}")
+    # 2) Construir y renderizar el DFA global para depuración (sólo si se pide:
+    #    con la caché de compilación el lexer ya no necesita construir ningún DFA)
+    if args.global_dfa:
+        try:
+            global_dfa = generate_global_dfa(trace=trace)
+            print("DFA global construido con éxito.")
+        except Exception as e:
+            print(f"No pude generar el DFA global: {e}")
 
     # Si no se pasa un archivo de entrada, usamos uno por defecto en 'inputs'
-    if len(sys.argv) < 2:
+    if args.input_file is None:
         default_input_file = os.path.join("inputs", "entrada.txt")
         print(f"No se especificó archivo de entrada. Usando '{default_input_file}' por defecto.")
         input_file = default_input_file
     else:
-        input_file = sys.argv[1]
+        input_file = args.input_file
     
     if not os.path.exists(input_file):
         print(f"Error: El archivo '{input_file}' no existe.")
         sys.exit(1)
     
-    with open(input_file, "r", encoding="utf-8") as f:
-        entrada = f.read()
-    
-    lexer = Lexer(entrada)
-    tokens = lexer.get_tokens()
-    
     print("Tokens reconocidos:")
-    for token in tokens:
-        print(token)
+    if args.workers and args.workers > 1 and os.path.getsize(input_file) > 0:
+        # Se corta el archivo en SYNC_CHARS y cada tramo se tokeniza en un proceso
+        with open(input_file, "rb") as f, \
+             mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            lexer = Lexer(data)
+            for token in lexer.parallel_tokens(args.workers):
+                print(token)
+    elif args.mmap and os.path.getsize(input_file) > 0:
+        # El archivo se mapea en memoria y se recorre como bytes: no se decodifica completo
+        with open(input_file, "rb") as f, \
+             mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            lexer = Lexer(data, stats=args.stats, trace=trace)
+            for token in lexer.tokens():
+                print(token)
+    else:
+        # Se tokeniza por bloques: ni la entrada ni la lista de tokens se cargan completas en memoria
+        lexer = Lexer(stats=args.stats, trace=trace)
+        with open(input_file, "r", encoding="utf-8") as f:
+            for token in lexer.iter_tokens(f):
+                print(token)
+    if args.stats and lexer.stats is not None:
+        print("\nEstadísticas del lexer:", file=sys.stderr)
+        print(lexer.stats, file=sys.stderr)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Genera el lexer a partir de inputs/lexer.yal y tokeniza un archivo de entrada.")
+    parser.add_argument("input_file", nargs="?", default=None,
+                        help="archivo a tokenizar (por defecto inputs/entrada.txt)")
+    parser.add_argument("--mmap", action="store_true",
+                        help="mapear el archivo en memoria y recorrerlo como bytes UTF-8")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos para construir los DFAs y tokenizar la entrada en paralelo")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="mostrar la traza del generador y una línea por token reconocido (sin --workers)")
+    parser.add_argument("--stats", action="store_true",
+                        help="contar reglas, transiciones y tiempos y mostrarlos al final (sin --workers)")
+    parser.add_argument("--global-dfa", action="store_true",
+                        help="construir también el DFA global de depuración")
+    parser.add_argument("--lazy", action="store_true",
+                        help="generar el lexer con el DFA global perezoso (estados construidos al tokenizar)")
+    parser.add_argument("--direct", action="store_true",
+                        help="generar el lexer con el DFA global escrito como código Python")
+    args = parser.parse_args()
+    if args.lazy and args.direct:
+        parser.error("--lazy y --direct no se pueden combinar")
+    if args.workers and args.workers > 1 and (args.stats or args.verbose):
+        # Cada tramo se tokeniza en otro proceso: sus contadores y su traza no vuelven
+        parser.error("--stats y -v no se combinan con --workers")
+    for flag in ("lazy", "direct"):
+        if getattr(args, flag) and (args.mmap or (args.workers and args.workers > 1)):
+            parser.error(f"--{flag} sólo tokeniza texto: no se combina con --mmap ni con --workers")
+    return args
 
 if __name__ == "__main__":
     main()
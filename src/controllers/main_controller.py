@@ -2,137 +2,435 @@
 
 import os
 import re
-import contextlib, io
+import io
 import textwrap
-from src.models.regex_parser import RegexParser
+from concurrent.futures import ProcessPoolExecutor
+from src.models.regex_parser import RegexParser, Symbol
 from src.models.syntax_tree import SyntaxTree
 from src.models.dfa import DFA
 from src.models.yalex_parser import YALexParser
 from src.models.mindfa import minimize_dfa
+from src.generators.compile_cache import CompileCache, DEFAULT_CACHE_DIR
+from src.generators.lru_memo import LRUMemo
+from src.generators.direct_scanner import format_direct_scanner, DIRECT_FUNCTION
+from src.runtime.lexer_interface import range_class
 
+# Versión del generador: forma parte de la clave de la caché de compilación.
+# Hay que incrementarla cada vez que cambie el formato o el contenido de las tablas.
+GENERATOR_VERSION = "4"
 
-def generate_global_dfa():
+
+def table_weight(table):
+    """Peso de una tabla para las memorias: clases, rangos y entradas de transición (o posiciones)."""
+    rows = table.get('transitions') or table.get('positions') or {}
+    return len(table['classes']) + len(table['ranges']) + sum(len(row) for row in rows.values())
+
+
+# Memorias en proceso (LRU, acotadas por peso): una regla ya parseada o
+# compilada en este proceso no se vuelve a procesar, aunque cambie el resto
+# de la especificación o la caché en disco esté desactivada.
+# Postfijas por (regex, definiciones): (regex normalizada, postfija, definiciones usadas)
+PARSE_MEMO = LRUMemo("postfijas", weight=lambda entry: len(entry[1]))
+# Tabla mínima de una regla por rule_key
+TABLE_MEMO = LRUMemo("tablas de reglas", weight=table_weight)
+# Tabla del DFA global por (rule_key de cada regla, lazy)
+GLOBAL_MEMO = LRUMemo("DFA global", max_entries=16, max_weight=1 << 22, weight=table_weight)
+MEMOS = (PARSE_MEMO, TABLE_MEMO, GLOBAL_MEMO)
+
+
+def memo_stats():
+    """Estadísticas de las memorias del generador: {nombre: LRUMemo.stats()}."""
+    return { memo.name: memo.stats() for memo in MEMOS }
+
+
+def expand_rules(yalex_parser):
+    """
+    Parsea la regex de cada regla del .yal, con sus literales escapados, a
+    notación postfija ('postfix'). Los nombres de definiciones no se sustituyen
+    por su texto: quedan como referencias a la postfija de cada definición,
+    parseada una sola vez (YALexParser.parse_definitions), y 'definitions'
+    guarda el texto de las definiciones que la regla usa.
+    Devuelve [{'order', 'regex', 'action', 'postfix', 'definitions'}] en orden
+    de prioridad; la misma lista alimenta los DFAs por regla y el DFA global,
+    así ambos reconocen exactamente el mismo lenguaje.
+    Una regla ya parseada con las mismas definiciones sale de PARSE_MEMO.
+    """
+    definitions_key = tuple(yalex_parser.definitions.items())
+    rules = []
+    for idx, (regex_str, action_code) in enumerate(yalex_parser.rules, start=1):
+        # Limpieza de la regex: eliminar '|' inicial y espacios
+        regex_str_clean = regex_str.lstrip("| ").strip()
+        if not regex_str_clean:
+            continue
+        regex, postfix, uses = PARSE_MEMO.get_or_compute(
+            (regex_str_clean, definitions_key),
+            lambda: parse_rule(yalex_parser, regex_str_clean))
+        rules.append({
+            'order': idx,
+            'regex': regex,
+            'action': action_code,
+            'postfix': postfix,
+            'definitions': { ident: yalex_parser.definitions[ident] for ident in uses },
+        })
+    return rules
+
+
+def parse_rule(yalex_parser, regex_str_clean):
+    """
+    Regex normalizada (literales escapados, sin saltos de línea), postfija y
+    definiciones usadas de una regla; ver expand_rules.
+    """
+    uses = []
+    # 1) Si la regla es exactamente un literal entre comillas,
+    #    tratamos el salto de línea '\n' como un escape especial
+    if (regex_str_clean.startswith("'") and regex_str_clean.endswith("'")) \
+    or (regex_str_clean.startswith('"') and regex_str_clean.endswith('"')):
+        lit = regex_str_clean[1:-1]
+        if lit == r"\n":
+            # queremos un único backslash-n para que el parser lo convierta a '\n'
+            escaped = r"\n"
+        else:
+            escaped = re.escape(lit)
+        # 2) Quitar saltos de línea (sin tocar espacios)
+        regex = escaped.replace("\n", "")
+        postfix = rule_postfix(regex)
+    else:
+        # 2) Quitar saltos de línea; el tokenizador escapa los literales
+        #    incrustados y reconoce los nombres de definiciones
+        regex = regex_str_clean.replace("\n", "")
+        r_parser = RegexParser(regex, yalex_parser.parse_definitions())
+        r_parser.tokenize()
+        postfix = r_parser.to_postfix()
+        uses = yalex_parser.dependencies(r_parser.references)
+    return regex, postfix, uses
+
+
+def rule_key(rule):
+    """
+    Lo que determina el lenguaje de una regla: su regex y el texto de las
+    definiciones que usa (su acción no cuenta).
+    """
+    return rule['regex'], tuple(sorted(rule.get('definitions', {}).items()))
+
+
+def rule_marker(index):
+    """
+    Marcador interno de la regla 'index' dentro del DFA global.
+    Se toman del área de uso privado de Unicode para no chocar con
+    caracteres reales de la entrada.
+    """
+    return chr(0xE000 + index)
+
+
+def rule_postfix(regex, definitions=None):
+    """Notación postfija de la regex de una regla (sin centinela); ver RegexParser."""
+    r_parser = RegexParser(regex, definitions)
+    r_parser.tokenize()
+    return r_parser.to_postfix()
+
+
+def build_global_dfa(rules, bitsets=False, lazy=False):
+    """
+    Combina las reglas ya expandidas en un único DFA: cada regla termina en su
+    propio marcador y todas se unen por alternancia. La unión se hace sobre la
+    notación postfija de cada regla, así los marcadores nunca pasan por el tokenizador.
+    Si una regla ya trae su 'postfix' (compile_spec), no se vuelve a parsear.
+    Con bitsets=True los conjuntos de posiciones se representan como máscaras de bits.
+    Con lazy=True no se construyen los estados (ver lazy_global_table).
+    """
+    global_postfix = []
+    marker_to_rule = {}
+    for i, rule in enumerate(rules):
+        marker = rule_marker(i)
+        marker_to_rule[marker] = {'order': i, 'action': rule['action']}
+        global_postfix.extend(rule.get('postfix') or rule_postfix(rule['regex']))
+        global_postfix.append(Symbol(marker, is_operator=False))
+        global_postfix.append(Symbol('.', is_operator=True))
+        if i > 0:
+            global_postfix.append(Symbol('|', is_operator=True))
+
+    syntax_tree = SyntaxTree(global_postfix, bitsets=bitsets)
+    global_dfa = DFA(syntax_tree, lazy=lazy)
+    if lazy:
+        global_dfa.marker_to_rule = marker_to_rule
+        return global_dfa
+    # Estados de aceptación = estados con algún marcador; cada uno queda
+    # asociado a la regla más prioritaria que contiene
+    global_dfa.assign_rule_markers(marker_to_rule)
+    return global_dfa
+
+
+def no_trace(message):
+    """Destino de traza por defecto del generador: descarta los mensajes."""
+
+
+def generate_global_dfa(trace=None):
     """
     Genera un DFA global a partir de la especificación en 'inputs/lexer.yal',
     asignando un marcador único a cada regla y combinándolas en una única expresión regular.
+    'trace' recibe los mensajes de depuración (por ejemplo print); por defecto no se muestra nada.
     """
+    trace = trace or no_trace
     spec_filename = "inputs/lexer.yal"
     yalex_parser = YALexParser(spec_filename)
     yalex_parser.parse()
-    
-    global_rules = []
-    marker_to_rule = {}
-    
-    special = {
-        '#': r'\#',
-        '.': r'\.',
-        '{': r'\{',
-        '}': r'\}',
-    }
 
-    for i, (regex_str, action_code) in enumerate(yalex_parser.rules):
-        regex_clean = regex_str.lstrip("| ").strip()
-        if not regex_clean:
-            continue
+    rules = expand_rules(yalex_parser)
+    for i, rule in enumerate(rules):
+        # Depuración extra para ver qué estamos recibiendo
+        trace(f"[RAW   ] Regla {i+1}: regex={rule['regex']!r}")
 
-        if regex_clean == "ws":
-            # expandimos la definición y la metemos tal cual:
-            expanded = yalex_parser.expand_definitions("ws").replace("\n", "").strip()
-            # No la escapamos ni tocamos más, porque es algo como "(([' ' '\t'])+)"
-            escaped = expanded
-            # Y seguimos con el flujo normal de marcado…
-        else:
-            expanded = yalex_parser.expand_definitions(regex_clean).replace("\n", "").strip()
+    # Expresión global equivalente (sólo para depuración)
+    if trace is not no_trace:
+        global_regex = "|".join(f"(({rule['regex']}){rule_marker(i)})" for i, rule in enumerate(rules))
+        trace(f"Expresión global generada: {global_regex}")
+        trace(f"Expresión global generada (repr): {global_regex!r}")
 
-        # Depuración extra para ver qué estamos recibiendo
-        print(f"[RAW   ] Regla {i+1}: regex_str={regex_str!r}, expanded={expanded!r}")
-
-        # Caso A: literal entre comillas
-        if expanded == "'":
-            # un solo apóstrofo: lo representamos como carácter escapado \'
-            escaped = r"\'"
-            # print(f"[SPECIAL] Regla {i+1}: literal suelto {expanded!r} → escaped={escaped!r}")
-        elif expanded == '"':
-            # una sola comilla doble → \"
-            escaped = r'\"'
-            # print(f"[SPECIAL] Regla {i+1}: literal suelto {expanded!r} → escaped={escaped!r}")
-            lit = expanded[1:-1]
-            if lit == r"\n":
-                escaped = r"\n"
-            else:
-                escaped = special.get(lit, re.escape(lit))
-
-        # Caso B: cualquier carácter único no alfanumérico
-        elif len(expanded) == 1 and not expanded.isalnum():
-            escaped = special.get(expanded, re.escape(expanded))
-
-        # Caso C: expresiones más complejas
-        else:
-            escaped = re.sub(r'"([^"]*)"', lambda m: re.escape(m.group(1)), expanded)
-            escaped = re.sub(r"'([^']*)'", lambda m: re.escape(m.group(1)), escaped)
-
-        # Vuelta de depuración para verificar
-        # print(f"[ESCAPED] Regla {i+1}: escaped={escaped!r}")
-
-        # Marcador y resto idéntico al tuyo…
-        marker = chr(128 + i)
-        marker_to_rule[marker] = {'order': i, 'action': action_code}
-        '''
-        # ——— DEPURACIÓN: tokenización del trozo completo ———
-        debug_regex = escaped + "#"
-        print(f"[DEBUG] Regla {i+1}: expresion a tokenizar → {debug_regex!r}")
-        try:
-            tokens = RegexParser(debug_regex).tokenize()
-            print(f"[DEBUG] Tokens: {[str(t) for t in tokens]}")
-        except ValueError as e:
-            print(f"[ERROR] fallo tokenizando regla {i+1}: {e}")
-            raise
-        # ——— fin depuración ———
-        '''
-        global_rules.append(f"{escaped}{marker}")
+    global_dfa = build_global_dfa(rules)
 
-    
-    # Combina todas las expresiones en una única expresión global con alternancia
-    global_regex = "|".join(f"({r})" for r in global_rules)
-    print("Expresión global generada:", global_regex)
-    
-    
-    # Remueve cualquier salto de línea que pueda quedar en la expresión global —> Comentado para no romper literales \n, \t dentro de []
-    # global_regex = global_regex.replace("\n", "").replace("\r", "").strip()
-    print("Expresión global generada (repr):", repr(global_regex))
-    
-    # Procesar la expresión global: tokenizar, convertir a postfix, construir árbol y DFA
-    r_parser = RegexParser(global_regex)
-    r_parser.tokenize()
-    postfix = r_parser.to_postfix()
-    syntax_tree = SyntaxTree(postfix)
-    global_dfa = DFA(syntax_tree)
-    
-    # Asigna el mapeo de marcadores al DFA
-    global_dfa.marker_to_rule = marker_to_rule
-    # Crea una estructura para mapear cada ID de estado a su conjunto de posiciones
-    global_dfa.state_sets = {state_id: state_set for state_set, state_id in global_dfa.states.items()}
-    
     # Genera la imagen del DFA global en la carpeta 'imagenes' con Graphviz
     # global_dfa.render_dfa("global_dfa")
     
     return global_dfa
 
 
-def generate_lexer():
+def dfa_table(dfa):
     """
-    Genera el archivo 'thelexer.py' a partir de la especificación YALex.
-    Combina el header, la generación de DFAs para cada regla con su acción asociada y el trailer.
+    Extrae de un DFA su tabla de ejecución como datos planos (sólo dicts,
+    listas y enteros): es lo que se escribe en thelexer.py y lo que guarda
+    la caché de compilación. 'accepting' es el conjunto de estados de aceptación.
+    """
+    return {
+        'initial': dfa.initial_state,
+        'accepting': frozenset(dfa.accepting_states),
+        'classes': dict(sorted(dfa.class_of.items(), key=lambda item: (item[1], item[0]))),
+        'ranges': list(dfa.wide_ranges),
+        'transitions': { state_id: dict(sorted(row.items()))
+                         for state_id, row in sorted(dfa.class_transitions.items()) },
+    }
+
+
+def global_table(global_dfa):
+    """
+    Como dfa_table, pero 'accepting' mapea cada estado de aceptación al
+    índice (en RULES) de la regla que gana en él.
+    """
+    table = dfa_table(global_dfa)
+    table['accepting'] = { state_id: global_dfa.marker_to_rule[marker]['order']
+                           for state_id, marker in sorted(global_dfa.state_rule.items()) }
+    return table
+
+
+def sync_chars(tables, punctuations=()):
+    """
+    Caracteres tras los cuales siempre termina un token, en todas las tablas:
+    toda transición por su clase lleva a un estado sin salidas (o no tienen
+    transición, y entonces se reconocen solos como puntuación). Un token
+    nunca cruza el límite justo después de uno de ellos, así que la entrada
+    puede cortarse ahí y tokenizarse por tramos.
+    Se descartan los que puede consumir el atajo de números del runtime.
+    Una tabla perezosa (lazy_global_table) no tiene estados: ahí el carácter
+    es seguro si el followpos de cada posición de su clase sólo tiene
+    posiciones sin clases (marcadores).
+    """
+    candidates = { ch for table in tables for ch in table['classes'] if len(ch) == 1 }
+    candidates.update(ch for ch in punctuations if len(ch) == 1)
+    safe = set()
+    for ch in candidates:
+        if ch.isdigit() or ch in ".eE+-":
+            continue  # alfabeto de NUMBER_FAST_PATH
+        for table in tables:
+            class_id = table['classes'].get(ch)
+            if class_id is None:
+                class_id = range_class(table['ranges'], ch)
+            if class_id is None:
+                continue
+            if 'positions' in table:
+                positions = table['positions']
+                # 'positions' sólo lista posiciones con clases: las demás son marcadores
+                if any(follow in positions
+                       for class_ids, follows in positions.values() if class_id in class_ids
+                       for follow in follows):
+                    break
+                continue
+            transitions = table['transitions']
+            if class_id is not None and any(transitions[row[class_id]]
+                                            for row in transitions.values() if class_id in row):
+                break
+        else:
+            safe.add(ch)
+    return frozenset(safe)
+
+
+def lazy_global_table(global_dfa):
+    """
+    Datos del DFA global para el modo 'lazy' del runtime (LazyDFA): followpos
+    y clases por posición, y la regla (índice en RULES) de cada posición marcador.
+    """
+    accept = { pos: global_dfa.marker_to_rule[sym]['order']
+               for pos, sym in global_dfa.pos_to_symbol.items()
+               if sym in global_dfa.marker_to_rule }
+    return global_dfa.lazy_table(accept)
+
+
+def format_classes(table, indent):
+    """
+    Serializa el mapa símbolo → clase (una línea por clase) y los rangos
+    anchos de una tabla, ordenados para que la salida sea estable.
+    """
+    pad = " " * indent
+    symbols_by_class = {}
+    for sym, class_id in table['classes'].items():
+        symbols_by_class.setdefault(class_id, []).append(sym)
+    lines = [f"{pad}'classes': {{\n"]
+    for class_id in sorted(symbols_by_class):
+        row = ", ".join(f"{sym!r}: {class_id}" for sym in sorted(symbols_by_class[class_id]))
+        lines.append(f"{pad}    {row},\n")
+    lines.append(f"{pad}}},\n")
+    # Rangos anchos (inicio, fin, clase), ordenados: se buscan por bisección
+    ranges = ", ".join(f"(0x{lo:04X}, 0x{hi:04X}, {class_id})"
+                       for lo, hi, class_id in table['ranges'])
+    lines.append(f"{pad}'ranges': [{ranges}],\n")
+    return "".join(lines)
+
+
+def format_class_tables(table, indent):
+    """
+    Serializa las clases y rangos (format_classes) y las transiciones por
+    clase de una tabla (una línea por estado).
+    """
+    pad = " " * indent
+    lines = [format_classes(table, indent)]
+    lines.append(f"{pad}'transitions': {{\n")
+    for state_id in sorted(table['transitions']):
+        row = ", ".join(f"{class_id}: {target}"
+                        for class_id, target in sorted(table['transitions'][state_id].items()))
+        lines.append(f"{pad}    {state_id}: {{{row}}},\n")
+    lines.append(f"{pad}}},\n")
+    return "".join(lines)
+
+
+def format_action(index, action_code):
+    """
+    Convierte el código de una acción YALex en una función del módulo generado,
+    _action_<index>(lexeme, text). Se compila aquí para que un error de sintaxis
+    en la acción se informe al generar y no al tokenizar.
+    """
+    lines = action_code.strip().splitlines() or ["return None"]
+    # La primera línea viene pegada a la llave; el resto conserva su sangría relativa
+    body = "\n".join([lines[0].strip(), textwrap.dedent("\n".join(lines[1:]))]).strip()
+    source = f"def _action_{index}(lexeme, text):\n{textwrap.indent(body, '    ')}\n"
+    try:
+        compile(source, f"<acción de la regla {index}>", "exec")
+    except SyntaxError as e:
+        raise ValueError(f"Acción inválida en la regla {index}: {action_code!r} ({e.msg})") from e
+    return source
+
+
+def format_rule_table(rule):
+    """
+    Serializa la tabla de una regla como literal de Python para thelexer.py.
+    """
+    table = rule['table']
+    lines = ["    {\n"]
+    lines.append(f"        'regex': {rule['regex']!r},\n")
+    lines.append(f"        'action': {rule['action']!r},\n")
+    lines.append(f"        'initial': {table['initial']!r},\n")
+    lines.append(f"        'accepting': frozenset({sorted(table['accepting'])!r}),\n")
+    lines.append(format_class_tables(table, 8))
+    lines.append("    },\n")
+    return "".join(lines)
+
+
+def format_global_table(table):
+    """
+    Serializa la tabla del DFA global como literal de Python. 'accepting' mapea
+    cada estado de aceptación al índice (en RULES) de la regla que gana en él.
+    """
+    lines = ["GLOBAL_DFA = {\n"]
+    lines.append(f"    'initial': {table['initial']!r},\n")
+    lines.append("    'accepting': {\n")
+    for state_id, order in sorted(table['accepting'].items()):
+        lines.append(f"        {state_id}: {order},\n")
+    lines.append("    },\n")
+    lines.append(format_class_tables(table, 4))
+    lines.append("}\n")
+    return "".join(lines)
+
+
+def format_lazy_table(table):
+    """
+    Serializa los datos del DFA global perezoso (lazy_global_table): por cada
+    posición, sus clases y su followpos; y la regla de cada posición marcador.
+    """
+    lines = ["LAZY_DFA = {\n"]
+    lines.append(f"    'initial': {table['initial']!r},\n")
+    lines.append(format_classes(table, 4))
+    lines.append("    'positions': {\n")
+    for pos, (class_ids, follow) in sorted(table['positions'].items()):
+        lines.append(f"        {pos}: ({class_ids!r}, {follow!r}),\n")
+    lines.append("    },\n")
+    lines.append("    'accept': {\n")
+    for pos, order in sorted(table['accept'].items()):
+        lines.append(f"        {pos}: {order},\n")
+    lines.append("    },\n")
+    lines.append("}\n")
+    return "".join(lines)
+
+
+def compile_rule_table(postfix):
+    """
+    Construye la tabla mínima de una regla a partir de su postfija. Es una
+    función de módulo con resultado plano para poder ejecutarla en otro
+    proceso (compile_spec con workers).
+    """
+    # Añadir centinela '#' al final y construir el DFA para la regla
+    syntax_tree = SyntaxTree(postfix + [Symbol('#', is_operator=False), Symbol('.', is_operator=True)])
+    # Se emite la tabla mínima: mismo lenguaje, menos estados
+    return dfa_table(minimize_dfa(DFA(syntax_tree)))
+
+
+def compile_rule(rule):
+    """Agrega a la regla su 'table' (ver compile_rule_table)."""
+    rule['table'] = compile_rule_table(rule['postfix'])
+
+
+def compile_global_table(rules, lazy=False):
+    """
+    DFA global: un único recorrido por token, la prioridad sale de su tabla.
+    La minimización parte de un bloque por regla ganadora, así la tabla
+    mínima sigue sabiendo qué regla acepta en cada estado.
+    Con lazy=True no se construye ningún estado: se devuelven los datos por
+    posición (lazy_global_table) que el runtime usa para construirlos al vuelo.
+    """
+    if lazy:
+        return lazy_global_table(build_global_dfa(rules, lazy=True))
+    return global_table(minimize_dfa(build_global_dfa(rules)))
+
+
+def compile_spec(spec_filename, previous=None, workers=None, trace=None, lazy=False):
+    """
+    Parte costosa de la generación: lee la especificación YALex y construye
+    (y minimiza) el DFA de cada regla y el DFA global.
+    Devuelve sólo datos planos (header, definiciones, puntuaciones, reglas con
+    su tabla y la tabla global), que pueden guardarse en la caché de compilación.
+
+    'previous' es el resultado de una compilación anterior de la misma
+    especificación: sólo se reconstruyen las reglas cuya regex, o alguna de
+    las definiciones que usa, cambió (la tabla de una regla no depende de su
+    acción), y el DFA global sólo si cambió alguna de ellas o su orden. Editar una acción no construye
+    ningún DFA.
+
+    Con workers > 1 las reglas pendientes y el DFA global se construyen en
+    paralelo en un ProcessPoolExecutor; los resultados se recogen en el orden
+    de las reglas, así la salida es la misma que en secuencia.
+    'trace' recibe los mensajes de progreso (por defecto no se muestran).
+    Las tablas ya compiladas en este proceso salen de TABLE_MEMO y GLOBAL_MEMO.
+    Con lazy=True 'global' lleva los datos del DFA global perezoso en lugar
+    de su tabla (ver compile_global_table).
     """
-    spec_filename = "inputs/lexer.yal"
     yalex_parser = YALexParser(spec_filename)
     yalex_parser.parse()
-    print("Header extraído:")
-    print(yalex_parser.header_code)
-    print("\nDefiniciones encontradas:")
-    for ident, definition in yalex_parser.definitions.items():
-        print(f"  {ident} = {definition}")
-    # print("\nReglas encontradas:")
 
     punct_map = {}
     for regex_str, action_code in yalex_parser.rules:
@@ -144,86 +442,89 @@ def generate_lexer():
             if m:
                 punct_map[char] = m.group(1)
         
-    rules = []
-    for idx, (regex_str, action_code) in enumerate(yalex_parser.rules, start=1):
-        # Limpieza de la regex: eliminar '|' inicial y espacios
-        regex_str_clean = regex_str.lstrip("| ").strip()
-        if not regex_str_clean:
-            continue
-        # 1) Expandir definiciones
-        expanded_regex = yalex_parser.expand_definitions(regex_str_clean)
-        # 2) Si la regla es exactamente un literal entre comillas,
-        #    tratamos el salto de línea '\n' como un escape especial
-        if (expanded_regex.startswith("'") and expanded_regex.endswith("'")) \
-        or (expanded_regex.startswith('"') and expanded_regex.endswith('"')):
-            lit = expanded_regex[1:-1]
-            if lit == r"\n":
-                # queremos un único backslash-n para que el parser lo convierta a '\n'
-                escaped = r"\n"
-            else:
-                escaped = re.escape(lit)
-            expanded_regex = escaped
+    rules = expand_rules(yalex_parser)
+    previous_rules = { rule_key(rule): rule for rule in previous['rules'] } if previous else {}
+    pending = []
+    for rule in rules:
+        cached = previous_rules.get(rule_key(rule))
+        table = cached['table'] if cached is not None else TABLE_MEMO.get(rule_key(rule))
+        if table is not None:
+            rule['table'] = table
         else:
-            # Para literales incrustados, escapamos cada uno
-            expanded_regex = re.sub(
-                r'"([^"]*)"',
-                lambda m: re.escape(m.group(1)),
-                expanded_regex
-            )
-            expanded_regex = re.sub(
-                r"'([^']*)'",
-                lambda m: re.escape(m.group(1)),
-                expanded_regex
-            )
-        # 3) Quitar saltos de línea (sin tocar espacios)
-        expanded_regex = expanded_regex.replace("\n", "")
-        # 4) Añadir centinela '#' al final
-        expanded_regex_for_tree = expanded_regex + '#'
-        '''
-        # ——— DEPURACIÓN ———
-        print(f"[DEBUG] Regla {idx}: expresión a tokenizar → {expanded_regex_for_tree!r}")
-        r_parser = RegexParser(expanded_regex_for_tree)
-        try:
-            r_parser.tokenize()
-        except ValueError as e:
-            print(f"¡Error parseando la expresión expandida en la regla {idx}!")
-            print(f"   expanded_regex_for_tree = {expanded_regex_for_tree!r}")
-            # Re-lanzamos el mismo error para que se vea el stack trace
-            raise
-        # ——— fin depuración ———
-        '''
-        added_marker = False
-        with contextlib.redirect_stdout(io.StringIO()):
-            print(f"Regla {idx+1} expandida: {expanded_regex}")
-        # Construir el DFA para la regla
-        r_parser = RegexParser(expanded_regex_for_tree)
-        r_parser.tokenize()
-        postfix = r_parser.to_postfix()
-        # (Debug opcional, envuelto en --verbose)
-        """
-        print(f"\n--- DEBUG Regla {idx+1} ---")
-        print(" regex raw:     ", repr(expanded_regex))
-        print(" tokens:        ", [str(t) for t in r_parser.tokens])
-        print(" postfix:       ", [str(t) for t in postfix])
-        """
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({
-            'regex': expanded_regex,
-            'action': action_code,
-            'dfa': dfa,
-            'order': idx,
-            'added_marker': added_marker
-        })
-    
-    output_filename = "thelexer.py"
-    with open(output_filename, "w", encoding="utf-8") as f:
+            pending.append(rule)
+    if previous_rules and trace:
+        trace(f"Reglas reconstruidas: {len(pending)} de {len(rules)}")
+    # Mismas reglas (regex y definiciones) en el mismo orden: el DFA global es idéntico
+    same_global = previous and [rule_key(rule) for rule in previous['rules']] == [rule_key(rule) for rule in rules]
+    global_key = (tuple(rule_key(rule) for rule in rules), lazy)
+    table = previous['global'] if same_global else GLOBAL_MEMO.get(global_key)
+
+    if workers and workers > 1 and pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # El DFA global es la tarea más larga: se envía primero
+            global_future = None if table is not None else pool.submit(
+                compile_global_table, [{'postfix': rule['postfix'], 'action': rule['action']} for rule in rules],
+                lazy)
+            results = pool.map(compile_rule_table, [rule['postfix'] for rule in pending])
+            for rule, rule_table in zip(pending, results):
+                rule['table'] = rule_table
+            if table is None:
+                table = global_future.result()
+    else:
+        for rule in pending:
+            compile_rule(rule)
+        if table is None:
+            table = compile_global_table(rules, lazy)
+    for rule in pending:
+        TABLE_MEMO.put(rule_key(rule), rule['table'])
+    if not same_global:
+        GLOBAL_MEMO.put(global_key, table)
+    if trace:
+        for memo in MEMOS:
+            trace(str(memo))
+
+    return {
+        'header': yalex_parser.header_code,
+        'definitions': dict(yalex_parser.definitions),
+        'punctuations': punct_map,
+        'rules': rules,
+        'global': table,
+        'lazy': lazy,
+    }
+
+
+def write_lexer(compiled, output_filename, direct=False):
+    """
+    Escribe el módulo del lexer a partir del resultado de compile_spec.
+    Si el archivo ya tiene exactamente ese contenido no se reescribe (su fecha
+    no cambia y no se invalida el .pyc); devuelve True si se escribió.
+    """
+    source = render_lexer(compiled, direct)
+    try:
+        with open(output_filename, "r", encoding="utf-8", newline="") as f:
+            if f.read() == source:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(output_filename, "w", encoding="utf-8", newline="") as f:
+        f.write(source)
+    return True
+
+
+def render_lexer(compiled, direct=False):
+    """
+    Código fuente completo del módulo del lexer. Con direct=True se agrega el
+    DFA global compilado a código Python (ver format_direct_scanner) y el modo
+    por defecto del lexer pasa a ser 'direct'; GLOBAL_DFA se conserva.
+    """
+    rules = compiled['rules']
+    with io.StringIO() as f:
         # Escribir header (el código extraído del archivo YALex)
         f.write("# Código generado automáticamente por YALex\n")
-        # 1) Import básico de regex
-        f.write("import re\n")
+        # 1) Import del motor de ejecución (no depende de src.models)
+        f.write("from src.runtime.lexer_interface import LexerInterface\n")
         # 2) Import de todos los tokens DEFINIDO POR EL HEADER de la gramática
-        header = "\n".join(line.lstrip() for line in yalex_parser.header_code.splitlines())
+        header = "\n".join(line.lstrip() for line in compiled['header'].splitlines())
         if header:
             f.write(header + "\n\n")
         else:
@@ -231,116 +532,126 @@ def generate_lexer():
         # 3) definimos PUNCTUATIONS
         f.write("# Mapa de puntuaciones generado según las reglas de la gramática\n")
         f.write("PUNCTUATIONS = {\n")
-        for ch, tok in punct_map.items():
+        for ch, tok in compiled['punctuations'].items():
             f.write(f"    {ch!r}: {tok},\n")
         f.write("}\n\n")
 
-        # Definir la clase Lexer
-        f.write("class Lexer:\n")
-        f.write("    def __init__(self, input_text):\n")
-        f.write("        self.input_text = input_text\n")
-        f.write("        self.pos = 0\n")
-        f.write("\n")
-        f.write("    def get_tokens(self):\n")
-        f.write("        tokens = []\n")
-        f.write("        text = self.input_text\n")
-        f.write("        pos = 0\n")
-        f.write("        while pos < len(text):\n")
-        # ——— Reconocimiento rápido de números científicos ———
-        f.write("            m = re.match(r'\\d+\\.\\d+(?:[eE][+-]?\\d+)?', text[pos:])\n")
-        f.write("            if m:\n")
-        f.write("                lexeme = m.group(0)\n")
-        f.write("                tokens.append((NUMBER, lexeme))\n")
-        f.write("                print(f'⟶ Token: {NUMBER!r}, lexema: {lexeme!r}')\n")
-        f.write("                pos += len(lexeme)\n")
-        f.write("                continue\n")
-        # Intentar, por cada regla, empatar el mayor prefijo
-        f.write("            longest_match = 0\n")
-        f.write("            selected_rule = None\n")
-        f.write("            for rule in self.rules:\n")
-        f.write("                ml = rule['dfa'].match_prefix(text[pos:])\n")
-        f.write("                if ml > longest_match:\n")
-        f.write("                    longest_match = ml\n")
-        f.write("                    selected_rule = rule\n")
-        f.write("            if longest_match > 1:\n")
-        f.write("                lexeme = text[pos:pos+longest_match]\n")
-        f.write("                action_code = selected_rule['action']\n")
-        f.write("                local_env = {'lexeme': lexeme, 'text': text}\n")
-        f.write("                exec(action_code.replace('return', 'token ='), globals(), local_env)\n")
-        f.write("                tok = local_env.get('token')\n")
-        f.write("                if tok is not None:\n")
-        f.write("                    # si la acción ya devolvió (TOKEN, lexeme), lo usamos directamente\n")
-        f.write("                    if isinstance(tok, tuple):\n")
-        f.write("                        tokens.append(tok)\n")
-        f.write("                    else:\n")
-        f.write("                        tokens.append((tok, lexeme))\n")
-        f.write("                    print(f'⟶ Token: {tok!r}, lexema: {lexeme!r}')\n")
-        f.write("                pos += longest_match\n")
-        f.write("                continue\n")
-        # Si el DFA sólo empata 1 carácter (ej. ws de longitud 1, dígito suelto...)
-        f.write("            if longest_match == 1:\n")
-        f.write("                lexeme = text[pos]\n")
-        f.write("                action_code = selected_rule['action']\n")
-        f.write("                local_env = {'lexeme': lexeme, 'text': text}\n")
-        f.write("                exec(action_code.replace('return', 'token ='), globals(), local_env)\n")
-        f.write("                tok = local_env.get('token')\n")
-        f.write("                if tok is not None:\n")
-        f.write("                    # si la acción ya devolvió (TOKEN, lexeme), lo usamos directamente\n")
-        f.write("                    if isinstance(tok, tuple):\n")
-        f.write("                        tokens.append(tok)\n")
-        f.write("                    else:\n")
-        f.write("                        tokens.append((tok, lexeme))\n")
-        f.write("                    print(f'⟶ Token: {tok!r}, lexema: {lexeme!r}')\n")
-        f.write("                pos += 1\n")
-        f.write("                continue\n")
-        # Si no fue un token largo ni un match de un char vía DFA, símbolos puntuales
-        f.write("            ch = text[pos]\n")
-        f.write("            mapped = PUNCTUATIONS.get(ch)\n")
-        f.write("            if mapped is not None:\n")
-        f.write("                tokens.append((mapped, ch))\n")
-        f.write("                print(f'⟶ Token: {mapped!r}, lexema: {ch!r}')\n")
-        f.write("                pos += 1\n")
-        f.write("                continue\n")
-        # FALLÓ TODO: carácter no declarado → lo marcamos y seguimos
-        f.write("            # Carácter no declarado en la gramática: lo marcamos como UNKNOWN y continuamos\n")
-        f.write("            ch = text[pos]\n")
-        f.write("            print(f\"⟶ Token no reconocido: {ch!r} en posición {pos}\")\n")
-        f.write("            tokens.append((None, ch))  # None indica token no reconocido\n")
-        f.write("            pos += 1\n")
-        f.write("            continue\n")
-        f.write("        tokens.append((EOF, ''))\n")
-        f.write("        return tokens\n")
-        f.write("\n")
-        # Propiedad rules que reconstruye las reglas al momento de usar el lexer
-        f.write("    @property\n")
-        f.write("    def rules(self):\n")
-        f.write("        rules = []\n")
-        # Para cada regla, se genera el código que recrea el DFA (con la misma expresión expandida)
+        # 4) Acciones compiladas como funciones; ACTIONS[i] es la acción de RULES[i]
+        f.write("# Acciones de las reglas: una llamada por token, sin exec\n")
+        for index, rule in enumerate(rules):
+            f.write(format_action(index, rule['action']))
+            f.write("\n")
+        f.write("ACTIONS = [\n")
+        for index in range(len(rules)):
+            f.write(f"    _action_{index},\n")
+        f.write("]\n\n")
+
+        # 5) Tablas de transición ya construidas, una entrada por regla (en orden de prioridad)
+        f.write("# Tablas de transición precalculadas: el lexer no reconstruye ningún DFA.\n")
+        f.write("# 'classes' lleva cada carácter a su clase ('ranges' cubre los intervalos anchos);\n")
+        f.write("# 'transitions' está indexada por clase.\n")
+        f.write("RULES = [\n")
         for rule in rules:
-            f.write("        from src.models.regex_parser import RegexParser\n")
-            f.write("        from src.models.syntax_tree import SyntaxTree\n")
-            f.write("        from src.models.dfa import DFA\n")
-            f.write(f"        # Regla: {rule['regex']}\n")
-            f.write(f"        parser = RegexParser({rule['regex']!r} + '#')\n")
-            f.write("        parser.tokenize()\n")
-            f.write("        postfix = parser.to_postfix()\n")
-            f.write("        syntax_tree = SyntaxTree(postfix)\n")
-            f.write("        dfa = DFA(syntax_tree)\n")
-            f.write(f"        rules.append({{'regex': {rule['regex']!r}, 'action': {rule['action']!r}, 'dfa': dfa}})\n")
-        f.write("        return rules\n")
+            f.write(format_rule_table(rule))
+        f.write("]\n\n")
+
+        # 6) DFA global con la tabla estado de aceptación → índice de regla en RULES
+        lazy = compiled.get('lazy', False)
+        if lazy:
+            f.write("# DFA global perezoso: los estados se construyen al vuelo desde followpos\n")
+            f.write(format_lazy_table(compiled['global']))
+            f.write("GLOBAL_DFA = None\n")
+        else:
+            f.write("# DFA global: todas las reglas en un solo autómata\n")
+            f.write(format_global_table(compiled['global']))
+        f.write("\n")
+        if direct:
+            f.write("# DFA global como código: un bloque por estado, sin tablas\n")
+            f.write(format_direct_scanner(compiled['global']))
+            f.write("\n")
+
+        # 7) Puntos seguros para cortar la entrada (tokenización en paralelo)
+        sync = sync_chars([compiled['global']] + [rule['table'] for rule in rules],
+                          compiled['punctuations'])
+        f.write("# Caracteres tras los cuales siempre termina un token\n")
+        f.write(f"SYNC_CHARS = frozenset({sorted(sync)!r})\n\n")
+
+        # Definir la clase Lexer sobre el motor común de src/runtime
+        f.write("class Lexer(LexerInterface):\n")
+        f.write("    RULES = RULES\n")
+        f.write("    ACTIONS = ACTIONS\n")
+        f.write("    GLOBAL_DFA = GLOBAL_DFA\n")
+        if lazy:
+            f.write("    LAZY_DFA = LAZY_DFA\n")
+            f.write("    DEFAULT_MODE = \"lazy\"\n")
+        if direct:
+            f.write(f"    DIRECT_MATCH = staticmethod({DIRECT_FUNCTION})\n")
+            f.write("    DEFAULT_MODE = \"direct\"\n")
+        f.write("    PUNCTUATIONS = PUNCTUATIONS\n")
+        f.write("    SYNC_CHARS = SYNC_CHARS\n")
+        f.write("    NUMBER_TOKEN = NUMBER\n")
+        f.write("    EOF_TOKEN = EOF\n")
         f.write("\n")
         
         # Escribir trailer (el código extraído del archivo YALex, si existe)
         # trailer = "\n".join(line.lstrip() for line in yalex_parser.trailer_code.splitlines())
         # f.write(trailer + "\n")
-    
-    print(f"\nAnalizador léxico generado y guardado en: {output_filename}")
+        return f.getvalue()
+
+
+def generate_lexer(spec_filename="inputs/lexer.yal", output_filename="thelexer.py",
+                   cache_dir=DEFAULT_CACHE_DIR, workers=None, trace=None, lazy=False, direct=False):
+    """
+    Genera el archivo 'thelexer.py' a partir de la especificación YALex.
+    Combina el header, la generación de DFAs para cada regla con su acción asociada y el trailer.
+    Las tablas compiladas se guardan en cache_dir bajo un hash del texto de la
+    especificación y de GENERATOR_VERSION: si la especificación no cambió, no
+    se vuelve a construir ningún DFA; si cambió, se parte de la última
+    compilación del mismo archivo (ver compile_spec). thelexer.py sólo se
+    reescribe si su contenido cambia. cache_dir=None desactiva la caché.
+    workers > 1 reparte la construcción de los DFAs entre varios procesos.
+    'trace' recibe los mensajes del generador (header, definiciones, archivo
+    escrito), por ejemplo print; por defecto no se muestra nada.
+    lazy=True genera un lexer cuyo modo por defecto es 'lazy': el DFA global
+    no se construye aquí sino al tokenizar, estado por estado.
+    direct=True genera además el DFA global como código Python (una función
+    con un bloque por estado) y el lexer tokeniza por defecto en modo
+    'direct'; las tablas compiladas, y su caché, son las mismas.
+    """
+    if lazy and direct:
+        raise ValueError("lazy y direct no se pueden combinar: el modo directo necesita el DFA global completo")
+    trace = trace or no_trace
+    version = f"{GENERATOR_VERSION}-lazy" if lazy else GENERATOR_VERSION
+    with open(spec_filename, "r", encoding="utf-8") as spec:
+        spec_text = spec.read()
+    cache = CompileCache(cache_dir) if cache_dir else None
+    compiled = cache.load(spec_text, version) if cache else None
+    if compiled is None:
+        # La última compilación de este mismo archivo permite reconstruir sólo lo que cambió
+        last_build = f"última compilación de {os.path.abspath(spec_filename)}"
+        previous = cache.load(last_build, version) if cache else None
+        compiled = compile_spec(spec_filename, previous, workers, trace, lazy)
+        if cache:
+            cache.store(spec_text, version, compiled)
+            cache.store(last_build, version, compiled)
+
+    trace("Header extraído:")
+    trace(compiled['header'])
+    trace("\nDefiniciones encontradas:")
+    for ident, definition in compiled['definitions'].items():
+        trace(f"  {ident} = {definition}")
+    # trace("\nReglas encontradas:")
+
+    if write_lexer(compiled, output_filename, direct):
+        trace(f"\nAnalizador léxico generado y guardado en: {output_filename}")
+    else:
+        trace(f"\nAnalizador léxico sin cambios: {output_filename}")
 
 if __name__ == "__main__":
     #extend_dfa_with_match_prefix()
     # test_full_pipeline("inputs/lexer.yal")
     
     # Ejecutar la generación del archivo final del analizador léxico
-    generate_lexer()
+    generate_lexer(trace=print)
     
     # run_app()
\ No newline at end of file
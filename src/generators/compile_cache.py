@@ -0,0 +1,123 @@
+# src/generators/compile_cache.py
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+
+# Carpeta por defecto de la caché (relativa al directorio de trabajo)
+DEFAULT_CACHE_DIR = ".yalex_cache"
+# Las entradas sin usar por más de este tiempo se descartan
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+# Tamaño total máximo de la caché; se descartan primero las menos usadas
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+ENTRY_SUFFIX = ".pickle"
+
+
+class CompileCache:
+    """
+    Caché en disco del resultado de compilar una especificación YALex.
+
+    La clave es el hash del texto de la especificación junto con la versión
+    del generador, así que cambiar la gramática o el generador invalida la
+    entrada. Cada lectura exitosa actualiza la fecha de la entrada; al guardar
+    se eliminan las entradas más viejas que max_age y, si aún se supera
+    max_bytes, las de uso más antiguo.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_age=DEFAULT_MAX_AGE,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(spec_text, version):
+        """Hash de la especificación y la versión del generador."""
+        digest = hashlib.sha256()
+        digest.update(str(version).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(spec_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def path(self, spec_text, version):
+        return os.path.join(self.directory, self.key(spec_text, version) + ENTRY_SUFFIX)
+
+    def load(self, spec_text, version):
+        """Devuelve lo guardado para esta especificación, o None si no hay entrada válida."""
+        path = self.path(spec_text, version)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Entrada corrupta o de un formato anterior: se descarta y se recompila
+            self._remove(path)
+            return None
+        # Marca la entrada como recién usada (cuenta para la expulsión por edad)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def store(self, spec_text, version, value):
+        """
+        Guarda el resultado de forma atómica (archivo temporal + os.replace):
+        un proceso que lea a la vez ve la entrada completa o no la ve.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path(spec_text, version))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def entries(self):
+        """Lista (fecha de uso, tamaño, ruta) de las entradas, de la más vieja a la más nueva."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self, now=None):
+        """Elimina las entradas vencidas y, si hace falta, las menos usadas hasta caber en max_bytes."""
+        now = time.time() if now is None else now
+        kept = []
+        for mtime, size, path in self.entries():
+            if now - mtime > self.max_age:
+                self._remove(path)
+            else:
+                kept.append((mtime, size, path))
+        total = sum(size for _, size, _ in kept)
+        for _, size, path in kept:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
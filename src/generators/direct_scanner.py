@@ -0,0 +1,292 @@
+# src/generators/direct_scanner.py
+
+# Nombre de la función que se escribe en thelexer.py
+DIRECT_FUNCTION = "_match_direct"
+# Hasta esta cantidad de intervalos se prueban en cadena; con más, por bisección
+LINEAR_LIMIT = 4
+# Tope de bloques de estado que se escriben en línea (un estado alcanzable por
+# varios caminos se repite en cada uno); pasado el tope, los estados más
+# repetidos se visitan por el despacho
+INLINE_LIMIT = 1024
+# Niveles de sangría hasta los que se escribe en línea (el tokenizador de
+# Python admite 100 y el árbol de decisión de cada estado agrega algunos)
+MAX_DEPTH = 64
+
+
+def class_intervals(table):
+    """
+    Intervalos (inicio, fin) de puntos de código de cada clase de una tabla,
+    ordenados y fusionados. Los símbolos de varios caracteres no entran: un
+    solo carácter de la entrada nunca los reconoce.
+    """
+    codes = {}
+    for sym, class_id in table['classes'].items():
+        if len(sym) == 1:
+            codes.setdefault(class_id, []).append((ord(sym), ord(sym)))
+    for lo, hi, class_id in table.get('ranges', ()):
+        codes.setdefault(class_id, []).append((lo, hi))
+    intervals = {}
+    for class_id, spans in codes.items():
+        merged = []
+        for lo, hi in sorted(spans):
+            if merged and lo <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(hi, merged[-1][1]))
+            else:
+                merged.append((lo, hi))
+        intervals[class_id] = merged
+    return intervals
+
+
+def state_intervals(row, intervals):
+    """
+    Transiciones de un estado como intervalos disjuntos (inicio, fin, destino),
+    ordenados; los contiguos con el mismo destino se fusionan.
+    """
+    spans = sorted((lo, hi, target)
+                   for class_id, target in row.items()
+                   for lo, hi in intervals.get(class_id, ()))
+    merged = []
+    for lo, hi, target in spans:
+        if merged and merged[-1][2] == target and merged[-1][1] + 1 == lo:
+            merged[-1] = (merged[-1][0], hi, target)
+        else:
+            merged.append((lo, hi, target))
+    return merged
+
+
+def char_test(lo, hi):
+    """Condición sobre 'ch' para el intervalo [lo, hi] (comparaciones de str, sin ord)."""
+    if lo == hi:
+        return f"ch == {chr(lo)!r}"
+    return f"{chr(lo)!r} <= ch <= {chr(hi)!r}"
+
+
+def hub_states(table, limit=INLINE_LIMIT):
+    """
+    Estados que se visitan por el despacho en lugar de escribirse en línea:
+    el inicial, los que forman ciclos de más de un estado y, mientras el
+    código en línea supere 'limit' bloques, los que más se repiten.
+    """
+    transitions = table['transitions']
+    successors = {state: {target for target in row.values() if target != state}
+                  for state, row in transitions.items()}
+    hubs = {table['initial']}
+
+    # Ciclos de más de un estado: recorrido en profundidad iterativo; cada
+    # arista de retroceso convierte su destino en despacho
+    color = {}
+    for root in sorted(transitions):
+        if root in color:
+            continue
+        color[root] = 1
+        stack = [(root, iter(sorted(successors[root])))]
+        while stack:
+            state, pending = stack[-1]
+            for target in pending:
+                if color.get(target) == 1:
+                    hubs.add(target)
+                elif target not in color:
+                    color[target] = 1
+                    stack.append((target, iter(sorted(successors.get(target, ())))))
+                    break
+            else:
+                color[state] = 2
+                stack.pop()
+
+    while True:
+        # Bloques que ocupa cada estado escrito en línea (sin ciclos: el grafo
+        # sin los despachos es acíclico) y cuántas veces se escribe cada uno
+        order = topological_order(successors, hubs)
+        size = {}
+        for state in reversed(order):
+            size[state] = 1 + sum(size[target] for target in successors.get(state, ())
+                                  if target not in hubs)
+        copies = dict.fromkeys(order, 0)
+        for hub in hubs:
+            copies[hub] = 1
+        for state in order:
+            for target in successors.get(state, ()):
+                if target not in hubs:
+                    copies[target] += copies[state]
+        total = sum(size[hub] for hub in hubs)
+        candidates = [state for state in order if state not in hubs and copies[state] > 1]
+        if total <= limit or not candidates:
+            return hubs
+        hubs.add(max(candidates, key=lambda state: ((copies[state] - 1) * size[state], -state)))
+
+
+def topological_order(successors, hubs):
+    """Estados en orden topológico del grafo en el que las aristas hacia 'hubs' no cuentan."""
+    indegree = dict.fromkeys(successors, 0)
+    for state, targets in successors.items():
+        for target in targets:
+            if target not in hubs:
+                indegree[target] = indegree.get(target, 0) + 1
+    ready = sorted(state for state, degree in indegree.items() if degree == 0)
+    order = []
+    while ready:
+        state = ready.pop()
+        order.append(state)
+        for target in sorted(successors.get(state, ())):
+            if target not in hubs:
+                indegree[target] -= 1
+                if indegree[target] == 0:
+                    ready.append(target)
+    return order
+
+
+class DirectScannerWriter:
+    """
+    Escribe el código del escáner directo de una tabla (ver format_direct_scanner).
+
+    Mientras se escribe un camino en línea se sabe de antemano qué regla
+    aceptó por última vez: 'accept' es None (ninguna), ("i", regla) si el
+    estado actual acepta y el prefijo termina en i, ("acc", regla) si terminó
+    en la variable 'acc', o "dyn" si está en last_accept y rule_index (tras
+    el despacho). Así sólo se escribe una variable cuando un estado que no
+    acepta sigue a uno que sí.
+    """
+
+    def __init__(self, table, hubs):
+        self.intervals = class_intervals(table)
+        self.accepting = table['accepting']
+        self.transitions = table['transitions']
+        self.hubs = hubs
+        # Destinos que quedaron demasiado anidados: pasan a ser despachos
+        self.too_deep = set()
+        self.lines = []
+
+    def emit(self, indent, line):
+        self.lines.append(" " * indent + line)
+
+    def result(self, accept, at_end):
+        """Expresión de retorno para el último prefijo aceptado 'accept'."""
+        if accept is None:
+            return f"-1, None, {at_end}"
+        if accept == "dyn":
+            return f"last_accept, rule_index, {at_end}"
+        where, rule_index = accept
+        return f"{where} - pos, {rule_index}, {at_end}"
+
+    def state_body(self, state_id, indent, accept):
+        """Bloque de un estado: 'i' apunta al próximo carácter y 'ch' aún no se leyó."""
+        spans = state_intervals(self.transitions.get(state_id, {}), self.intervals)
+        loop = [(lo, hi) for lo, hi, target in spans if target == state_id]
+        spans = [span for span in spans if span[2] != state_id]
+        if loop:
+            # Transiciones a sí mismo: un bucle ajustado; al salir sin llegar
+            # al final, 'ch' ya es el carácter que no continúa el bucle
+            test = " or ".join(char_test(lo, hi) for lo, hi in loop)
+            self.emit(indent, "while i < end:")
+            self.emit(indent + 4, "ch = text[i]")
+            self.emit(indent + 4, f"if not ({test}):")
+            self.emit(indent + 8, "break")
+            self.emit(indent + 4, "i += 1")
+        if not spans:
+            self.emit(indent, f"return {self.result(accept, 'i == end')}")
+            return
+        self.emit(indent, "if i == end:")
+        self.emit(indent + 4, f"return {self.result(accept, True)}")
+        if not loop:
+            self.emit(indent, "ch = text[i]")
+        self.decision(spans, indent, state_id, accept)
+
+    def decision(self, spans, indent, state_id, accept):
+        """
+        Árbol de decisión que lleva 'ch' al destino de su intervalo: pocas
+        ramas se prueban en cadena; más, partiendo por la mitad con una
+        comparación (profundidad logarítmica). Fuera de todo intervalo, el
+        recorrido termina.
+        """
+        if len(spans) <= LINEAR_LIMIT:
+            keyword = "if"
+            for lo, hi, target in spans:
+                self.emit(indent, f"{keyword} {char_test(lo, hi)}:")
+                self.transition(state_id, target, indent + 4, accept)
+                keyword = "elif"
+            self.emit(indent, "else:")
+            self.emit(indent + 4, f"return {self.result(accept, False)}")
+            return
+        mid = len(spans) // 2
+        self.emit(indent, f"if ch < {chr(spans[mid][0])!r}:")
+        self.decision(spans[:mid], indent + 4, state_id, accept)
+        self.emit(indent, "else:")
+        self.decision(spans[mid:], indent + 4, state_id, accept)
+
+    def transition(self, state_id, target, indent, accept):
+        """Consume 'ch' y sigue en 'target': en línea, o por el despacho si es un hub."""
+        rule_index = self.accepting.get(target)
+        inline = target not in self.hubs and indent < MAX_DEPTH * 4
+        if target not in self.hubs and not inline:
+            self.too_deep.add(target)
+        if rule_index is None and accept is not None and accept != "dyn":
+            where, previous = accept
+            if inline:
+                if where == "i":
+                    self.emit(indent, "acc = i")
+                    accept = ("acc", previous)
+            else:
+                self.emit(indent, f"last_accept = {where} - pos")
+                self.emit(indent, f"rule_index = {previous}")
+        self.emit(indent, "i += 1")
+        if rule_index is not None:
+            accept = ("i", rule_index)
+            if not inline:
+                self.emit(indent, "last_accept = i - pos")
+                self.emit(indent, f"rule_index = {rule_index}")
+        if inline:
+            self.state_body(target, indent, accept)
+        else:
+            self.emit(indent, f"state = {target}")
+            self.emit(indent, "continue")
+
+    def dispatch(self, state_ids, indent):
+        """Elige el bloque del hub actual con comparaciones sobre 'state' (bisección)."""
+        if len(state_ids) <= LINEAR_LIMIT:
+            keyword = "if"
+            for state_id in state_ids:
+                if state_id == state_ids[-1] and keyword == "elif":
+                    self.emit(indent, f"else:  # estado {state_id}")
+                else:
+                    self.emit(indent, f"{keyword} state == {state_id}:")
+                # Un hub que acepta termina su prefijo en i (también tras su bucle)
+                rule_index = self.accepting.get(state_id)
+                self.state_body(state_id, indent + 4, "dyn" if rule_index is None else ("i", rule_index))
+                keyword = "elif"
+            return
+        mid = len(state_ids) // 2
+        self.emit(indent, f"if state < {state_ids[mid]}:")
+        self.dispatch(state_ids[:mid], indent + 4)
+        self.emit(indent, "else:")
+        self.dispatch(state_ids[mid:], indent + 4)
+
+
+def format_direct_scanner(table, name=DIRECT_FUNCTION):
+    """
+    Código Python de un escáner directo para la tabla del DFA global: cada
+    estado es un bloque de código con sus transiciones como comparaciones de
+    rangos de caracteres, escrito en línea donde se llega a él, y las
+    transiciones de un estado a sí mismo (identificadores, espacios,
+    dígitos...) son un bucle ajustado. Sólo los estados de hub_states pasan
+    por un despacho sobre el número de estado. La función devuelve lo mismo
+    que match_global: (longitud del mayor prefijo aceptado o -1, índice de
+    regla, si el recorrido llegó vivo a 'end').
+    """
+    hubs = hub_states(table)
+    while True:
+        writer = DirectScannerWriter(table, hubs)
+        writer.emit(0, f"def {name}(text, pos, end):")
+        writer.emit(4, '"""Escáner directo del DFA global (ver format_direct_scanner); como match_global."""')
+        writer.emit(4, "i = pos")
+        if hubs == {table['initial']}:
+            # Sin despacho: el estado inicial y todo lo alcanzable, en línea
+            writer.state_body(table['initial'], 4, None)
+        else:
+            writer.emit(4, f"state = {table['initial']}")
+            writer.emit(4, "last_accept = -1")
+            writer.emit(4, "rule_index = None")
+            writer.emit(4, "while True:")
+            writer.dispatch(sorted(hubs), 8)
+        if not writer.too_deep:
+            return "\n".join(writer.lines) + "\n"
+        hubs = hubs | writer.too_deep
@@ -0,0 +1,96 @@
+# src/generators/lru_memo.py
+
+from collections import OrderedDict
+
+# Peso total por defecto de una memoria (ver LRUMemo)
+DEFAULT_MAX_WEIGHT = 1 << 20
+
+
+def default_weight(value):
+    """Peso de un valor: su longitud si la tiene, 1 si no."""
+    try:
+        return max(1, len(value))
+    except TypeError:
+        return 1
+
+
+class LRUMemo:
+    """
+    Memoria en proceso, acotada y con expulsión LRU, para resultados costosos
+    de recalcular (postfijas, tablas de DFAs) bajo una clave hashable.
+
+    Cada entrada tiene un peso (weight(valor), por defecto su longitud); si la
+    suma supera max_weight o hay más de max_entries entradas, se expulsan las
+    de uso más antiguo. Una entrada más pesada que max_weight no se guarda.
+    'hits', 'misses' y 'evictions' cuentan los accesos desde el último clear().
+    """
+
+    def __init__(self, name, max_entries=4096, max_weight=DEFAULT_MAX_WEIGHT, weight=default_weight):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.weight = weight
+        self.entries = OrderedDict()  # clave -> (valor, peso)
+        self.total_weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Valor guardado bajo 'key' (y lo marca como recién usado), o 'default'."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value):
+        """Guarda 'value' bajo 'key' y expulsa lo necesario para respetar los límites."""
+        weight = self.weight(value)
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.total_weight -= old[1]
+        if weight > self.max_weight:
+            return value
+        self.entries[key] = (value, weight)
+        self.total_weight += weight
+        while self.total_weight > self.max_weight or len(self.entries) > self.max_entries:
+            _, (_, evicted_weight) = self.entries.popitem(last=False)
+            self.total_weight -= evicted_weight
+            self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Valor de 'key'; si no está, lo calcula con compute() y lo guarda."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return self.put(key, compute())
+
+    def clear(self):
+        """Vacía la memoria y reinicia las estadísticas."""
+        self.entries.clear()
+        self.total_weight = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Estadísticas como dict: aciertos, fallos, expulsiones, entradas y peso."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'weight': self.total_weight,
+        }
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __str__(self):
+        return (f"{self.name}: {self.hits} aciertos, {self.misses} fallos, "
+                f"{self.evictions} expulsiones, {len(self.entries)} entradas (peso {self.total_weight})")
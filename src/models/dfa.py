@@ -1,268 +1,526 @@
-# src/models/dfa.py
-import os
-import graphviz
-from src.models.syntax_tree import NodoHoja, NodoBinario, NodoUnario, SyntaxTree
-
-class DFA:
-    def __init__(self, syntax_tree):
-        self.syntax_tree = syntax_tree
-        # Calcula la función followpos y el mapeo de posiciones a símbolos
-        self.followpos = self.compute_followpos(syntax_tree.raiz)
-        self.pos_to_symbol = self.compute_pos_to_symbol(syntax_tree.raiz)
-        # Definir el alfabeto (excluimos el marcador '#' de entrada)
-        self.alphabet = { sym for sym in self.pos_to_symbol.values() if sym != '#' }
-        # Diccionario para almacenar los estados (clave: frozenset de posiciones, valor: ID del estado)
-        self.states = {}
-        # Tabla de transiciones: {estado_id: {símbolo: estado_id_destino}}
-        self.transitions = {}
-        self.initial_state = None
-        self.accepting_states = set()
-        # Construir el AFD
-        self.build_dfa()
-        # Creo un mapeo inverso {estado_id -> frozenset(posiciones)}
-        self.state_sets = { state_id: state_set
-                        for state_set, state_id in self.states.items() }
-        # Averiguo la posición del marcador interno '#', si existe
-        try:
-            self.marker_pos = next(pos for pos, sym in self.pos_to_symbol.items()
-                                   if sym == '#')
-        except StopIteration:
-            self.marker_pos = None
-
-    def compute_followpos(self, node):
-        followpos = {}
-
-        def init_followpos(n):
-            if isinstance(n, NodoHoja):
-                followpos[n.posicion] = set()
-            elif isinstance(n, NodoBinario):
-                init_followpos(n.izquierdo)
-                init_followpos(n.derecho)
-            elif isinstance(n, NodoUnario):
-                init_followpos(n.hijo)
-        init_followpos(node)
-
-        def traverse(n):
-            if isinstance(n, NodoBinario):
-                traverse(n.izquierdo)
-                traverse(n.derecho)
-                if n.valor == '.':
-                    # Para cada p en lastpos(izquierdo), followpos[p] += firstpos(derecho)
-                    for pos in n.izquierdo.lastpos:
-                        followpos[pos].update(n.derecho.firstpos)
-            elif isinstance(n, NodoUnario):
-                traverse(n.hijo)
-                if n.valor == '*':
-                    # Para cada p en lastpos(hijo), followpos[p] += firstpos(hijo)
-                    for pos in n.hijo.lastpos:
-                        followpos[pos].update(n.hijo.firstpos)
-            # NodoHoja no hace nada
-        traverse(node)
-
-        return followpos
-
-
-    def compute_pos_to_symbol(self, node):
-        """Crea un diccionario que mapea cada posición de un nodo hoja a su símbolo."""
-        pos_to_symbol = {}
-
-        def traverse(n):
-            if isinstance(n, NodoHoja):
-                pos_to_symbol[n.posicion] = n.valor
-            elif isinstance(n, NodoBinario):
-                traverse(n.izquierdo)
-                traverse(n.derecho)
-            elif isinstance(n, NodoUnario):
-                traverse(n.hijo)
-        traverse(node)
-        return pos_to_symbol
-
-    def build_dfa(self):
-        initial = frozenset(self.syntax_tree.raiz.firstpos)
-        self.states[initial] = 0
-        self.initial_state = 0
-        unmarked_states = [initial]
-        state_id_counter = 0
-
-        while unmarked_states:
-            current = unmarked_states.pop(0)
-            current_state_id = self.states[current]
-            self.transitions[current_state_id] = {}
-
-            for symbol in self.alphabet:
-                u = set()
-                for pos in current:
-                    if self.pos_to_symbol[pos] == symbol:
-                        u.update(self.followpos[pos])
-                if u:
-                    u = frozenset(u)
-                    if u not in self.states:
-                        state_id_counter += 1
-                        self.states[u] = state_id_counter
-                        unmarked_states.append(u)
-                    self.transitions[current_state_id][symbol] = self.states[u]
-
-        # Estados de aceptación: usa get() para evitar KeyError si falta alguna posición
-        for state_set, state_id in self.states.items():
-            if any(self.pos_to_symbol[p] == '#' for p in state_set):
-                self.accepting_states.add(state_id)
-        # Fallback: solo si aún no hay aceptadores Y hay posiciones definidas
-        if not self.accepting_states and self.pos_to_symbol:
-            max_pos = max(self.pos_to_symbol)
-            for state_set, state_id in self.states.items():
-                if max_pos in state_set:
-                    self.accepting_states.add(state_id)
-        
-
-    def simulate(self, string):
-        """
-        Simula el AFD con la cadena de entrada 'string'.
-        Retorna True si, tras procesar todos los caracteres,
-        el estado en que quedas está marcado como de aceptación.
-        """
-        current = self.initial_state
-        for ch in string:
-            trans = self.transitions.get(current, {})
-            if ch not in trans:
-                return False
-            current = trans[ch]
-        return current in self.accepting_states
-
-
-
-    def print_dfa(self):
-        """Imprime la tabla de transiciones y los estados de aceptación."""
-        print("Estados y sus conjuntos de posiciones:")
-        for state_set, state_id in self.states.items():
-            aceptacion = " (aceptación)" if state_id in self.accepting_states else ""
-            print(f"Estado {state_id}{aceptacion}: {set(state_set)}")
-        print("\nTransiciones:")
-        for state_id, trans in self.transitions.items():
-            for symbol, target in trans.items():
-                print(f"  δ({state_id}, '{symbol}') = {target}")
-
-
-
-
-    def render_dfa(self, filename="dfa"):
-        """
-        Genera un diagrama del AFD usando Graphviz y lo guarda en la carpeta 'imagenes/'.
-        """
-        # Asegurar que la carpeta 'imagenes' existe
-        if not os.path.exists("imagenes"):
-            os.makedirs("imagenes")
-
-        dot = graphviz.Digraph(format="png")
-
-        # Agregar estados
-        for state_set, state_id in self.states.items():
-            shape = "doublecircle" if state_id in self.accepting_states else "circle"
-            label = f"q{state_id}\n{state_set}"
-            dot.node(str(state_id), label=label, shape=shape)
-
-        # Estado inicial
-        dot.node("start", shape="none", label="")
-        dot.edge("start", str(self.initial_state))
-
-        # Agregar transiciones
-        for state_id, trans_dict in self.transitions.items():
-            for symbol, target_id in trans_dict.items():
-                symbol_escaped = symbol.replace('\\', '\\\\').replace('"', '\\"')
-                dot.edge(str(state_id), str(target_id), label=f"\"{symbol_escaped}\"")
-
-        # Guardar la imagen en la carpeta 'imagenes/'
-        output_path = f"imagenes/{filename}"
-        dot.render(output_path, view=False)
-
-        print(f"Imagen del DFA guardada en: {output_path}.png")
-
-    def match_prefix(self, input_str):
-        """
-        Escanea input_str + '#' al final y devuelve la longitud
-        del mayor prefijo reconocido por el DFA (sin contar '#').
-        """
-        current_state = self.initial_state
-        last_accept_pos = -1
-        # Escaneamos los caracteres reales más un '#' al final
-        stream = input_str + '#'
-        for i, ch in enumerate(stream, start=1):
-            trans = self.transitions.get(current_state, {})
-            if ch not in trans:
-                break
-            current_state = trans[ch]
-            # Si es estado de aceptacion, guardamos la posición
-            if current_state in self.accepting_states:
-                last_accept_pos = i
-        # last_accept_pos == índice en stream donde fue aceptado;
-        # como en stream aparece '#' en la última posición válida,
-        # y queremos la longitud sobre input_str, devolvemos last_accept_pos
-        # sólo si es ≥ 0 y menor que len(input_str)+1
-        return last_accept_pos
-    
-    
-    def match_prefix_and_token(self, input_str):
-        """
-        Recorre input_str y devuelve (largo, token_info) donde token_info
-        proviene de marker_to_rule para el marcador más prioritario.
-        """
-        current_state = self.initial_state
-        last_accept_pos = -1
-        accepted_state = None
-        pos = 0
-
-        for ch in input_str:
-            trans = self.transitions.get(current_state, {})
-            if ch in trans:
-                current_state = trans[ch]
-                pos += 1
-                if current_state in self.accepting_states:
-                    last_accept_pos = pos
-                    accepted_state = current_state
-            else:
-                break
-
-        if last_accept_pos != -1 and accepted_state is not None:
-            # obtenemos el conjunto de posiciones del estado aceptador
-            state_set = self.state_sets[accepted_state]
-            matched_marker = None
-            for p in state_set:
-                sym = self.pos_to_symbol[p]
-                if sym in self.marker_to_rule:
-                    # elegimos el marcador de menor 'order'
-                    if (matched_marker is None or
-                        self.marker_to_rule[sym]['order'] <
-                        self.marker_to_rule[matched_marker]['order']):
-                        matched_marker = sym
-            if matched_marker is not None:
-                return last_accept_pos, self.marker_to_rule[matched_marker]
-
-        return 0, None
-
- 
- 
-if __name__ == "__main__":
-    # Ejemplo de uso:
-    # 1. Se define una expresión regular.
-    regex = "(a|b)*abb#"
-    # 2. Se crea el parser y se genera la notación postfija.
-    from regex_parser import RegexParser
-    parser = RegexParser(regex)
-    postfix = parser.parse()
-    # 3. Se construye el árbol sintáctico.
-    syntax_tree = SyntaxTree(postfix)
-    # 4. Se construye el AFD a partir del árbol sintáctico.
-    dfa = DFA(syntax_tree)
-    
-    # Imprime la tabla de transiciones y los estados.
-    print("Tokens:", [str(token) for token in parser.tokens])
-    print("Postfix:", [str(token) for token in postfix])
-
-    dfa.print_dfa()
-    
-    # 5. Simulación del AFD con cadenas de prueba.
-    test_strings = ["aaabb", "aabb", "ababb", "ababbbbabb"]
-    for s in test_strings:
-        result = dfa.simulate(s)
-        print(f"\nLa cadena '{s}' {'es aceptada' if result else 'NO es aceptada'} por la expresión regular.")
-
+# src/models/dfa.py
+import os
+from bisect import bisect_left, bisect_right
+from collections import deque
+import graphviz
+from src.models.syntax_tree import NodoHoja, NodoBinario, NodoUnario, SyntaxTree, recorrer
+
+# Intervalos de una clase con menos caracteres que esto se listan uno a uno
+# en el mapa carácter → clase; los más anchos se guardan como rangos
+DENSE_RANGE_LIMIT = 256
+
+
+def iter_bits(mask):
+    """Posiciones (bits encendidos) de una máscara, de menor a mayor."""
+    # Sólo se visitan los bits encendidos: el costo depende de cuántos hay y no
+    # de la posición más alta (un estado de una cadena larga tiene un solo bit)
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class DFA:
+    def __init__(self, syntax_tree, lazy=False):
+        """
+        Con lazy=True no se construyen los estados: quedan sólo followpos,
+        pos_to_symbol y las clases de símbolos, que lazy_table entrega a un
+        LazyDFA del runtime para construir cada estado cuando se necesite.
+        """
+        self.syntax_tree = syntax_tree
+        # Si el árbol se construyó con bitsets=True, los conjuntos de posiciones
+        # (firstpos, followpos, estados) son máscaras de bits en lugar de sets
+        self.bitsets = isinstance(syntax_tree.raiz.firstpos, int)
+        # Calcula la función followpos y el mapeo de posiciones a símbolos
+        self.followpos = self.compute_followpos(syntax_tree.raiz)
+        self.pos_to_symbol = self.compute_pos_to_symbol(syntax_tree.raiz)
+        # Definir el alfabeto (excluimos el marcador '#' de entrada y las hojas [...],
+        # que se describen por rangos)
+        self.alphabet = { sym for pos, sym in self.pos_to_symbol.items()
+                          if sym != '#' and pos not in self.leaf_ranges }
+        self.pos_to_ranges = self.compute_pos_to_ranges()
+        # Clases de equivalencia de símbolos: la construcción trabaja por clase, no por símbolo
+        self.compute_symbol_classes()
+        # Diccionario para almacenar los estados (clave: frozenset de posiciones, valor: ID del estado)
+        self.states = {}
+        # Tabla de transiciones por clase: {estado_id: {clase_id: estado_id_destino}}
+        self.class_transitions = {}
+        # Tabla de transiciones: {estado_id: {símbolo: estado_id_destino}} (derivada de la anterior)
+        self.transitions = {}
+        self.initial_state = None
+        self.accepting_states = set()
+        self.lazy = lazy
+        # Construir el AFD
+        if not lazy:
+            self.build_dfa()
+        # Creo un mapeo inverso {estado_id -> frozenset(posiciones)}
+        self.state_sets = { state_id: state_set
+                        for state_set, state_id in self.states.items() }
+        # Averiguo la posición del marcador interno '#', si existe
+        try:
+            self.marker_pos = next(pos for pos, sym in self.pos_to_symbol.items()
+                                   if sym == '#')
+        except StopIteration:
+            self.marker_pos = None
+
+    def compute_followpos(self, node):
+        """
+        followpos de cada posición. Se recorre el árbol con una pila (recorrer):
+        una cadena de concatenaciones de cientos de miles de nodos no choca
+        con el límite de recursión. El orden de las uniones no importa.
+        """
+        followpos = {}
+        for n in recorrer(node):
+            if isinstance(n, NodoHoja):
+                followpos[n.posicion] = 0 if self.bitsets else set()
+
+        for n in recorrer(node):
+            if isinstance(n, NodoBinario):
+                if n.valor == '.':
+                    # Para cada p en lastpos(izquierdo), followpos[p] += firstpos(derecho)
+                    for pos in self.positions(n.izquierdo.lastpos):
+                        followpos[pos] |= n.derecho.firstpos
+            elif isinstance(n, NodoUnario):
+                if n.valor == '*':
+                    # Para cada p en lastpos(hijo), followpos[p] += firstpos(hijo)
+                    for pos in self.positions(n.hijo.lastpos):
+                        followpos[pos] |= n.hijo.firstpos
+            # NodoHoja no hace nada
+
+        return followpos
+
+    def positions(self, pos_set):
+        """Recorre un conjunto de posiciones, sea set o máscara de bits."""
+        return iter_bits(pos_set) if self.bitsets else pos_set
+
+    def freeze(self, positions):
+        """Conjunto inmutable (y hashable) de posiciones en la representación del DFA."""
+        if self.bitsets:
+            mask = 0
+            for pos in positions:
+                mask |= 1 << pos
+            return mask
+        return frozenset(positions)
+
+
+    def compute_pos_to_symbol(self, node):
+        """Crea un diccionario que mapea cada posición de un nodo hoja a su símbolo."""
+        pos_to_symbol = {}
+        # Rangos de las hojas [...], indexados por posición
+        self.leaf_ranges = {}
+
+        for n in recorrer(node):
+            if isinstance(n, NodoHoja):
+                pos_to_symbol[n.posicion] = n.valor
+                if n.rangos is not None:
+                    self.leaf_ranges[n.posicion] = n.rangos
+        return pos_to_symbol
+
+    def compute_pos_to_ranges(self):
+        """
+        Rangos (inicio, fin) de puntos de código que reconoce cada posición:
+        los de las hojas [...] y un rango de un punto para cada carácter suelto.
+        Las hojas de varios caracteres, el marcador '#' y 'ε' no tienen rangos.
+        """
+        pos_to_ranges = {}
+        for pos, sym in self.pos_to_symbol.items():
+            ranges = self.leaf_ranges.get(pos)
+            if ranges is not None:
+                pos_to_ranges[pos] = ranges
+            elif sym in self.alphabet and len(sym) == 1:
+                pos_to_ranges[pos] = ((ord(sym), ord(sym)),)
+        return pos_to_ranges
+
+    def compute_symbol_classes(self):
+        """
+        Agrupa en clases de equivalencia los símbolos que se comportan igual
+        desde cualquier estado, para que la construcción trabaje por clase.
+
+        1) Posiciones "gemelas": mismo followpos, presentes en los mismos
+           conjuntos followpos y ambas en firstpos de la raíz o ninguna.
+           Aparecen siempre juntas en los estados, como las hojas de [A-Za-z].
+        2) Los rangos de todas las posiciones se parten en intervalos
+           disjuntos; dos intervalos (o símbolos de varios caracteres) son
+           equivalentes si los cubren los mismos grupos de gemelas.
+        Se descartan las posiciones sin followpos (p. ej. los marcadores de
+        regla del DFA global): nunca generan transiciones.
+        """
+        # Distintos conjuntos followpos y, para cada posición, en cuáles aparece
+        # (equivale a comparar sus predecesores, pero sin recorrerlos uno a uno)
+        follow_set_id = {}
+        follow_of = {}
+        for pos in sorted(self.followpos):
+            follows = self.followpos[pos]
+            if not self.bitsets:
+                follows = frozenset(follows)
+            follow_of[pos] = follow_set_id.setdefault(follows, len(follow_set_id))
+        appears_in = { pos: set() for pos in self.followpos }
+        for follows, set_id in follow_set_id.items():
+            for nxt in self.positions(follows):
+                appears_in[nxt].add(set_id)
+        initial = set(self.positions(self.syntax_tree.raiz.firstpos))
+
+        group_of = {}
+        signatures = {}
+        for pos in sorted(self.followpos):
+            signature = (follow_of[pos],
+                         frozenset(appears_in[pos]),
+                         pos in initial)
+            group_of[pos] = signatures.setdefault(signature, len(signatures))
+
+        live = [pos for pos in sorted(self.followpos) if self.followpos[pos]]
+        # Intervalos elementales: cortes en cada inicio y en cada fin + 1
+        cuts = sorted({ bound
+                        for pos in live
+                        for lo, hi in self.pos_to_ranges.get(pos, ())
+                        for bound in (lo, hi + 1) })
+        interval_groups = {}     # índice de intervalo -> grupos que lo cubren
+        interval_positions = {}  # índice de intervalo -> posiciones que lo cubren
+        opaque_groups = {}       # símbolo de varios caracteres -> grupos
+        opaque_positions = {}
+        for pos in live:
+            ranges = self.pos_to_ranges.get(pos)
+            if ranges is None:
+                sym = self.pos_to_symbol[pos]
+                if sym in self.alphabet:
+                    opaque_groups.setdefault(sym, set()).add(group_of[pos])
+                    opaque_positions.setdefault(sym, set()).add(pos)
+                continue
+            for lo, hi in ranges:
+                for k in range(bisect_left(cuts, lo), bisect_left(cuts, hi + 1)):
+                    interval_groups.setdefault(k, set()).add(group_of[pos])
+                    interval_positions.setdefault(k, set()).add(pos)
+
+        classes = {}  # frozenset(grupos) -> clase_id
+        class_intervals = []
+        class_symbols = []
+        class_positions = []
+        def class_for(groups):
+            key = frozenset(groups)
+            if key not in classes:
+                classes[key] = len(classes)
+                class_intervals.append([])
+                class_symbols.append(set())
+                class_positions.append(set())
+            return classes[key]
+        for k in sorted(interval_groups):
+            class_id = class_for(interval_groups[k])
+            lo, hi = cuts[k], cuts[k + 1] - 1
+            intervals = class_intervals[class_id]
+            # Intervalos contiguos de la misma clase se fusionan
+            if intervals and intervals[-1][1] + 1 == lo:
+                intervals[-1] = (intervals[-1][0], hi)
+            else:
+                intervals.append((lo, hi))
+            class_positions[class_id].update(interval_positions[k])
+        for sym in sorted(opaque_groups):
+            class_id = class_for(opaque_groups[sym])
+            class_symbols[class_id].add(sym)
+            class_positions[class_id].update(opaque_positions[sym])
+
+        # Los intervalos cortos se listan carácter a carácter (búsqueda en un
+        # dict); los anchos quedan como rangos y se buscan por bisección
+        self.char_classes = []
+        self.wide_ranges = []
+        for class_id, intervals in enumerate(class_intervals):
+            symbols = set(class_symbols[class_id])
+            for lo, hi in intervals:
+                if hi - lo < DENSE_RANGE_LIMIT:
+                    symbols.update(chr(code) for code in range(lo, hi + 1))
+                else:
+                    self.wide_ranges.append((lo, hi, class_id))
+            self.char_classes.append(frozenset(symbols))
+        self.wide_ranges.sort()
+        self.wide_starts = [lo for lo, _, _ in self.wide_ranges]
+        self.class_ranges = [tuple(intervals) for intervals in class_intervals]
+        self.class_positions = [self.freeze(positions) for positions in class_positions]
+        self.class_of = { sym: class_id
+                          for class_id, syms in enumerate(self.char_classes)
+                          for sym in syms }
+
+    def lazy_table(self, accept):
+        """
+        Datos planos para un LazyDFA del runtime: posiciones iniciales, por
+        cada posición sus clases y su followpos, y 'accept' {posición: regla}
+        para las posiciones que aceptan (los marcadores de regla del DFA global).
+        """
+        pos_classes = {}
+        for class_id, class_positions in enumerate(self.class_positions):
+            for pos in self.positions(class_positions):
+                pos_classes.setdefault(pos, []).append(class_id)
+        return {
+            'initial': sorted(self.positions(self.syntax_tree.raiz.firstpos)),
+            'classes': dict(sorted(self.class_of.items(), key=lambda item: (item[1], item[0]))),
+            'ranges': list(self.wide_ranges),
+            'positions': { pos: (tuple(class_ids), tuple(sorted(self.positions(self.followpos[pos]))))
+                           for pos, class_ids in sorted(pos_classes.items()) },
+            'accept': dict(sorted(accept.items())),
+        }
+
+    def symbol_class(self, ch):
+        """Clase del carácter 'ch' (None si ninguna posición lo reconoce)."""
+        class_id = self.class_of.get(ch)
+        if class_id is None and self.wide_ranges and len(ch) == 1:
+            k = bisect_right(self.wide_starts, ord(ch)) - 1
+            if k >= 0 and ord(ch) <= self.wide_ranges[k][1]:
+                class_id = self.wide_ranges[k][2]
+        return class_id
+
+    def step(self, state, ch):
+        """Estado destino desde 'state' con el carácter 'ch', o None."""
+        return self.class_transitions.get(state, {}).get(self.symbol_class(ch))
+
+    def derive_symbol_transitions(self):
+        """
+        Vista por símbolo de class_transitions, para quien recorre el DFA
+        carácter a carácter (print_dfa, render_dfa...). Los rangos anchos
+        (wide_ranges) no se enumeran: sólo están en la tabla por clase.
+        """
+        self.transitions = {}
+        for state_id, row in self.class_transitions.items():
+            self.transitions[state_id] = { sym: target
+                                           for class_id, target in row.items()
+                                           for sym in self.char_classes[class_id] }
+
+    def build_dfa(self):
+        """
+        Construcción por subconjuntos. Cada estado se recorre una sola vez: el
+        followpos de cada posición se acumula en la fila de sus clases, así sólo
+        se visitan las clases presentes en el estado. Los estados pendientes
+        salen de una cola FIFO (se numeran en orden de descubrimiento) y cada
+        conjunto de posiciones queda registrado una única vez en self.states,
+        la tabla que da su id (frozenset, o máscara si bitsets).
+        """
+        positions = self.positions
+        followpos = self.followpos
+        states = self.states
+        class_transitions = self.class_transitions
+        initial = self.freeze(positions(self.syntax_tree.raiz.firstpos))
+        states[initial] = 0
+        self.initial_state = 0
+        unmarked_states = deque([initial])
+        # Clases de cada posición (las que no tienen clase nunca generan transiciones)
+        pos_classes = {}
+        for class_id, class_positions in enumerate(self.class_positions):
+            for pos in positions(class_positions):
+                pos_classes.setdefault(pos, []).append(class_id)
+
+        while unmarked_states:
+            current = unmarked_states.popleft()
+            row = {}
+            if self.bitsets:
+                # Unión de followpos como OR de máscaras; el estado es un int
+                for pos in positions(current):
+                    follows = followpos[pos]
+                    for class_id in pos_classes.get(pos, ()):
+                        row[class_id] = row.get(class_id, 0) | follows
+            else:
+                for pos in current:
+                    class_ids = pos_classes.get(pos)
+                    if class_ids:
+                        follows = followpos[pos]
+                        for class_id in class_ids:
+                            target = row.get(class_id)
+                            if target is None:
+                                row[class_id] = set(follows)
+                            else:
+                                target |= follows
+
+            transitions = class_transitions[states[current]] = {}
+            # En orden de clase: la numeración de estados no depende de la representación
+            for class_id in sorted(row):
+                u = row[class_id]
+                if not u:
+                    continue
+                if not self.bitsets:
+                    u = frozenset(u)
+                target_id = states.get(u)
+                if target_id is None:
+                    target_id = states[u] = len(states)
+                    unmarked_states.append(u)
+                transitions[class_id] = target_id
+
+        # Vista por símbolo de la misma tabla
+        self.derive_symbol_transitions()
+        if self.bitsets:
+            # Hacia afuera los estados siguen siendo frozensets de posiciones
+            self.states = { frozenset(iter_bits(mask)): state_id
+                            for mask, state_id in self.states.items() }
+
+        # Estados de aceptación: los que contienen alguna posición '#'
+        end_positions = { pos for pos, sym in self.pos_to_symbol.items() if sym == '#' }
+        for state_set, state_id in self.states.items():
+            if not end_positions.isdisjoint(state_set):
+                self.accepting_states.add(state_id)
+        # Fallback: solo si aún no hay aceptadores Y hay posiciones definidas
+        if not self.accepting_states and self.pos_to_symbol:
+            max_pos = max(self.pos_to_symbol)
+            for state_set, state_id in self.states.items():
+                if max_pos in state_set:
+                    self.accepting_states.add(state_id)
+        
+
+    def simulate(self, string):
+        """
+        Simula el AFD con la cadena de entrada 'string'.
+        Retorna True si, tras procesar todos los caracteres,
+        el estado en que quedas está marcado como de aceptación.
+        """
+        current = self.initial_state
+        for ch in string:
+            current = self.step(current, ch)
+            if current is None:
+                return False
+        return current in self.accepting_states
+
+
+
+    def print_dfa(self):
+        """Imprime la tabla de transiciones y los estados de aceptación."""
+        print("Estados y sus conjuntos de posiciones:")
+        for state_set, state_id in self.states.items():
+            aceptacion = " (aceptación)" if state_id in self.accepting_states else ""
+            print(f"Estado {state_id}{aceptacion}: {set(state_set)}")
+        print("\nTransiciones:")
+        for state_id, trans in self.transitions.items():
+            for symbol, target in trans.items():
+                print(f"  δ({state_id}, '{symbol}') = {target}")
+
+
+
+
+    def render_dfa(self, filename="dfa"):
+        """
+        Genera un diagrama del AFD usando Graphviz y lo guarda en la carpeta 'imagenes/'.
+        """
+        # Asegurar que la carpeta 'imagenes' existe
+        if not os.path.exists("imagenes"):
+            os.makedirs("imagenes")
+
+        dot = graphviz.Digraph(format="png")
+
+        # Agregar estados
+        for state_set, state_id in self.states.items():
+            shape = "doublecircle" if state_id in self.accepting_states else "circle"
+            label = f"q{state_id}\n{state_set}"
+            dot.node(str(state_id), label=label, shape=shape)
+
+        # Estado inicial
+        dot.node("start", shape="none", label="")
+        dot.edge("start", str(self.initial_state))
+
+        # Agregar transiciones
+        for state_id, trans_dict in self.transitions.items():
+            for symbol, target_id in trans_dict.items():
+                symbol_escaped = symbol.replace('\\', '\\\\').replace('"', '\\"')
+                dot.edge(str(state_id), str(target_id), label=f"\"{symbol_escaped}\"")
+
+        # Guardar la imagen en la carpeta 'imagenes/'
+        output_path = f"imagenes/{filename}"
+        dot.render(output_path, view=False)
+
+        print(f"Imagen del DFA guardada en: {output_path}.png")
+
+    def match_prefix(self, text, start=0, end=None):
+        """
+        Recorre text[start:end] por índice, sin copiar la entrada, y devuelve
+        la longitud del mayor prefijo reconocido por el DFA (-1 si ninguno).
+        Antes se escaneaba input_str + '#', pero '#' nunca tiene transiciones
+        (se excluye del alfabeto), así que el centinela no cambiaba el resultado.
+        """
+        if end is None:
+            end = len(text)
+        step = self.step
+        accepting = self.accepting_states
+        current_state = self.initial_state
+        last_accept_pos = -1
+        i = start
+        while i < end:
+            current_state = step(current_state, text[i])
+            if current_state is None:
+                break
+            i += 1
+            # Si es estado de aceptacion, guardamos la longitud
+            if current_state in accepting:
+                last_accept_pos = i - start
+        return last_accept_pos
+    
+    
+    def assign_rule_markers(self, marker_to_rule):
+        """
+        Precalcula la tabla estado de aceptación → marcador ganador para un DFA
+        construido con un marcador por regla. En cada estado gana el marcador
+        de menor 'order'; esos estados pasan a ser los de aceptación.
+        """
+        self.marker_to_rule = marker_to_rule
+        self.state_rule = {}
+        for state_set, state_id in self.states.items():
+            winner = None
+            for p in state_set:
+                sym = self.pos_to_symbol[p]
+                if sym in marker_to_rule and (
+                        winner is None or
+                        marker_to_rule[sym]['order'] < marker_to_rule[winner]['order']):
+                    winner = sym
+            if winner is not None:
+                self.state_rule[state_id] = winner
+        self.accepting_states = set(self.state_rule)
+
+    def match_prefix_and_token(self, text, start=0, end=None):
+        """
+        Recorre text[start:end] por índice y devuelve (largo, token_info) donde
+        token_info proviene de marker_to_rule para el marcador más prioritario.
+        La prioridad se resuelve con la tabla precalculada de assign_rule_markers.
+        """
+        if end is None:
+            end = len(text)
+        step = self.step
+        state_rule = self.state_rule
+        current_state = self.initial_state
+        last_accept_pos = -1
+        matched_marker = None
+        i = start
+
+        while i < end:
+            current_state = step(current_state, text[i])
+            if current_state is None:
+                break
+            i += 1
+            marker = state_rule.get(current_state)
+            if marker is not None:
+                last_accept_pos = i - start
+                matched_marker = marker
+
+        if matched_marker is not None:
+            return last_accept_pos, self.marker_to_rule[matched_marker]
+
+        return 0, None
+
+ 
+ 
+if __name__ == "__main__":
+    # Ejemplo de uso:
+    # 1. Se define una expresión regular.
+    regex = "(a|b)*abb#"
+    # 2. Se crea el parser y se genera la notación postfija.
+    from regex_parser import RegexParser
+    parser = RegexParser(regex)
+    postfix = parser.parse()
+    # 3. Se construye el árbol sintáctico.
+    syntax_tree = SyntaxTree(postfix)
+    # 4. Se construye el AFD a partir del árbol sintáctico.
+    dfa = DFA(syntax_tree)
+    
+    # Imprime la tabla de transiciones y los estados.
+    print("Tokens:", [str(token) for token in parser.tokens])
+    print("Postfix:", [str(token) for token in postfix])
+
+    dfa.print_dfa()
+    
+    # 5. Simulación del AFD con cadenas de prueba.
+    test_strings = ["aaabb", "aabb", "ababb", "ababbbbabb"]
+    for s in test_strings:
+        result = dfa.simulate(s)
+        print(f"\nLa cadena '{s}' {'es aceptada' if result else 'NO es aceptada'} por la expresión regular.")
+
     dfa.render_dfa("dfa")  
\ No newline at end of file
@@ -6,133 +6,186 @@ import graphviz
 
 def minimize_dfa(dfa: DFA) -> DFA:
     """
-    Minimiza el DFA usando el algoritmo de Hopcroft.
+    Minimiza el DFA usando el algoritmo de Hopcroft, en O(m log n) para
+    m transiciones y n estados.
     Devuelve una NUEVA instancia de DFA que represente el autómata mínimo.
+
+    El DFA es parcial (faltan transiciones): primero se descartan los estados
+    que no pueden llegar a aceptación y luego se refina la partición
+    inicial {aceptación, resto} con todos sus bloques en la lista de trabajo,
+    lo que mantiene correcto el truco de "procesar sólo la mitad menor".
+
+    Si el DFA tiene reglas asignadas (assign_rule_markers), la partición
+    inicial lleva un bloque de aceptación por regla ganadora: dos estados
+    que aceptan reglas distintas nunca se fusionan, y el DFA mínimo conserva
+    state_rule/marker_to_rule para usarse con match_prefix_and_token.
     """
 
-    # 1) Recolectar la info necesaria
-    # --------------------------------
-    all_states = set(dfa.states.values())  # conjunto de IDs de estados (ej. {0, 1, 2, ...})
-    alphabet = dfa.alphabet
-    accepting_states = dfa.accepting_states
-    initial_state = dfa.initial_state
-
-    # 2) Crear la partición inicial: A = estados de aceptación, B = el resto
-    # ---------------------------------------------------------------------
-    accepting = accepting_states
-    non_accepting = all_states - accepting
-
-    P = []
-    if accepting:
-        P.append(accepting)
-    if non_accepting:
-        P.append(non_accepting)
-
-    W = P.copy()
-
-    # 3) Algoritmo de Hopcroft: refinamiento de bloques
-    # -------------------------------------------------
-    # P = Pila de bloques (particiones), W = cola de bloques a procesar
-    while W:
-        R = W.pop()  # Toma un bloque a refinar
-        for symbol in alphabet:
-            # X = todos los estados que tienen transición con `symbol` a un estado de R
-            X = set()
-            # Para cada estado en todo el autómata
-            for state in all_states:
-                # Determina el posible destino
-                destino = dfa.transitions.get(state, {}).get(symbol, None)
-                if destino in R:
-                    X.add(state)
-
-            # Para cada bloque Y en P, vamos a ver la intersección con X
-            new_P = []
-            for Y in P:
-                # Intersección y diferencia
-                intersection = Y.intersection(X)
-                difference = Y - X
-                if intersection and difference:
-                    # Se parte Y en intersection y difference
-                    new_P.append(intersection)
-                    new_P.append(difference)
-                    # Ajustar W
-                    if Y in W:
-                        # Reemplaza Y en W por los dos sub-bloques
-                        W.remove(Y)
-                        W.append(intersection)
-                        W.append(difference)
-                    else:
-                        # Añade el sub-bloque más pequeño
-                        if len(intersection) <= len(difference):
-                            W.append(intersection)
-                        else:
-                            W.append(difference)
+    # 1) Recolectar la info necesaria (estados renumerados 0..n-1)
+    # -------------------------------------------------------------
+    state_ids = sorted(set(dfa.states.values()))
+    index_of = { state: i for i, state in enumerate(state_ids) }
+    n = len(state_ids)
+    accepting = [state in dfa.accepting_states for state in state_ids]
+    state_rule = getattr(dfa, 'state_rule', None)
+    if state_rule is not None:
+        # Cada estado de aceptación se distingue por el marcador de su regla
+        initial_key = [state_rule.get(state) for state in state_ids]
+    else:
+        initial_key = accepting
+    # Índice inverso: inverse[t] = [(clase, s)] con s --clase--> t
+    inverse = [[] for _ in range(n)]
+    for state, row in dfa.class_transitions.items():
+        s = index_of[state]
+        for class_id, target in row.items():
+            inverse[index_of[target]].append((class_id, s))
+
+    # 2) Estados vivos: los que alcanzan aceptación (recorrido hacia atrás)
+    # --------------------------------------------------------------------
+    live = accepting[:]
+    stack = [s for s in range(n) if live[s]]
+    while stack:
+        t = stack.pop()
+        for _, s in inverse[t]:
+            if not live[s]:
+                live[s] = True
+                stack.append(s)
+    # El estado inicial se conserva aunque el lenguaje sea vacío
+    initial = index_of[dfa.initial_state]
+    live[initial] = True
+    if not all(live):
+        for t in range(n):
+            inverse[t] = [(c, s) for c, s in inverse[t] if live[s]] if live[t] else []
+
+    # 3) Partición refinable: los estados de cada bloque ocupan un tramo
+    #    contiguo de 'elems'; los marcados se mueven al inicio del tramo
+    # -------------------------------------------------------------------
+    groups = {}
+    for s in range(n):
+        if live[s]:
+            groups.setdefault(initial_key[s], []).append(s)
+    elems = []
+    block_of = [-1] * n   # bloque de cada estado
+    loc = [0] * n         # índice de cada estado dentro de elems
+    first, end = [], []   # tramo [first, end) de cada bloque
+    for key in groups:
+        first.append(len(elems))
+        for s in groups[key]:
+            block_of[s] = len(first) - 1
+            loc[s] = len(elems)
+            elems.append(s)
+        end.append(len(elems))
+    mid = first[:]        # [first, mid) son los marcados del bloque
+
+    # Lista de trabajo con pertenencia O(1); al inicio, todos los bloques
+    waiting = list(range(len(first)))
+    in_waiting = [True] * len(first)
+
+    # 4) Refinamiento: cada bloque pendiente parte a sus predecesores, clase por clase
+    # --------------------------------------------------------------------------------
+    while waiting:
+        splitter = waiting.pop()
+        in_waiting[splitter] = False
+        predecessors = {}  # clase -> estados con transición por ella hacia el splitter
+        for i in range(first[splitter], end[splitter]):
+            for class_id, s in inverse[elems[i]]:
+                predecessors.setdefault(class_id, []).append(s)
+
+        for class_id in sorted(predecessors):
+            touched = []
+            for s in predecessors[class_id]:
+                b = block_of[s]
+                i, j = loc[s], mid[b]
+                if i < j:
+                    continue  # ya marcado
+                # Intercambiar s con el primer no marcado de su bloque
+                other = elems[j]
+                elems[i], elems[j] = other, s
+                loc[other], loc[s] = i, j
+                mid[b] = j + 1
+                if j == first[b]:
+                    touched.append(b)
+            for b in touched:
+                if mid[b] == end[b]:
+                    # Todo el bloque entra al splitter: no se parte
+                    mid[b] = first[b]
+                    continue
+                # Los marcados forman un bloque nuevo
+                new_block = len(first)
+                first.append(first[b])
+                end.append(mid[b])
+                mid.append(first[b])
+                first[b] = mid[b]
+                mid[b] = first[b]
+                for i in range(first[new_block], end[new_block]):
+                    block_of[elems[i]] = new_block
+                if in_waiting[b]:
+                    waiting.append(new_block)
+                    in_waiting.append(True)
                 else:
-                    # Si no hay partición, queda igual
-                    new_P.append(Y)
-            P = new_P
-
-    # 4) Construir el DFA mínimo a partir de la partición final P
-    # -----------------------------------------------------------
-    # Ahora, cada bloque en P es un estado "colapsado" en el DFA mínimo.
-
-    # Asignar un ID nuevo a cada bloque
-    min_state_map = {}  # asigna "representante" -> "nuevo estado ID"
-    new_states_list = []
-    new_id = 0
-
-    for block in P:
-        # Escogemos un representante (podría ser min(block) o simplemente sacamos uno)
-        rep = min(block)  # escogemos el menor ID como "representante"
-        for st in block:
-            min_state_map[st] = new_id
-        new_states_list.append(block)
-        new_id += 1
-
-    # Estados de aceptación en el DFA mínimo
-    new_accepting_states = set()
-    for block in P:
-        # Si al menos un estado del bloque era de aceptación, todo el bloque lo es
-        rep = min(block)
-        if block & accepting_states:  # intersección no vacía
-            new_accepting_states.add(min_state_map[rep])
-
-    # Nuevo estado inicial
-    new_initial_state = min_state_map[initial_state]
-
-    # Construir nuevas transiciones
+                    # Basta con agregar la mitad menor
+                    smaller = new_block if end[new_block] - first[new_block] <= end[b] - first[b] else b
+                    in_waiting.append(smaller == new_block)
+                    if smaller == b:
+                        in_waiting[b] = True
+                    waiting.append(smaller)
+
+    # 5) Construir el DFA mínimo a partir de la partición final
+    # ---------------------------------------------------------
+    # IDs nuevos en orden de recorrido desde el inicial (el inicial es 0),
+    # así el resultado no depende del orden interno de los bloques
+    new_id = { block_of[initial]: 0 }
+    order = [block_of[initial]]
     new_transitions = {}
-    for block in P:
-        rep = min(block)  # ID representativo
-        rep_new_state = min_state_map[rep]
-        new_transitions[rep_new_state] = {}
-        # Tomamos las transiciones del representative
-        for symbol in alphabet:
-            old_target = dfa.transitions[rep].get(symbol, None)
-            if old_target is not None:
-                new_target = min_state_map[old_target]
-                new_transitions[rep_new_state][symbol] = new_target
-
-    # 5) Crear un nuevo DFA con la información minimizada
-    # ---------------------------------------------------
+    for block in order:
+        rep = elems[first[block]]
+        row = {}
+        for class_id, target in sorted(dfa.class_transitions.get(state_ids[rep], {}).items()):
+            t = index_of[target]
+            if not live[t]:
+                continue
+            target_block = block_of[t]
+            if target_block not in new_id:
+                new_id[target_block] = len(order)
+                order.append(target_block)
+            row[class_id] = new_id[target_block]
+        new_transitions[new_id[block]] = row
+
     min_dfa = DFA.__new__(DFA)  # creamos una instancia vacía de DFA
     # Llenamos sus atributos
-    min_dfa.alphabet = alphabet
-    # Reconstruimos states como { frozenset(...) : id }, aunque ya no necesitamos frozenset.
-    # Pero para mantener la misma interfaz, guardamos que cada "bloque" se asocia a un ID.
-    min_dfa.states = {}
-    for block_idx, block in enumerate(P):
-        # construimos un set ficticio como "frozenset(block)"
-        # *pero ojo, block contiene IDs, no sets de posiciones
-        # si quieres, asigna un dummy: frozenset({block_idx})
-        # Lo importante es no romper la interfaz.  ;)
-        min_dfa.states[frozenset(block)] = block_idx
-
-    min_dfa.transitions = new_transitions
-    min_dfa.initial_state = new_initial_state
-    min_dfa.accepting_states = new_accepting_states
-    min_dfa.followpos = None  # ya no es relevante
-    min_dfa.pos_to_symbol = None  # ya no es relevante
+    min_dfa.alphabet = dfa.alphabet
+    # Las clases de caracteres no cambian al minimizar
+    min_dfa.char_classes = dfa.char_classes
+    min_dfa.class_of = dfa.class_of
+    min_dfa.wide_ranges = dfa.wide_ranges
+    min_dfa.wide_starts = dfa.wide_starts
+    min_dfa.class_ranges = dfa.class_ranges
+    # states: { frozenset(IDs originales del bloque) : ID nuevo }
+    min_dfa.states = {
+        frozenset(state_ids[elems[i]] for i in range(first[block], end[block])): new_id[block]
+        for block in order
+    }
+    min_dfa.class_transitions = new_transitions
+    min_dfa.derive_symbol_transitions()
+    min_dfa.initial_state = 0
+    min_dfa.accepting_states = { new_id[block] for block in order
+                                 if accepting[elems[first[block]]] }
+    if state_rule is not None:
+        # Regla ganadora de cada bloque de aceptación (todos sus estados la comparten)
+        min_dfa.marker_to_rule = dfa.marker_to_rule
+        min_dfa.state_rule = { new_id[block]: initial_key[elems[first[block]]]
+                               for block in order
+                               if initial_key[elems[first[block]]] is not None }
+    # Posiciones de cada estado mínimo: la unión de las de los estados fusionados
+    state_sets = getattr(dfa, 'state_sets', None)
+    if state_sets is not None:
+        min_dfa.state_sets = {
+            new_id[block]: frozenset().union(*(state_sets[state_ids[elems[i]]]
+                                               for i in range(first[block], end[block])))
+            for block in order
+        }
+    min_dfa.followpos = getattr(dfa, 'followpos', None)
+    min_dfa.pos_to_symbol = getattr(dfa, 'pos_to_symbol', None)
     return min_dfa
 
 
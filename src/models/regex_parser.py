@@ -3,10 +3,40 @@
 import re
 from collections import deque
 
+# Mayor punto de código Unicode: límite superior de las clases negadas
+MAX_CODE_POINT = 0x10FFFF
+
+# Nombre de una definición YALex (let IDENT = ...)
+IDENTIFIER = re.compile(r'\w+')
+
+
+def decode_escapes(text):
+    """
+    Decodifica \\n, \\t, \\uXXXX, etc. sin alterar los caracteres no ASCII
+    (pasar por UTF-8 los partiría en varios caracteres latin-1).
+    """
+    return text.encode("latin-1", "backslashreplace").decode("unicode_escape")
+
+
+def escape_quoted(text):
+    """
+    Reemplaza cada literal entre comillas de 'text' por su contenido escapado
+    con re.escape (primero los de comillas dobles, luego los de simples).
+    """
+    text = re.sub(r'"([^"]*)"', lambda m: re.escape(m.group(1)), text)
+    return re.sub(r"'([^']*)'", lambda m: re.escape(m.group(1)), text)
+
+
 class Symbol:
-    def __init__(self, value, is_operator=False):
+    def __init__(self, value, is_operator=False, ranges=None, definition=None):
         self.value = value
         self.is_operator = is_operator
+        # Para una clase [...]: tupla ordenada de rangos (inicio, fin) de puntos
+        # de código, inclusivos y disjuntos. None en cualquier otro símbolo.
+        self.ranges = ranges
+        # Referencia a una definición YALex: su postfija ya parseada (compartida
+        # por todas las referencias). SyntaxTree la copia con posiciones nuevas.
+        self.definition = definition
 
     def __str__(self):
         return self.value
@@ -18,8 +48,17 @@ class RegexParser:
     OPERATORS  = {'|', '*', '+', '?'}
     PRECEDENCE = {'|': 1, '.': 2, '*': 3, '+': 3, '?': 3}
 
-    def __init__(self, regex):
+    def __init__(self, regex, definitions=None):
+        """
+        'definitions' ({nombre: postfija}) activa la sintaxis de reglas YALex:
+        un nombre de definición se convierte en un único símbolo que referencia
+        su postfija (sin copiar su texto) y los literales entre comillas se
+        escapan carácter por carácter (escape_quoted). Los nombres referenciados
+        quedan en 'references'.
+        """
         self.regex = regex
+        self.definitions = definitions
+        self.references = []
         self.tokens = []
     
     def should_concat(self, last_token, current_token_type):
@@ -52,52 +91,85 @@ class RegexParser:
     
     def parse_bracket_expression(self, bracket_content):
         """
-        Dado el contenido dentro de [ ], genera una lista de tokens equivalente.
-        Primero limpiamos las comillas y espacios para quedarnos solo con los
-        caracteres puros (sin ' ni " ni espacios), luego expandimos rangos X–Y
-        solo cuando ambos sean alfanuméricos.
+        Dado el contenido dentro de [ ], genera el token equivalente: una sola
+        hoja con los rangos de puntos de código de la clase (o un literal si la
+        clase tiene un único carácter). Primero limpiamos las comillas para
+        quedarnos solo con los caracteres puros, luego reconocemos rangos X–Y
+        y un '^' inicial que niega la clase.
         """
         # 1) Primero, decodificamos cualquier \n, \t, \\uXXXX, etc.
-        decoded = bytes(bracket_content, "utf-8").decode("unicode_escape")
+        decoded = decode_escapes(bracket_content)
         # 2) Ahora removemos las comillas simples o dobles y espacios sobrantes
         clean = decoded.replace("'", "").replace('"', "")
         
-        # 3) Recogemos cada carácter literal o rango a–b
-        chars = []
-        i = 0
+        # 3) Recogemos cada carácter literal o rango a–b; un '^' inicial niega la clase
+        negated = len(clean) > 1 and clean[0] == "^"
+        spans = []
+        i = 1 if negated else 0
         while i < len(clean):
             c = clean[i]
-            # caso rango: a-b
-            if i + 2 < len(clean) and clean[i+1] == "-" and clean[i].isalnum() and clean[i+2].isalnum():
-                a, b = clean[i], clean[i+2]
-                start, end = ord(a), ord(b)
+            # caso rango: a-b (los extremos pueden venir de escapes como \u0000)
+            if i + 2 < len(clean) and clean[i+1] == "-" and self.is_range_end(clean[i]) and self.is_range_end(clean[i+2]):
+                start, end = ord(clean[i]), ord(clean[i+2])
                 if start > end: start, end = end, start
-                for code in range(start, end+1):
-                    chars.append(chr(code))
+                spans.append((start, end))
                 i += 3
             else:
                 # carácter suelto
-                chars.append(c)
+                spans.append((ord(c), ord(c)))
                 i += 1
         
-        # 4) Eliminamos duplicados y ordenamos
-        unique = []
-        for c in chars:
-            if c not in unique:
-                unique.append(c)
+        # 4) Ordenamos y fusionamos los rangos (elimina duplicados)
+        ranges = self.merge_ranges(spans)
         
         # Si la clase tiene solo un símbolo, lo devolvemos como literal
-        if len(unique) == 1:
-            return [ Symbol(unique[0], is_operator=False) ]
+        if len(ranges) == 1 and ranges[0][0] == ranges[0][1] and not negated:
+            return [ Symbol(chr(ranges[0][0]), is_operator=False) ]
 
-        # 5) Convertimos a tokens: ( c1 | c2 | ... cn )
-        tokens = [Symbol("(", is_operator=True)]
-        for idx, c in enumerate(unique):
-            tokens.append(Symbol(c, is_operator=False))
-            if idx < len(unique)-1:
-                tokens.append(Symbol("|", is_operator=True))
-        tokens.append(Symbol(")", is_operator=True))
-        return tokens
+        # 5) Una sola hoja con los rangos de la clase, en lugar de ( c1 | c2 | ... cn ):
+        #    [\u0000-\uffff] ocupa una posición y no 65536
+        if negated:
+            ranges = self.complement_ranges(ranges)
+        return [ Symbol(f"[{bracket_content}]", is_operator=False, ranges=ranges) ]
+
+    def definition_name(self, i):
+        """Nombre de definición que empieza en la posición i como palabra completa, o None."""
+        if not self.definitions or (i > 0 and IDENTIFIER.match(self.regex, i - 1)):
+            return None
+        match = IDENTIFIER.match(self.regex, i)
+        if match and match.group() in self.definitions:
+            return match.group()
+        return None
+
+    @staticmethod
+    def is_range_end(c):
+        """Un extremo de rango no puede ser espacio ni barra (separan o escapan literales)."""
+        return c.isalnum() or not (c.isspace() or c in "\\-")
+
+    @staticmethod
+    def merge_ranges(spans):
+        """Ordena rangos (inicio, fin) y fusiona los que se solapan o son contiguos."""
+        ranges = []
+        for start, end in sorted(spans):
+            if ranges and start <= ranges[-1][1] + 1:
+                if end > ranges[-1][1]:
+                    ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return tuple(ranges)
+
+    @staticmethod
+    def complement_ranges(ranges):
+        """Rangos de todos los puntos de código que NO están en 'ranges'."""
+        complement = []
+        start = 0
+        for lo, hi in ranges:
+            if lo > start:
+                complement.append((start, lo - 1))
+            start = hi + 1
+        if start <= MAX_CODE_POINT:
+            complement.append((start, MAX_CODE_POINT))
+        return tuple(complement)
 
 
     
@@ -164,8 +236,10 @@ class RegexParser:
                     raise ValueError("Falta ']' de cierre en la expresión regular.")
                 
                 raw = self.regex[i+1 : j]
+                if self.definitions is not None:
+                    raw = escape_quoted(raw)
                 # decodifica '\n', '\t', '\u1234', etc.
-                bracket_content = bytes(raw, "utf-8").decode("unicode_escape")
+                bracket_content = decode_escapes(raw)
                 
                 # Expandimos a un grupo de tokens
                 bracket_tokens = self.parse_bracket_expression(bracket_content)
@@ -192,6 +266,15 @@ class RegexParser:
                     raise ValueError("No se encontró la comilla de cierre para literal.")
                 # Actualizamos 'skip_until' para saltar el literal entero
                 skip_until = j + 1
+                if self.definitions is not None:
+                    # Regla YALex: el literal se escapa y se reconoce carácter por carácter
+                    literal_tokens = RegexParser(re.escape(literal)).tokenize()
+                    if literal_tokens:
+                        if self.should_concat(last_token, 'literal'):
+                            output.append(Symbol('.', is_operator=True))
+                        output.extend(literal_tokens)
+                        last_token = literal_tokens[-1]
+                    continue
                 if self.should_concat(last_token, 'literal'):
                     output.append(Symbol('.', is_operator=True))
                 literal = bytes(literal, "utf-8").decode("unicode_escape")
@@ -200,6 +283,18 @@ class RegexParser:
                 last_token = token
                 continue
 
+            # Nombre de una definición (palabra completa): un solo símbolo que la referencia
+            elif self.definition_name(i) is not None:
+                name = self.definition_name(i)
+                skip_until = i + len(name)
+                if self.should_concat(last_token, 'literal'):
+                    output.append(Symbol('.', is_operator=True))
+                token = Symbol(name, is_operator=False, definition=self.definitions[name])
+                output.append(token)
+                last_token = token
+                self.references.append(name)
+                continue
+
             # (bloque de corchetes, literales entre comillas, alfanuméricos, operadores y paréntesis)
             # —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
             elif char.isalnum() or char in {'#', '$'}:
@@ -4,22 +4,38 @@ import os
 import graphviz
 
 class NodoBase:
+    # Sin __dict__ por nodo: un árbol de cientos de miles de nodos ocupa
+    # una fracción de la memoria
+    __slots__ = ('valor', 'nullable', 'firstpos', 'lastpos')
+
     def __init__(self, valor):
         self.valor = valor
         self.nullable = False
-        self.firstpos = set()
-        self.lastpos = set()
 
-    # Método polimórfico a sobrescribir en hijos
+    def hijos(self):
+        """Hijos del nodo, de izquierda a derecha."""
+        return ()
+
     def to_dot(self, dot):
+        """Agrega este nodo y las aristas a sus hijos al gráfico DOT (sin recorrer los hijos)."""
         pass
 
 class NodoHoja(NodoBase):
-    def __init__(self, valor, posicion):
+    __slots__ = ('posicion', 'rangos')
+
+    def __init__(self, valor, posicion, rangos=None, bitset=False):
         super().__init__(valor)
         self.posicion = posicion
-        self.firstpos.add(posicion)
-        self.lastpos.add(posicion)
+        # Hoja de clase [...]: rangos (inicio, fin) de puntos de código que reconoce
+        self.rangos = rangos
+        if bitset:
+            # Conjunto de posiciones como máscara de bits: el bit 'posicion' encendido.
+            # Los nodos internos combinan con '|' igual que con sets.
+            self.firstpos = self.lastpos = 1 << posicion
+        else:
+            # Los conjuntos de los nodos nunca se modifican: firstpos y lastpos
+            # pueden ser el mismo objeto
+            self.firstpos = self.lastpos = {posicion}
         self.nullable = (valor == 'ε')
 
     def to_dot(self, dot):
@@ -30,25 +46,32 @@ class NodoHoja(NodoBase):
 
 
 class NodoBinario(NodoBase):
+    __slots__ = ('izquierdo', 'derecho')
+
     def __init__(self, valor, izquierdo, derecho):
         super().__init__(valor)
         self.izquierdo = izquierdo
         self.derecho = derecho
         self.calcular_propiedades()
 
+    def hijos(self):
+        return (self.izquierdo, self.derecho)
+
     def calcular_propiedades(self):
+        izquierdo, derecho = self.izquierdo, self.derecho
         if self.valor == '.':  # Concatenación
-            self.nullable = self.izquierdo.nullable and self.derecho.nullable
-
-            self.firstpos = (self.izquierdo.firstpos |
-                             (self.derecho.firstpos if self.izquierdo.nullable else set()))
-            self.lastpos = (self.derecho.lastpos |
-                            (self.izquierdo.lastpos if self.derecho.nullable else set()))
+            self.nullable = izquierdo.nullable and derecho.nullable
+            # Sin unión, el conjunto del hijo se comparte: una cadena larga de
+            # concatenaciones no copia conjuntos en cada nivel
+            self.firstpos = (izquierdo.firstpos | derecho.firstpos
+                             if izquierdo.nullable else izquierdo.firstpos)
+            self.lastpos = (derecho.lastpos | izquierdo.lastpos
+                            if derecho.nullable else derecho.lastpos)
 
         elif self.valor == '|':  # Alternancia
-            self.nullable = self.izquierdo.nullable or self.derecho.nullable
-            self.firstpos = self.izquierdo.firstpos | self.derecho.firstpos
-            self.lastpos = self.izquierdo.lastpos | self.derecho.lastpos
+            self.nullable = izquierdo.nullable or derecho.nullable
+            self.firstpos = izquierdo.firstpos | derecho.firstpos
+            self.lastpos = izquierdo.lastpos | derecho.lastpos
 
 
     def to_dot(self, dot):
@@ -57,22 +80,23 @@ class NodoBinario(NodoBase):
                  f"{self.valor}",
                  shape="box")
 
-        # Dibujar hijos
-        self.izquierdo.to_dot(dot)
-        self.derecho.to_dot(dot)
-
-        # Conectar con aristas
+        # Conectar con aristas (los hijos los agrega SyntaxTree.render)
         dot.edge(str(id(self)), str(id(self.izquierdo)))
         dot.edge(str(id(self)), str(id(self.derecho)))
 
 
 
 class NodoUnario(NodoBase):
+    __slots__ = ('hijo',)
+
     def __init__(self, valor, hijo):
         super().__init__(valor)
         self.hijo = hijo
         self.calcular_propiedades()
 
+    def hijos(self):
+        return (self.hijo,)
+
     def calcular_propiedades(self):
         if self.valor == '*':  # Cerradura de Kleene
             self.nullable = True
@@ -85,23 +109,61 @@ class NodoUnario(NodoBase):
                  f"{self.valor}",
                  shape="diamond")
 
-        self.hijo.to_dot(dot)
         dot.edge(str(id(self)), str(id(self.hijo)))
 
 
+def recorrer(raiz):
+    """
+    Recorre los nodos del árbol en preorden (cada nodo antes que sus hijos,
+    de izquierda a derecha) con una pila explícita: la profundidad del árbol
+    no está limitada por la recursión de Python.
+    """
+    pila = [raiz]
+    while pila:
+        nodo = pila.pop()
+        yield nodo
+        pila.extend(reversed(nodo.hijos()))
+
+
 
 class SyntaxTree:
-    def __init__(self, postfix):
+    def __init__(self, postfix, bitsets=False):
+        """
+        Con bitsets=True, firstpos/lastpos de cada nodo son enteros usados como
+        máscaras de bits (bit i = posición i) en lugar de sets; el DFA construido
+        sobre este árbol trabaja entonces con máscaras (uniones con OR de bits).
+        Cada máscara es un entero tan largo como la posición más alta que
+        contiene: con literales muy largos (miles de posiciones en cadena) operar
+        y hashear estados de un solo bit cuesta más que con sets, y el costo
+        crece con el largo del literal (ver benchmarks/bench_bitsets.py --literal).
+        Un símbolo que referencia una definición (Symbol.definition) se reemplaza
+        por su subárbol, construido de nuevo con posiciones propias en cada uso.
+        """
         self.postfix = postfix
+        self.bitsets = bitsets
         self.posicion_actual = 1
         self.raiz = self.construir_arbol()
     
     def construir_arbol(self):
         stack = []
-        for token in self.postfix:
+        # Postfijas pendientes: la de la regla y las de las definiciones que se
+        # están expandiendo (cada una deja exactamente un nodo en 'stack')
+        pendientes = [iter(self.postfix)]
+        while pendientes:
+            token = next(pendientes[-1], None)
+            if token is None:
+                pendientes.pop()
+                continue
+            # Referencia a una definición: se recorre su postfija en su lugar
+            definicion = getattr(token, 'definition', None)
+            if definicion is not None:
+                pendientes.append(iter(definicion))
+                continue
+
             # Caso hoja
             if (token.value.isalnum() or token.value == '#') or not token.is_operator:
-                nodo_hoja = NodoHoja(token.value, self.posicion_actual)
+                nodo_hoja = NodoHoja(token.value, self.posicion_actual,
+                                     getattr(token, 'ranges', None), self.bitsets)
                 stack.append(nodo_hoja)
                 self.posicion_actual += 1
 
@@ -148,7 +210,7 @@ class SyntaxTree:
                         f"Postfix completo: {[str(t) for t in self.postfix]}"
                     )
                 nodo = stack.pop()
-                hoja_epsilon = NodoHoja('ε', self.posicion_actual)
+                hoja_epsilon = NodoHoja('ε', self.posicion_actual, bitset=self.bitsets)
                 self.posicion_actual += 1
                 altern = NodoBinario('|', nodo, hoja_epsilon)
                 stack.append(altern)
@@ -177,7 +239,8 @@ class SyntaxTree:
 
         dot = graphviz.Digraph(format="png")
         if self.raiz:
-            self.raiz.to_dot(dot)
+            for nodo in recorrer(self.raiz):
+                nodo.to_dot(dot)
 
         # Guardar la imagen en la carpeta 'imagenes/'
         output_path = f"imagenes/{filename}"
@@ -1,6 +1,7 @@
 # src/models/yalex_parser.py
 
 import re
+from src.models.regex_parser import RegexParser
 
 class YALexParser:
     def __init__(self, filename):
@@ -10,6 +11,8 @@ class YALexParser:
         self.definitions = {}  # guardará {ident: regex_string}
         self.rules = []        # lista de (regex_string, action_code)
         self.entrypoint = None # nombre de la regla principal, si lo usas
+        self.definition_postfix = None  # {ident: postfija}, ver parse_definitions
+        self.definition_uses = {}       # {ident: definiciones que usa, directa o indirectamente}
 
     def parse(self):
         with open(self.filename, 'r', encoding='utf-8') as f:
@@ -104,18 +107,67 @@ class YALexParser:
             self.trailer_code = trailer_match.group(1).strip()
 
 
-    def expand_definitions(self, regex_str):
+    def parse_definitions(self):
         """
-        Sustituye cada identificador por su definición hasta que
-        no queden más nombres de definiciones en la cadena.
+        Parsea cada definición una sola vez a su notación postfija, después de
+        las que usa (una definición puede referenciar otra declarada más abajo).
+        Cada nombre queda como un símbolo que referencia la postfija ya parseada
+        (no se copia su texto), así el tamaño y el tiempo crecen linealmente con
+        las definiciones. Una definición que se usa a sí misma, directa o
+        indirectamente, es un ValueError.
+        Devuelve {ident: postfija}, el 'definitions' de RegexParser.
         """
-        # Repetimos hasta que no haya ningún cambio
-        while True:
-            new_regex = regex_str
-            for ident, definition in self.definitions.items():
-                pattern = re.compile(r'\b' + re.escape(ident) + r'\b')
-                new_regex = pattern.sub(lambda m: f"({definition})", new_regex)
-            if new_regex == regex_str:
-                break
-            regex_str = new_regex
-        return regex_str
\ No newline at end of file
+        if self.definition_postfix is None:
+            postfix = {}
+            for ident in self.definition_order():
+                r_parser = RegexParser(self.definitions[ident], postfix)
+                r_parser.tokenize()
+                postfix[ident] = r_parser.to_postfix()
+                self.definition_uses[ident] = self.dependencies(r_parser.references)
+            self.definition_postfix = postfix
+        return self.definition_postfix
+
+    def definition_order(self):
+        """
+        Nombres de las definiciones en orden de dependencias (cada una después
+        de las que referencia; si no, en orden de declaración). Las referencias
+        salen del mismo tokenizador que las parsea, así un nombre dentro de un
+        literal o de una clase [...] no cuenta.
+        """
+        names = dict.fromkeys(self.definitions, [])
+        references = {}
+        for ident, regex_str in self.definitions.items():
+            r_parser = RegexParser(regex_str, names)
+            r_parser.tokenize()
+            references[ident] = list(dict.fromkeys(r_parser.references))
+
+        order = []
+        state = {}  # ident -> 1 en el camino actual, 2 ya ordenado
+        for root in self.definitions:
+            if root in state:
+                continue
+            state[root] = 1
+            stack = [(root, iter(references[root]))]
+            while stack:
+                ident, pending = stack[-1]
+                for name in pending:
+                    if state.get(name) == 1:
+                        cycle = [frame[0] for frame in stack]
+                        cycle = cycle[cycle.index(name):] + [name]
+                        raise ValueError(f"Definición recursiva: {' -> '.join(cycle)}")
+                    if name not in state:
+                        state[name] = 1
+                        stack.append((name, iter(references[name])))
+                        break
+                else:
+                    state[ident] = 2
+                    order.append(ident)
+                    stack.pop()
+        return order
+
+    def dependencies(self, references):
+        """Definiciones referenciadas en 'references' y las que éstas usan, ordenadas."""
+        uses = set(references)
+        for ident in references:
+            uses.update(self.definition_uses.get(ident, ()))
+        return sorted(uses)
\ No newline at end of file
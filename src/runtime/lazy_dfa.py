@@ -0,0 +1,116 @@
+# src/runtime/lazy_dfa.py
+
+from src.runtime.lexer_interface import range_class
+
+# Tope por defecto de estados materializados antes de vaciar la caché
+DEFAULT_MAX_STATES = 10000
+
+# Transición todavía no calculada (None ya significa "sin transición")
+_UNKNOWN = object()
+
+
+class LazyState:
+    """Estado materializado: sus posiciones, las transiciones ya calculadas y la regla que acepta."""
+    __slots__ = ('positions', 'row', 'rule')
+
+    def __init__(self, positions, rule):
+        self.positions = positions
+        self.row = {}
+        self.rule = rule
+
+
+class LazyDFA:
+    """
+    DFA global construido bajo demanda a partir de followpos: en lugar de la
+    tabla completa, el generador entrega por cada posición sus clases y su
+    followpos ('positions'), las posiciones iniciales y la regla de cada
+    posición marcador ('accept'). Un estado (conjunto de posiciones) y cada
+    una de sus transiciones se calculan la primera vez que el escáner los
+    necesita; el arranque es inmediato y la memoria depende sólo de la parte
+    de la gramática que la entrada usa.
+
+    Si los estados materializados superan max_states, la caché se vacía por
+    completo (como en RE2): los estados que un escáner tenga en uso siguen
+    siendo válidos, sólo pierden sus transiciones y se recalculan.
+    """
+
+    def __init__(self, data, max_states=DEFAULT_MAX_STATES):
+        self.classes = data['classes']
+        self.ranges = data['ranges']
+        # Por clase: posiciones que la reconocen, con su followpos
+        self.class_follow = {}
+        for pos, (class_ids, follow) in data['positions'].items():
+            for class_id in class_ids:
+                self.class_follow.setdefault(class_id, {})[pos] = frozenset(follow)
+        self.accept = data['accept']
+        self.initial_positions = frozenset(data['initial'])
+        self.max_states = max_states
+        self.flushes = 0
+        self.cache = {}
+        self.initial = self.state(self.initial_positions)
+
+    def state(self, positions):
+        """Estado de un conjunto de posiciones (lo materializa si hace falta)."""
+        state = self.cache.get(positions)
+        if state is None:
+            if len(self.cache) >= self.max_states:
+                self.flush()
+            rules = [self.accept[pos] for pos in positions if pos in self.accept]
+            state = self.cache[positions] = LazyState(positions, min(rules) if rules else None)
+        return state
+
+    def flush(self):
+        """Vacía la caché de estados y transiciones (conserva el estado inicial)."""
+        for state in self.cache.values():
+            state.row.clear()
+        self.cache.clear()
+        self.flushes += 1
+        self.cache[self.initial_positions] = self.initial
+
+    def transition(self, state, class_id):
+        """Destino de 'state' con la clase 'class_id' (None si no hay); queda en state.row."""
+        follow = self.class_follow.get(class_id)
+        target = None
+        if follow:
+            positions = set()
+            for pos in state.positions:
+                follows = follow.get(pos)
+                if follows:
+                    positions |= follows
+            if positions:
+                target = self.state(frozenset(positions))
+        state.row[class_id] = target
+        return target
+
+
+def match_lazy(lazy, text, pos, end):
+    """
+    Como match_global, sobre un LazyDFA: devuelve (longitud del mayor prefijo
+    aceptado o -1, índice de regla, si el recorrido llegó vivo a 'end',
+    transiciones tomadas).
+    """
+    classes = lazy.classes
+    ranges = lazy.ranges
+    state = lazy.initial
+    last_accept = -1
+    rule_index = None
+    i = pos
+    while i < end:
+        class_id = classes.get(text[i])
+        if class_id is None:
+            if not ranges:
+                break
+            class_id = range_class(ranges, text[i])
+            if class_id is None:
+                break
+        target = state.row.get(class_id, _UNKNOWN)
+        if target is _UNKNOWN:
+            target = lazy.transition(state, class_id)
+        if target is None:
+            break
+        state = target
+        i += 1
+        if state.rule is not None:
+            last_accept = i - pos
+            rule_index = state.rule
+    return last_accept, rule_index, i == end, i - pos
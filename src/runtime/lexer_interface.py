@@ -0,0 +1,825 @@
+# src/runtime/lexer_interface.py
+
+import os
+import re
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from src.runtime.token_stream import TokenStream
+
+# Reconocimiento rápido de números científicos (atajo previo a los DFAs)
+NUMBER_FAST_PATH = re.compile(r'\d+\.\d+(?:[eE][+-]?\d+)?')
+# Prefijos que todavía pueden crecer hasta un número del atajo; en modo
+# streaming, si el resto del búfer es uno de ellos hay que leer más antes de decidir
+NUMBER_FAST_PREFIX = re.compile(r'\d+(?:\.(?:\d+(?:[eE][+-]?\d*)?)?)?')
+# Mismos patrones para entradas binarias (bytes, memoryview, mmap); en bytes
+# '\d' sólo cubre los dígitos ASCII
+NUMBER_FAST_PATH_BYTES = re.compile(NUMBER_FAST_PATH.pattern.encode())
+NUMBER_FAST_PREFIX_BYTES = re.compile(NUMBER_FAST_PREFIX.pattern.encode())
+
+# Tamaño de bloque por defecto para iter_tokens (en caracteres)
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Mayor punto de código Unicode (cota de búsqueda en los rangos de clases)
+MAX_CODE_POINT = 0x10FFFF
+
+# Tamaño objetivo de cada tramo en parallel_tokens (en caracteres o bytes)
+DEFAULT_PARALLEL_CHUNK_SIZE = 1 << 22
+
+
+def utf8_width(lead):
+    """Cantidad de bytes del carácter UTF-8 que empieza con el byte 'lead'."""
+    if lead < 0x80:
+        return 1
+    if lead >= 0xF0:
+        return 4
+    if lead >= 0xE0:
+        return 3
+    if lead >= 0xC0:
+        return 2
+    return 1  # byte de continuación suelto: se consume solo
+
+
+def range_class(ranges, ch):
+    """
+    Clase de 'ch' según los rangos anchos (inicio, fin, clase) de una tabla,
+    ordenados por inicio; None si ningún rango lo contiene.
+    """
+    code = ord(ch)
+    k = bisect_right(ranges, (code, MAX_CODE_POINT + 1)) - 1
+    if k >= 0 and code <= ranges[k][1]:
+        return ranges[k][2]
+    return None
+
+
+def utf8_sequences(lo, hi):
+    """
+    Parte el rango de puntos de código [lo, hi] en secuencias de rangos de
+    bytes UTF-8: cada secuencia es una tupla ((b1_min, b1_max), (b2_min, b2_max), ...)
+    y reconoce exactamente los caracteres cuya codificación cae byte a byte
+    en esos rangos. Los sustitutos (U+D800..U+DFFF) no se codifican.
+    """
+    if lo <= 0xDFFF and hi >= 0xD800:
+        sequences = []
+        if lo < 0xD800:
+            sequences += utf8_sequences(lo, 0xD7FF)
+        if hi > 0xDFFF:
+            sequences += utf8_sequences(0xE000, hi)
+        return sequences
+    # Todos los caracteres deben tener la misma longitud codificada
+    for limit in (0x7F, 0x7FF, 0xFFFF):
+        if lo <= limit < hi:
+            return utf8_sequences(lo, limit) + utf8_sequences(limit + 1, hi)
+    # ... y cada byte de continuación debe recorrer un tramo completo
+    for width in range(1, 4):
+        mask = (1 << (6 * width)) - 1
+        if lo & ~mask != hi & ~mask:
+            if lo & mask:
+                return utf8_sequences(lo, lo | mask) + utf8_sequences((lo | mask) + 1, hi)
+            if hi & mask != mask:
+                return utf8_sequences(lo, (hi & ~mask) - 1) + utf8_sequences(hi & ~mask, hi)
+    first = chr(lo).encode('utf-8')
+    last = chr(hi).encode('utf-8')
+    return [tuple(zip(first, last))]
+
+
+def to_byte_table(table):
+    """
+    Deriva de una tabla por clases de caracteres otra que se recorre por byte (UTF-8).
+    Cada byte ASCII usa la clase de su carácter; cada byte >= 0x80 tiene su
+    propia pseudo-clase, y los caracteres de varios bytes se desdoblan en
+    estados intermedios (nunca de aceptación) encadenados por esas pseudo-clases.
+    Los rangos anchos se codifican como secuencias de rangos de bytes
+    (utf8_sequences) y los estados intermedios iguales se comparten, así
+    una clase como [\u0000-\uffff] no se expande carácter por carácter.
+    El resto de la tabla ('initial', 'accepting', 'action', ...) se conserva.
+    """
+    classes = table['classes']
+    ranges = table.get('ranges', ())
+    transitions = table['transitions']
+    first_pseudo = max([*classes.values(), *(class_id for _, _, class_id in ranges)],
+                       default=-1) + 1
+    byte_classes = { b: first_pseudo + b - 0x80 for b in range(0x80, 0x100) }
+    wide = {}  # clase -> [(inicio, fin)] de puntos de código no ASCII
+    for ch, class_id in classes.items():
+        # Símbolos de varios caracteres nunca empatan un único carácter
+        if len(ch) != 1:
+            continue
+        if ord(ch) < 0x80:
+            byte_classes[ord(ch)] = class_id
+        else:
+            wide.setdefault(class_id, []).append((ord(ch), ord(ch)))
+    for lo, hi, class_id in ranges:
+        for code in range(lo, min(hi, 0x7F) + 1):
+            byte_classes[code] = class_id
+        if hi >= 0x80:
+            wide.setdefault(class_id, []).append((max(lo, 0x80), hi))
+    sequences = { class_id: [seq for lo, hi in spans for seq in utf8_sequences(lo, hi)]
+                  for class_id, spans in wide.items() }
+
+    byte_transitions = { state: dict(row) for state, row in transitions.items() }
+    next_state = max(transitions) + 1
+    shared = {}  # (sufijos, destino) -> estado intermedio ya construido
+
+    def add_branches(row, items):
+        # items: [(secuencia de rangos de bytes, destino)], con secuencias disjuntas
+        nonlocal next_state
+        for b in range(0x80, 0x100):
+            here = [(seq[1:], target) for seq, target in items if seq[0][0] <= b <= seq[0][1]]
+            if not here:
+                continue
+            if not here[0][0]:
+                # Último byte del carácter: se llega al destino real
+                row[byte_classes[b]] = here[0][1]
+                continue
+            key = frozenset(here)
+            nxt = shared.get(key)
+            if nxt is None:
+                nxt = shared[key] = next_state
+                next_state += 1
+                byte_transitions[nxt] = {}
+                add_branches(byte_transitions[nxt], here)
+            row[byte_classes[b]] = nxt
+
+    for state, row in transitions.items():
+        items = [(seq, target)
+                 for class_id, target in row.items()
+                 for seq in sequences.get(class_id, ())]
+        if items:
+            add_branches(byte_transitions[state], items)
+    byte_table = dict(table)
+    byte_table['classes'] = byte_classes
+    byte_table['ranges'] = []
+    byte_table['transitions'] = byte_transitions
+    return byte_table
+
+
+def match_table(table, text, pos, end):
+    """
+    Recorre la tabla de transiciones de una regla desde text[pos] y devuelve
+    (longitud del mayor prefijo aceptado o -1, si el recorrido llegó vivo a 'end').
+    """
+    classes = table['classes']
+    ranges = table.get('ranges')
+    transitions = table['transitions']
+    accepting = table['accepting']
+    state = table['initial']
+    last_accept = -1
+    i = pos
+    while i < end:
+        class_id = classes.get(text[i])
+        if class_id is None:
+            # Fuera del mapa por carácter: sólo queda buscar en los rangos anchos
+            if not ranges:
+                break
+            class_id = range_class(ranges, text[i])
+            if class_id is None:
+                break
+        state = transitions[state].get(class_id)
+        if state is None:
+            break
+        i += 1
+        if state in accepting:
+            last_accept = i - pos
+    return last_accept, i == end
+
+
+def match_global(table, text, pos, end):
+    """
+    Recorre el DFA global una sola vez desde text[pos] y devuelve
+    (longitud, índice de regla, si llegó vivo a 'end') del mayor prefijo
+    aceptado; (-1, None, ...) si no hay ninguno.
+    La prioridad entre reglas ya viene resuelta en table['accepting'].
+    """
+    classes = table['classes']
+    ranges = table.get('ranges')
+    transitions = table['transitions']
+    accepting = table['accepting']
+    state = table['initial']
+    last_accept = -1
+    rule_index = None
+    i = pos
+    while i < end:
+        class_id = classes.get(text[i])
+        if class_id is None:
+            # Fuera del mapa por carácter: sólo queda buscar en los rangos anchos
+            if not ranges:
+                break
+            class_id = range_class(ranges, text[i])
+            if class_id is None:
+                break
+        state = transitions[state].get(class_id)
+        if state is None:
+            break
+        i += 1
+        winner = accepting.get(state)
+        if winner is not None:
+            last_accept = i - pos
+            rule_index = winner
+    return last_accept, rule_index, i == end
+
+
+def match_counted(table, text, pos, end):
+    """
+    Igual que match_table/match_global, para el modo con estadísticas.
+    Devuelve (longitud del mayor prefijo aceptado o -1, su estado de
+    aceptación, cantidad de prefijos aceptados en el camino, transiciones
+    tomadas, si el recorrido llegó vivo a 'end').
+    """
+    classes = table['classes']
+    ranges = table.get('ranges')
+    transitions = table['transitions']
+    accepting = table['accepting']
+    state = table['initial']
+    last_accept = -1
+    accept_state = None
+    accepts = 0
+    i = pos
+    while i < end:
+        class_id = classes.get(text[i])
+        if class_id is None:
+            if not ranges:
+                break
+            class_id = range_class(ranges, text[i])
+            if class_id is None:
+                break
+        state = transitions[state].get(class_id)
+        if state is None:
+            break
+        i += 1
+        if state in accepting:
+            last_accept = i - pos
+            accept_state = state
+            accepts += 1
+    return last_accept, accept_state, accepts, i - pos, i == end
+
+
+class LexerStats:
+    """
+    Contadores de un lexer creado con stats=True:
+      rule_hits            tokens reconocidos por cada regla (índice en RULES),
+                           incluidos los que la acción descarta
+      fast_path_hits       números reconocidos por el atajo NUMBER_FAST_PATH
+      fallback_hits        caracteres resueltos sin DFA (puntuación o desconocidos)
+      transitions          transiciones de DFA tomadas
+      rejected_candidates  coincidencias descartadas: en modo 'rules', reglas que
+                           reconocieron un prefijo pero perdieron; en modo
+                           'global', prefijos aceptados más cortos que el elegido
+      tokens               tokens entregados
+      scan_time / action_time / total_time
+                           segundos en los DFAs, en las acciones y en total
+                           (el resto es atajo, lexemas y traza)
+    Los contadores sólo incluyen escaneos de tokens confirmados: iter_tokens
+    da los mismos números que get_tokens; los tiempos sí incluyen repeticiones.
+    """
+
+    def __init__(self, rule_names):
+        self.rule_names = list(rule_names)
+        self.rule_hits = [0] * len(self.rule_names)
+        self.fast_path_hits = 0
+        self.fallback_hits = 0
+        self.transitions = 0
+        self.rejected_candidates = 0
+        self.scans = 0
+        self.tokens = 0
+        self.scan_time = 0.0
+        self.action_time = 0.0
+        self.total_time = 0.0
+
+    def as_dict(self):
+        return {
+            'rule_hits': { name: hits for name, hits in zip(self.rule_names, self.rule_hits) },
+            'fast_path_hits': self.fast_path_hits,
+            'fallback_hits': self.fallback_hits,
+            'transitions': self.transitions,
+            'rejected_candidates': self.rejected_candidates,
+            'scans': self.scans,
+            'tokens': self.tokens,
+            'scan_time': self.scan_time,
+            'action_time': self.action_time,
+            'total_time': self.total_time,
+        }
+
+    def __str__(self):
+        lines = [f"tokens: {self.tokens}  transiciones: {self.transitions}  "
+                 f"candidatos descartados: {self.rejected_candidates}",
+                 f"tiempo: total {self.total_time:.6f} s, DFAs {self.scan_time:.6f} s, "
+                 f"acciones {self.action_time:.6f} s",
+                 f"atajo de números: {self.fast_path_hits}  sin DFA: {self.fallback_hits}"]
+        # Reglas más usadas primero
+        for hits, name in sorted(zip(self.rule_hits, self.rule_names), key=lambda item: -item[0]):
+            if hits:
+                lines.append(f"  {hits:>10}  {name}")
+        return "\n".join(lines)
+
+
+def tokenize_chunk(lexer_cls, mode, chunk, base):
+    """
+    Tokeniza un tramo en un proceso de parallel_tokens y devuelve sus tokens
+    (sin el EOF final). 'base' es la posición absoluta del tramo en la entrada.
+    Sin traza: varios procesos escribiendo a la vez la mezclarían; los tokens
+    se muestran al unir los resultados, en orden.
+    """
+    lexer = lexer_cls(chunk, mode=mode, trace=False)
+    tokens = list(lexer.tokens(base=base))
+    tokens.pop()
+    return tokens
+
+
+class LexerInterface:
+    """
+    Motor de ejecución común a los lexers generados.
+    El módulo generado (thelexer.py) sólo aporta datos: las tablas de cada
+    regla, el mapa de puntuaciones y las acciones ya compiladas como funciones
+    (ACTIONS[i] es la acción de RULES[i]; se llama con (lexeme, text)).
+    Aquí no se importa nada de src.models: las tablas ya vienen construidas.
+    """
+    RULES = []
+    # Obligatorio en la clase generada (ver generate_lexer)
+    ACTIONS = None
+    GLOBAL_DFA = None
+    PUNCTUATIONS = {}
+    NUMBER_TOKEN = "NUMBER"
+    EOF_TOKEN = "EOF"
+    # Caracteres tras los cuales siempre termina un token (los calcula el
+    # generador a partir de los DFAs): parallel_tokens corta la entrada ahí
+    SYNC_CHARS = frozenset()
+    # Destino de la traza por token de todas las instancias (None: silencio)
+    TRACE = None
+    # DFA global por posiciones para el modo 'lazy' (generate_lexer(lazy=True))
+    # y tope de estados materializados (None: el de lazy_dfa)
+    LAZY_DFA = None
+    LAZY_MAX_STATES = None
+    # DFA global compilado a código para el modo 'direct' (generate_lexer(direct=True)):
+    # función (text, pos, end) -> (longitud o -1, índice de regla, llegó al final)
+    DIRECT_MATCH = None
+
+    # 'global': un recorrido del DFA global por token (coste independiente del número de reglas)
+    # 'rules':  prueba el DFA de cada regla y se queda con el mayor prefijo
+    # 'lazy':   como 'global', pero los estados del DFA se construyen al necesitarlos
+    # 'direct': como 'global', con el DFA escrito como código (sin consultar tablas)
+    MODES = ("global", "rules", "lazy", "direct")
+    DEFAULT_MODE = "global"
+
+    def __init__(self, input_text="", mode=None, stats=False, trace=None):
+        """
+        input_text puede ser un str o una entrada binaria en UTF-8 (bytes,
+        bytearray, memoryview o mmap). Las binarias se recorren byte a byte
+        sin decodificarlas completas; sólo cada lexema emitido se convierte a str.
+        Con stats=True el lexer cuenta lo que hace en self.stats (LexerStats).
+        'trace' es una función que recibe una línea por token (print, un
+        logger.debug, ...); None usa TRACE de la clase y False la apaga.
+        Ambos caminos se eligen aquí: sin stats ni traza no hay ningún costo extra.
+        mode=None usa DEFAULT_MODE de la clase.
+        """
+        if mode is None:
+            mode = self.DEFAULT_MODE
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de lexer desconocido: {mode!r} (opciones: {', '.join(self.MODES)})")
+        self.input_text = input_text
+        self.pos = 0
+        self.mode = mode
+        if self.ACTIONS is None or len(self.ACTIONS) != len(self.RULES):
+            raise ValueError(f"{type(self).__name__} no define ACTIONS (una acción por regla de RULES): "
+                             "volver a generar el lexer con generate_lexer")
+        self._actions = self.ACTIONS
+        self.stats = None
+        if stats:
+            self._instrument()
+        trace = self.TRACE if trace is None else trace
+        if trace:
+            self._trace_tokens(trace)
+        self._configure(not isinstance(input_text, str))
+
+    def _instrument(self):
+        """
+        Reemplaza, sólo en esta instancia, las acciones y _next_token por
+        versiones que miden; _scanner elige además los escáneres que cuentan.
+        """
+        stats = self.stats = LexerStats(rule.get('regex', str(index))
+                                        for index, rule in enumerate(self.RULES))
+
+        def timed_action(index, action):
+            def run(lexeme, text):
+                start = perf_counter()
+                try:
+                    return action(lexeme, text)
+                finally:
+                    stats.action_time += perf_counter() - start
+                    stats.rule_hits[index] += 1
+            return run
+        self._actions = [timed_action(index, action) for index, action in enumerate(self._actions)]
+
+        # Los escáneres que cuentan escriben aquí; los contadores pasan a
+        # 'stats' sólo si el token se confirma: si _next_token pide más
+        # entrada (iter_tokens), el mismo tramo se vuelve a escanear después
+        pending = self._pending = LexerStats(())
+
+        next_token = self._next_token
+        def counted_next_token(text, pos, end, scan, final=True, base=0):
+            pending.scans = pending.transitions = 0
+            pending.fallback_hits = pending.rejected_candidates = 0
+            pending.scan_time = 0.0
+            start = perf_counter()
+            result = next_token(text, pos, end, scan, final, base)
+            stats.total_time += perf_counter() - start
+            # El tiempo sí se gastó, aunque el escaneo se repita
+            stats.scan_time += pending.scan_time
+            if result is not None:
+                stats.scans += pending.scans
+                stats.transitions += pending.transitions
+                stats.fallback_hits += pending.fallback_hits
+                stats.rejected_candidates += pending.rejected_candidates
+                if result[1] is not None:
+                    stats.tokens += 1
+                if pending.scans == 0:
+                    stats.fast_path_hits += 1
+            return result
+        self._next_token = counted_next_token
+
+    def _configure(self, binary):
+        """Elige las tablas (por carácter o por byte) según el tipo de entrada."""
+        self.binary = binary
+        if self.mode == "lazy":
+            if binary:
+                raise ValueError("El modo 'lazy' sólo acepta entradas str")
+            if self.LAZY_DFA is None:
+                raise ValueError("Este lexer no trae LAZY_DFA: generarlo con generate_lexer(lazy=True)")
+            # Se importa aquí: lazy_dfa usa range_class de este módulo
+            from src.runtime.lazy_dfa import LazyDFA, match_lazy
+            cls = type(self)
+            # Un único DFA perezoso por clase: los estados ya construidos sirven a todas las instancias
+            lazy_dfa = cls.__dict__.get('_lazy_dfa')
+            if lazy_dfa is None:
+                kwargs = {} if cls.LAZY_MAX_STATES is None else {'max_states': cls.LAZY_MAX_STATES}
+                lazy_dfa = cls._lazy_dfa = LazyDFA(cls.LAZY_DFA, **kwargs)
+            self._lazy_dfa = lazy_dfa
+            self._match_lazy = match_lazy
+        elif self.mode == "direct":
+            if binary:
+                raise ValueError("El modo 'direct' sólo acepta entradas str")
+            if self.DIRECT_MATCH is None:
+                raise ValueError("Este lexer no trae DIRECT_MATCH: generarlo con generate_lexer(direct=True)")
+        if binary:
+            cls = type(self)
+            # Las tablas por byte se derivan una sola vez por clase, en el primer uso
+            byte_tables = cls.__dict__.get('_byte_tables')
+            if byte_tables is None:
+                byte_tables = (
+                    [to_byte_table(rule) for rule in cls.RULES],
+                    to_byte_table(cls.GLOBAL_DFA) if cls.GLOBAL_DFA else None,
+                )
+                cls._byte_tables = byte_tables
+            self._rule_tables, self._global_table = byte_tables
+            self._fast_path = NUMBER_FAST_PATH_BYTES
+            self._fast_prefix = NUMBER_FAST_PREFIX_BYTES
+        else:
+            self._rule_tables = self.RULES
+            self._global_table = self.GLOBAL_DFA
+            self._fast_path = NUMBER_FAST_PATH
+            self._fast_prefix = NUMBER_FAST_PREFIX
+
+    @property
+    def rules(self):
+        return self.RULES
+
+    def _scan_rules(self, text, pos, end):
+        """
+        Prueba cada regla y devuelve (longitud, índice de regla, llegó al final)
+        del mayor prefijo; gana la primera en empate.
+        """
+        longest_match = 0
+        selected = None
+        hit_end = False
+        for index, rule in enumerate(self._rule_tables):
+            ml, at_end = match_table(rule, text, pos, end)
+            hit_end = hit_end or at_end
+            if ml > longest_match:
+                longest_match = ml
+                selected = index
+        return longest_match, selected, hit_end
+
+    def _scan_global(self, text, pos, end):
+        """Un único recorrido del DFA global; devuelve (longitud, índice de regla, llegó al final)."""
+        length, rule_index, hit_end = match_global(self._global_table, text, pos, end)
+        if rule_index is None:
+            return 0, None, hit_end
+        return length, rule_index, hit_end
+
+    def _scan_rules_stats(self, text, pos, end):
+        """_scan_rules contando transiciones y reglas descartadas."""
+        counts = self._pending
+        start = perf_counter()
+        longest_match = 0
+        selected = None
+        hit_end = False
+        candidates = 0
+        for index, rule in enumerate(self._rule_tables):
+            ml, _, _, steps, at_end = match_counted(rule, text, pos, end)
+            counts.transitions += steps
+            hit_end = hit_end or at_end
+            if ml > 0:
+                candidates += 1
+            if ml > longest_match:
+                longest_match = ml
+                selected = index
+        counts.scans += 1
+        if selected is None:
+            counts.fallback_hits += 1
+        else:
+            counts.rejected_candidates += candidates - 1
+        counts.scan_time += perf_counter() - start
+        return longest_match, selected, hit_end
+
+    def _scan_global_stats(self, text, pos, end):
+        """_scan_global contando transiciones y prefijos aceptados descartados."""
+        counts = self._pending
+        start = perf_counter()
+        table = self._global_table
+        length, state, accepts, steps, hit_end = match_counted(table, text, pos, end)
+        counts.transitions += steps
+        counts.scans += 1
+        if state is None:
+            counts.fallback_hits += 1
+            result = 0, None, hit_end
+        else:
+            counts.rejected_candidates += accepts - 1
+            result = length, table['accepting'][state], hit_end
+        counts.scan_time += perf_counter() - start
+        return result
+
+    def _scan_lazy(self, text, pos, end):
+        """Un recorrido del DFA perezoso; devuelve (longitud, índice de regla, llegó al final)."""
+        length, rule_index, hit_end, _ = self._match_lazy(self._lazy_dfa, text, pos, end)
+        if rule_index is None:
+            return 0, None, hit_end
+        return length, rule_index, hit_end
+
+    def _scan_lazy_stats(self, text, pos, end):
+        """_scan_lazy contando transiciones (los prefijos descartados no se cuentan)."""
+        counts = self._pending
+        start = perf_counter()
+        length, rule_index, hit_end, steps = self._match_lazy(self._lazy_dfa, text, pos, end)
+        counts.transitions += steps
+        counts.scans += 1
+        if rule_index is None:
+            counts.fallback_hits += 1
+            length = 0
+        counts.scan_time += perf_counter() - start
+        return length, rule_index, hit_end
+
+    def _scan_direct_stats(self, text, pos, end):
+        """DIRECT_MATCH contando reconocimientos (el código generado no cuenta transiciones)."""
+        counts = self._pending
+        start = perf_counter()
+        length, rule_index, hit_end = self.DIRECT_MATCH(text, pos, end)
+        counts.scans += 1
+        if rule_index is None:
+            counts.fallback_hits += 1
+            length = 0
+        counts.scan_time += perf_counter() - start
+        return length, rule_index, hit_end
+
+    def _scanner(self):
+        if self.stats is not None:
+            return {"global": self._scan_global_stats, "rules": self._scan_rules_stats,
+                    "lazy": self._scan_lazy_stats, "direct": self._scan_direct_stats}[self.mode]
+        # El escáner generado se llama sin envoltorio: su -1 sin coincidencia
+        # ya cuenta como "ningún prefijo" en _next_token
+        return {"global": self._scan_global, "rules": self._scan_rules,
+                "lazy": self._scan_lazy, "direct": self.DIRECT_MATCH}[self.mode]
+
+    def _next_token(self, text, pos, end, scan, final=True, base=0):
+        """
+        Reconoce un token en text[pos:end].
+        Devuelve (nueva posición, token o None si la acción lo descarta).
+        Si final es False y el token podría seguir más allá de 'end',
+        devuelve None para que quien llama lea más entrada antes de decidir.
+        'base' sólo sirve para informar posiciones absolutas.
+        """
+        if not final and self._fast_prefix.fullmatch(text, pos, end):
+            return None
+        m = self._fast_path.match(text, pos, end)
+        if m:
+            lexeme = m.group(0)
+            if self.binary:
+                lexeme = str(lexeme, 'utf-8')
+            return m.end(), (self.NUMBER_TOKEN, lexeme)
+        # Mayor prefijo reconocido y regla ganadora
+        longest_match, rule_index, hit_end = scan(text, pos, end)
+        if hit_end and not final:
+            return None
+        if longest_match > 0:
+            lexeme = text[pos:pos+longest_match]
+            if self.binary:
+                lexeme = str(lexeme, 'utf-8', 'replace')
+            tok = self._actions[rule_index](lexeme, text)
+            # si la acción ya devolvió (TOKEN, lexeme), lo usamos directamente
+            if tok is not None and not isinstance(tok, tuple):
+                tok = (tok, lexeme)
+            return pos + longest_match, tok
+        # Si ningún DFA empató, símbolos puntuales
+        if self.binary:
+            # Un carácter completo: puede ocupar varios bytes
+            width = utf8_width(text[pos])
+            if pos + width > end and not final:
+                return None
+            ch = str(text[pos:pos+width], 'utf-8', 'replace')
+        else:
+            width = 1
+            ch = text[pos]
+        mapped = self.PUNCTUATIONS.get(ch)
+        if mapped is not None:
+            return pos + width, (mapped, ch)
+        # Carácter no declarado en la gramática: lo marcamos como UNKNOWN y continuamos
+        return pos + width, (None, ch)  # None indica token no reconocido
+
+    def get_tokens(self):
+        return list(self.tokens())
+
+    def _trace_tokens(self, trace):
+        """
+        Envuelve _next_token (sólo en esta instancia) para enviar a 'trace'
+        una línea por token reconocido y por carácter no reconocido.
+        """
+        next_token = self._next_token
+        def traced_next_token(text, pos, end, scan, final=True, base=0):
+            result = next_token(text, pos, end, scan, final, base)
+            if result is not None and result[1] is not None:
+                kind, lexeme = result[1]
+                if kind is None:
+                    trace(f"⟶ Token no reconocido: {lexeme!r} en posición {base + pos}")
+                else:
+                    trace(f"⟶ Token: {kind!r}, lexema: {lexeme!r}")
+            return result
+        self._next_token = traced_next_token
+
+    def tokens(self, base=0):
+        """
+        Genera los tokens de input_text uno a uno. Útil con entradas grandes
+        (por ejemplo un mmap) para no acumular toda la lista en memoria.
+        'base' es la posición absoluta de input_text[0] si la entrada es un
+        tramo de otra mayor (sólo se usa al informar posiciones).
+        """
+        text = self.input_text
+        end = len(text)
+        pos = 0
+        scan = self._scanner()
+        next_token = self._next_token
+        while pos < end:
+            pos, tok = next_token(text, pos, end, scan, base=base)
+            if tok is not None:
+                yield tok
+        self.pos = pos
+        yield (self.EOF_TOKEN, '')
+
+    def split_points(self, chunk_size=DEFAULT_PARALLEL_CHUNK_SIZE):
+        """
+        Posiciones [0, p1, ..., len] donde se puede cortar input_text sin
+        partir ningún token: cada pi queda justo después de un carácter de
+        SYNC_CHARS, a unos chunk_size de la anterior. En una entrada binaria
+        sólo se usan los caracteres ASCII (nunca se corta dentro de un
+        carácter UTF-8 de varios bytes).
+        """
+        text = self.input_text
+        end = len(text)
+        points = [0]
+        if self.binary:
+            sync = sorted(ch for ch in self.SYNC_CHARS if ord(ch) < 0x80)
+            pattern = re.compile(b"[" + re.escape("".join(sync).encode()) + b"]") if sync else None
+        else:
+            sync = sorted(self.SYNC_CHARS)
+            pattern = re.compile("[" + re.escape("".join(sync)) + "]") if sync else None
+        while pattern is not None and end - points[-1] > chunk_size:
+            m = pattern.search(text, points[-1] + chunk_size)
+            if m is None or m.end() == end:
+                break
+            points.append(m.end())
+        points.append(end)
+        return points
+
+    def parallel_tokens(self, workers=None, chunk_size=DEFAULT_PARALLEL_CHUNK_SIZE):
+        """
+        Igual que tokens(), pero corta input_text en split_points y tokeniza
+        cada tramo en un proceso aparte. Los tramos se unen en orden, así el
+        resultado es idéntico al secuencial. Se mantienen a lo sumo 2*workers
+        tramos en vuelo, así la memoria no crece con el tamaño de la entrada.
+        Las acciones reciben en 'text' el tramo, no la entrada completa.
+        """
+        text = self.input_text
+        points = self.split_points(chunk_size)
+        if len(points) <= 2:
+            yield from self.tokens()
+            return
+        lexer_cls = type(self)
+        workers = workers or os.cpu_count() or 1
+        window = 2 * workers
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for start, stop in zip(points, points[1:]):
+                chunk = text[start:stop]
+                if not isinstance(chunk, (str, bytes)):
+                    chunk = bytes(chunk)  # memoryview: se copia para enviarlo
+                pending.append(pool.submit(tokenize_chunk, lexer_cls, self.mode, chunk, start))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        self.pos = len(text)
+        yield (self.EOF_TOKEN, '')
+
+    def get_token_stream(self):
+        """
+        Igual que get_tokens, pero devuelve un TokenStream: tipo, inicio y
+        longitud de cada token en arreglos compactos, con los lexemas creados
+        al pedirlos. Ocupa varias veces menos memoria que la lista de tuplas.
+        """
+        text = self.input_text
+        end = len(text)
+        pos = 0
+        scan = self._scanner()
+        next_token = self._next_token
+        stream = TokenStream(text)
+        # stream.append desplegado en el bucle: es la parte caliente
+        type_ids = stream.type_ids
+        add_type = stream.type_id
+        add_kind = stream.types.append
+        add_start = stream.starts.append
+        add_length = stream.lengths.append
+        overrides = stream.overrides
+        binary = self.binary
+        index = 0
+        while pos < end:
+            new_pos, tok = next_token(text, pos, end, scan)
+            if tok is not None:
+                kind = tok[0]
+                type_id = type_ids.get(kind)
+                add_kind(add_type(kind) if type_id is None else type_id)
+                add_start(pos)
+                add_length(new_pos - pos)
+                if len(tok) != 2:
+                    overrides[index] = tok
+                else:
+                    lexeme = text[pos:new_pos]
+                    if binary:
+                        lexeme = str(lexeme, 'utf-8', 'replace')
+                    if tok[1] != lexeme:
+                        overrides[index] = tok
+                index += 1
+            pos = new_pos
+        self.pos = pos
+        stream.append((self.EOF_TOKEN, ''), end, 0)
+        return stream
+
+    def iter_tokens(self, fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Tokeniza un archivo de texto por bloques y va entregando los tokens
+        a medida que se reconocen, con memoria acotada por el tamaño de bloque
+        (más el lexema más largo). Un lexema que cruza el borde de un bloque
+        se conserva en el búfer y se vuelve a escanear con el bloque siguiente,
+        así el resultado es el mismo que el de get_tokens.
+        Las acciones reciben en 'text' el búfer actual, no la entrada completa.
+        Si el archivo está abierto en modo binario se usan las tablas por byte.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size debe ser positivo")
+        scan = self._scanner()
+        next_token = self._next_token
+        buf = None
+        base = 0       # desplazamiento absoluto de buf[0]
+        pos = 0
+        eof = False
+        need_more = True
+        while True:
+            if need_more and not eof:
+                # Rellenar: descartamos lo ya consumido y agregamos un bloque
+                chunk = fileobj.read(chunk_size)
+                if buf is None:
+                    buf = chunk[:0]
+                    self._configure(not isinstance(chunk, str))
+                    scan = self._scanner()
+                if chunk:
+                    base += pos
+                    buf = buf[pos:] + chunk
+                    pos = 0
+                else:
+                    eof = True
+            end = len(buf)
+            if pos >= end and eof:
+                break
+            # Mantenemos al menos un bloque de anticipación delante de pos
+            need_more = end - pos < chunk_size
+            if need_more and not eof:
+                continue
+            result = next_token(buf, pos, end, scan, final=eof, base=base)
+            if result is None:
+                # El token puede seguir en el próximo bloque: forzamos la lectura
+                need_more = True
+                continue
+            pos, tok = result
+            self.pos = base + pos
+            if tok is not None:
+                yield tok
+        yield (self.EOF_TOKEN, '')
@@ -0,0 +1,93 @@
+# src/runtime/token_stream.py
+
+from array import array
+
+
+class TokenStream:
+    """
+    Secuencia de tokens compacta (struct-of-arrays): por cada token guarda
+    sólo el id de su tipo, su inicio y su longitud en tres arreglos 'array',
+    y crea el lexema como porción de la entrada original recién al pedirlo.
+    Un token cuyo valor no es su porción de la entrada (la acción cambió el
+    lexema o devolvió otra cosa) se guarda completo en 'overrides'.
+
+    Se comporta como la lista de get_tokens: len, índices, rebanadas e
+    iteración entregan las mismas tuplas (tipo, lexema). Para recorridos
+    rápidos por tipo, 'types' es el arreglo de ids y 'type_ids' mapea cada
+    nombre de tipo a su id (por ejemplo stream.types.count(stream.type_ids['ID'])).
+    """
+
+    def __init__(self, text):
+        self.text = text
+        # Entrada binaria (bytes, mmap, ...): las porciones se decodifican al pedirlas
+        self.binary = not isinstance(text, str)
+        self.type_names = []
+        self.type_ids = {}
+        self.types = array('I')
+        self.starts = array('Q')
+        self.lengths = array('I')
+        self.overrides = {}
+
+    def type_id(self, name):
+        """Id del tipo 'name' (lo registra si es nuevo)."""
+        type_id = self.type_ids.get(name)
+        if type_id is None:
+            type_id = self.type_ids[name] = len(self.type_names)
+            self.type_names.append(name)
+        return type_id
+
+    def append(self, token, start, length):
+        """Agrega el token (tipo, valor) que ocupa text[start:start+length]."""
+        kind = token[0]
+        index = len(self.types)
+        self.types.append(self.type_id(kind))
+        self.starts.append(start)
+        self.lengths.append(length)
+        if len(token) != 2 or token[1] != self._slice(start, length):
+            self.overrides[index] = token
+
+    def _slice(self, start, length):
+        lexeme = self.text[start:start + length]
+        if self.binary:
+            lexeme = str(lexeme, 'utf-8', 'replace')
+        return lexeme
+
+    def lexeme(self, index):
+        """Valor del token 'index' (la porción de la entrada, salvo que la acción lo cambiara)."""
+        token = self.overrides.get(index)
+        if token is not None:
+            return token[1] if len(token) > 1 else None
+        return self._slice(self.starts[index], self.lengths[index])
+
+    def kind(self, index):
+        """Tipo del token 'index'."""
+        return self.type_names[self.types[index]]
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.types)))]
+        if index < 0:
+            index += len(self.types)
+        token = self.overrides.get(index)
+        if token is not None:
+            return token
+        return (self.type_names[self.types[index]],
+                self._slice(self.starts[index], self.lengths[index]))
+
+    def __iter__(self):
+        overrides = self.overrides
+        names = self.type_names
+        slice_ = self._slice
+        for index, (type_id, start, length) in enumerate(zip(self.types, self.starts, self.lengths)):
+            token = overrides.get(index)
+            yield token if token is not None else (names[type_id], slice_(start, length))
+
+    def to_list(self):
+        """Lista de tuplas (tipo, lexema), la misma que devuelve get_tokens."""
+        return list(self)
+
+    def __repr__(self):
+        return f"TokenStream({len(self)} tokens)"
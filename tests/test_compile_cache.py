@@ -0,0 +1,54 @@
+# tests/test_compile_cache.py
+import os
+import time
+import src.controllers.main_controller as main_controller
+from src.generators.compile_cache import CompileCache
+
+def test_warm_run_skips_compilation(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    first = tmp_path / "first.py"
+    second = tmp_path / "second.py"
+    main_controller.generate_lexer(output_filename=str(first), cache_dir=str(cache_dir))
+
+    # Con la entrada en caché no se vuelve a parsear ninguna regex
+    def fail(*args, **kwargs):
+        raise AssertionError("la compilación debió salir de la caché")
+    monkeypatch.setattr(main_controller, "RegexParser", fail)
+    main_controller.generate_lexer(output_filename=str(second), cache_dir=str(cache_dir))
+    assert first.read_text(encoding="utf-8") == second.read_text(encoding="utf-8")
+
+def test_key_depends_on_spec_and_version():
+    assert CompileCache.key("a", "1") != CompileCache.key("b", "1")
+    assert CompileCache.key("a", "1") != CompileCache.key("a", "2")
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = CompileCache(str(tmp_path))
+    cache.store("spec", "1", {'x': 1})
+    with open(cache.path("spec", "1"), "wb") as f:
+        f.write(b"basura")
+    assert cache.load("spec", "1") is None
+    assert not os.path.exists(cache.path("spec", "1"))
+
+def test_evicts_old_entries(tmp_path):
+    cache = CompileCache(str(tmp_path), max_age=100)
+    cache.store("vieja", "1", 1)
+    cache.store("nueva", "1", 2)
+    old = cache.path("vieja", "1")
+    os.utime(old, (0, 0))
+    cache.evict(now=1000)
+    assert cache.load("vieja", "1") is None
+    assert cache.load("nueva", "1") == 2
+
+def test_evicts_least_recently_used_over_size(tmp_path):
+    cache = CompileCache(str(tmp_path))
+    now = time.time()
+    for i, spec in enumerate(["a", "b", "c"]):
+        cache.store(spec, "1", b"x" * 1000)
+        os.utime(cache.path(spec, "1"), (now - 10 + i, now - 10 + i))
+    # Leer 'a' la vuelve la más reciente: se expulsa 'b'
+    assert cache.load("a", "1") is not None
+    cache.max_bytes = 2500
+    cache.evict()
+    assert cache.load("b", "1") is None
+    assert cache.load("a", "1") is not None
+    assert cache.load("c", "1") is not None
@@ -36,3 +36,53 @@ def test_dfa_union(make_dfa):
     assert dfa.simulate("a")
     assert dfa.simulate("b")
     assert not dfa.simulate("ab")
+
+def test_dfa_match_prefix_offsets(make_dfa):
+    dfa = make_dfa("(a|b)*abb#")
+    text = "xxabbab"
+    # Escanea desde un desplazamiento sin recortar la cadena
+    assert dfa.match_prefix(text, 2) == 3
+    assert dfa.match_prefix(text, 2, 4) == -1
+    assert dfa.match_prefix("abb") == 3
+
+def test_dfa_equivalence_classes(make_dfa):
+    dfa = make_dfa("[A-Za-z]([A-Za-z]|[0-9])*#")
+    # Todas las letras en una clase y todos los dígitos en otra
+    assert len(dfa.char_classes) == 2
+    assert dfa.class_of['a'] == dfa.class_of['Z']
+    assert dfa.class_of['0'] != dfa.class_of['a']
+    assert dfa.simulate("x9Y") and not dfa.simulate("9x")
+
+def test_dfa_wide_unicode_range(make_dfa):
+    dfa = make_dfa(r"[\u0000-\uffff]+#")
+    # Una sola posición para toda la clase, guardada como rango ancho
+    assert len(dfa.followpos) == 2
+    assert dfa.wide_ranges == [(0, 0xFFFF, 0)]
+    assert dfa.simulate("héllo\uffff")
+    assert not dfa.simulate("\U0001F600")
+
+def test_dfa_negated_class(make_dfa):
+    dfa = make_dfa("[^0-9]+#")
+    assert dfa.simulate("abc€")
+    assert not dfa.simulate("a1")
+
+def test_dfa_bitsets_build_same_tables():
+    postfix = RegexParser("[A-Za-z_]([A-Za-z_]|[0-9])*(ab|a)*#").parse()
+    with_sets = DFA(SyntaxTree(postfix))
+    with_bits = DFA(SyntaxTree(postfix, bitsets=True))
+    assert with_bits.bitsets and not with_sets.bitsets
+    assert with_bits.class_transitions == with_sets.class_transitions
+    assert with_bits.states == with_sets.states
+    assert with_bits.accepting_states == with_sets.accepting_states
+
+def test_dfa_states_numbered_breadth_first():
+    dfa = DFA(SyntaxTree(RegexParser("(a|b)*abb#").parse()))
+    # Cola FIFO: cada estado nuevo recibe el siguiente id, en orden de descubrimiento
+    order = [dfa.initial_state]
+    for state_id in order:
+        for _, target in sorted(dfa.class_transitions[state_id].items()):
+            if target not in order:
+                order.append(target)
+    assert order == list(range(len(dfa.states)))
+    assert sorted(dfa.states.values()) == list(range(len(dfa.states)))
+    assert dfa.simulate("aabb") and not dfa.simulate("abab")
@@ -0,0 +1,33 @@
+# tests/test_direct_scanner.py
+import random
+from src.controllers.main_controller import compile_global_table, rule_postfix
+from src.generators.direct_scanner import format_direct_scanner, hub_states
+from src.runtime.lexer_interface import match_global
+
+def global_table(regexes):
+    return compile_global_table([{'postfix': rule_postfix(regex), 'action': 'return None'}
+                                 for regex in regexes])
+
+def assert_same_as_table(table, texts):
+    namespace = {}
+    exec(format_direct_scanner(table), namespace)
+    match_direct = namespace['_match_direct']
+    for text in texts:
+        for pos in range(len(text)):
+            for end in (len(text), min(len(text), pos + 3)):
+                assert match_direct(text, pos, end) == match_global(table, text, pos, end)
+
+def test_cycles_go_through_dispatch():
+    # (ab)+ y (a|b)*abb tienen ciclos de más de un estado: necesitan despacho
+    table = global_table(["(ab)+", "(a|b)*abb", "c(de)*f", "[a-z]+", "[ \t]+"])
+    assert len(hub_states(table)) > 1
+    rng = random.Random(0)
+    texts = ["".join(rng.choice("abcdefz \t#") for _ in range(200)) for _ in range(20)]
+    assert_same_as_table(table, texts + ["abababb", "cdededef", "aab"])
+
+def test_long_literal_keeps_nesting_bounded():
+    # Un literal de 200 caracteres en línea superaría los 100 niveles de sangría de Python
+    table = global_table(["(ab)" * 100 + "c", "[a-z]+"])
+    source = format_direct_scanner(table)
+    assert max(len(line) - len(line.lstrip()) for line in source.splitlines()) < 100 * 4
+    assert_same_as_table(table, ["ab" * 100 + "c", "ab" * 99 + "x", "ab" * 100])
@@ -24,3 +24,119 @@ def test_lexer_simple_expression():
         ("EOL",    "\n"),
     ]
     assert tokens == expected
+
+def test_lexer_uses_precomputed_tables():
+    """thelexer.py trae las tablas como datos literales: no hay DFAs que reconstruir."""
+    import thelexer
+    assert thelexer.Lexer.RULES is thelexer.RULES
+    for rule in thelexer.RULES:
+        assert 'dfa' not in rule
+        assert rule['initial'] in rule['transitions']
+        assert rule['accepting'] <= set(rule['transitions'])
+    # Una acción compilada por regla: sin exec al tokenizar
+    assert len(thelexer.Lexer.ACTIONS) == len(thelexer.RULES)
+    assert all(callable(action) for action in thelexer.Lexer.ACTIONS)
+
+def test_lexer_without_actions_is_rejected():
+    from src.runtime.lexer_interface import LexerInterface
+    class NoActions(LexerInterface):
+        RULES = Lexer.RULES
+    with pytest.raises(ValueError, match="ACTIONS"):
+        NoActions("x")
+
+def test_global_and_rules_modes_agree():
+    """El DFA global debe producir exactamente los mismos tokens que probar regla por regla."""
+    with open("inputs/entrada2.txt", encoding="utf-8") as f:
+        src = f.read()
+    assert Lexer(src, mode="global").get_tokens() == Lexer(src, mode="rules").get_tokens()
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 4096])
+def test_iter_tokens_matches_get_tokens(chunk_size):
+    """Los lexemas que cruzan el borde de un bloque deben reconocerse igual que sin bloques."""
+    import io
+    src = "x := 12.5E+3 + while1\n" * 3 + "10.9E-5;\tfin"
+    expected = Lexer(src).get_tokens()
+    assert list(Lexer().iter_tokens(io.StringIO(src), chunk_size=chunk_size)) == expected
+
+def test_bytes_input_matches_str_input():
+    """Una entrada binaria (con caracteres UTF-8 de varios bytes) produce los mismos tokens."""
+    with open("inputs/entrada2.txt", "rb") as f:
+        raw = f.read()
+    expected = Lexer(raw.decode("utf-8")).get_tokens()
+    assert Lexer(raw).get_tokens() == expected
+    assert Lexer(memoryview(raw), mode="rules").get_tokens() == expected
+
+def test_wide_range_tables_match_bytes_and_str():
+    """Una clase por rangos anchos reconoce lo mismo sobre str y sobre su UTF-8."""
+    from src.runtime.lexer_interface import match_table, to_byte_table
+    table = {
+        'initial': 0,
+        'accepting': frozenset({1}),
+        'classes': {'a': 1},
+        'ranges': [(0x00E0, 0x10FFFF, 0)],
+        'transitions': {0: {0: 1, 1: 1}, 1: {0: 1, 1: 1}},
+    }
+    text = "aé€\U0001F600aßz"
+    raw = text.encode("utf-8")
+    assert match_table(table, text, 0, len(text))[0] == 5
+    assert match_table(to_byte_table(table), raw, 0, len(raw))[0] == len("aé€\U0001F600a".encode("utf-8"))
+
+def test_split_points_follow_sync_chars():
+    with open("inputs/entrada2.txt", encoding="utf-8") as f:
+        src = f.read() * 20
+    points = Lexer(src).split_points(chunk_size=100)
+    assert points[0] == 0 and points[-1] == len(src) and len(points) > 2
+    for p in points[1:-1]:
+        assert src[p - 1] in Lexer.SYNC_CHARS
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_parallel_tokens_match_sequential(binary):
+    """Tokenizar por tramos en varios procesos da exactamente los mismos tokens."""
+    with open("inputs/entrada2.txt", encoding="utf-8") as f:
+        src = f.read() * 20
+    expected = Lexer(src).get_tokens()
+    data = src.encode("utf-8") if binary else src
+    assert list(Lexer(data).parallel_tokens(workers=2, chunk_size=100)) == expected
+
+@pytest.mark.parametrize("mode", ["global", "rules"])
+def test_stats_count_without_changing_tokens(mode):
+    src = "x := 12.5E+3 + while1 ( y )\n10;\n"
+    lexer = Lexer(src, mode=mode, stats=True)
+    assert lexer.get_tokens() == Lexer(src, mode=mode).get_tokens()
+    stats = lexer.stats
+    # Cada lexema sale de una regla, del atajo de números o del respaldo sin DFA
+    lexemes = sum(stats.rule_hits) + stats.fast_path_hits + stats.fallback_hits
+    assert stats.tokens <= lexemes
+    assert stats.fast_path_hits == 1
+    assert stats.transitions >= sum(stats.rule_hits)
+    assert stats.as_dict()['rule_hits']
+
+@pytest.mark.parametrize("mode", ["global", "rules"])
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+def test_iter_tokens_stats_match_get_tokens(mode, chunk_size):
+    """Un token que cruza el borde de un bloque se vuelve a escanear, pero se cuenta una sola vez."""
+    import io
+    src = "x := 12.5E+3 + while1 ( y )\n10;\n" * 3 + "continue_ 7.25 @"
+    whole = Lexer(src, mode=mode, stats=True)
+    whole.get_tokens()
+    chunked = Lexer(mode=mode, stats=True)
+    list(chunked.iter_tokens(io.StringIO(src), chunk_size=chunk_size))
+    counters = lambda stats: {key: value for key, value in stats.as_dict().items()
+                              if not key.endswith("_time")}
+    assert counters(chunked.stats) == counters(whole.stats)
+
+def test_stats_disabled_uses_plain_path():
+    lexer = Lexer("x")
+    assert lexer.stats is None
+    assert '_next_token' not in lexer.__dict__
+    assert lexer._scanner() == lexer._scan_global
+
+def test_lexer_is_silent_by_default(capsys):
+    Lexer("x := 1 @\n").get_tokens()
+    assert capsys.readouterr().out == ""
+
+def test_trace_sink_receives_each_token():
+    lines = []
+    tokens = Lexer("x @", trace=lines.append).get_tokens()
+    assert tokens == Lexer("x @").get_tokens()
+    assert lines == ["⟶ Token: 'ID', lexema: 'x'", "⟶ Token no reconocido: '@' en posición 2"]
@@ -0,0 +1,32 @@
+# tests/test_lru_memo.py
+import src.controllers.main_controller as main_controller
+from src.generators.lru_memo import LRUMemo
+
+def test_hits_misses_and_lru_order():
+    memo = LRUMemo("prueba", max_entries=2)
+    assert memo.get_or_compute("a", lambda: "A") == "A"
+    assert memo.get_or_compute("a", lambda: "otro") == "A"
+    memo.put("b", "B")
+    memo.get("a")            # 'a' pasa a ser la más reciente
+    memo.put("c", "C")       # se expulsa 'b'
+    assert memo.get("b") is None
+    assert memo.stats() == {'hits': 2, 'misses': 2, 'evictions': 1, 'entries': 2, 'weight': 2}
+
+def test_weight_bound():
+    memo = LRUMemo("prueba", max_weight=5)
+    memo.put("x", "xxx")
+    memo.put("y", "yyy")     # 6 > 5: se expulsa 'x'
+    assert memo.get("x") is None and memo.get("y") == "yyy"
+    memo.put("z", "z" * 6)   # más pesada que el límite: no se guarda
+    assert memo.get("z") is None and memo.total_weight == 3
+
+def test_recompiling_in_process_builds_no_dfa(monkeypatch):
+    main_controller.compile_spec("inputs/lexer.yal")
+    def fail(*args, **kwargs):
+        raise AssertionError("la tabla debió salir de la memoria")
+    monkeypatch.setattr(main_controller, "compile_rule", fail)
+    monkeypatch.setattr(main_controller, "build_global_dfa", fail)
+    monkeypatch.setattr(main_controller, "RegexParser", fail)
+    hits = main_controller.TABLE_MEMO.hits
+    compiled = main_controller.compile_spec("inputs/lexer.yal")
+    assert main_controller.TABLE_MEMO.hits - hits == len(compiled['rules'])
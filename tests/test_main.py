@@ -0,0 +1,249 @@
+# tests/test_main.py
+import pytest
+from src.controllers.main_controller import build_global_dfa
+
+@pytest.fixture
+def global_dfa():
+    # Palabra clave antes que el identificador genérico: gana en empate
+    rules = [
+        {'regex': 'if', 'action': 'return IF'},
+        {'regex': '([a-z])+', 'action': 'return ID'},
+    ]
+    return build_global_dfa(rules)
+
+def test_global_dfa_priority_on_tie(global_dfa):
+    length, info = global_dfa.match_prefix_and_token("if x")
+    assert length == 2
+    assert info['order'] == 0
+
+def test_global_dfa_longest_match_wins(global_dfa):
+    length, info = global_dfa.match_prefix_and_token("iffy")
+    assert length == 4
+    assert info['order'] == 1
+
+def test_global_dfa_no_match(global_dfa):
+    assert global_dfa.match_prefix_and_token("1") == (0, None)
+
+def test_minimized_global_dfa_keeps_rules():
+    from src.models.mindfa import minimize_dfa
+    rules = [
+        {'regex': 'ab|cb', 'action': 'return AB'},
+        {'regex': '([a-z])+', 'action': 'return ID'},
+    ]
+    dfa = build_global_dfa(rules)
+    min_dfa = minimize_dfa(dfa)
+    # 'a' y 'c' llevan a estados equivalentes: se fusionan
+    assert len(min_dfa.states) < len(dfa.states)
+    for text in ["ab", "cb", "abc", "a", "zz", "1"]:
+        assert min_dfa.match_prefix_and_token(text) == dfa.match_prefix_and_token(text)
+    assert min_dfa.match_prefix_and_token("cb")[1]['order'] == 0
+
+def test_format_action_emits_function():
+    from src.controllers.main_controller import format_action
+    source = format_action(3, "if lexeme:\n        return (ID, lexeme)\n    return None")
+    env = {'ID': 'ID'}
+    exec(source, env)
+    assert env['_action_3']("x", "") == ('ID', 'x')
+    assert env['_action_3']("", "") is None
+
+def test_format_action_rejects_invalid_code():
+    from src.controllers.main_controller import format_action
+    with pytest.raises(ValueError):
+        format_action(0, "return (ID,")
+
+@pytest.fixture
+def without_memos(monkeypatch):
+    # Memorias que no guardan nada: la reutilización sólo puede venir de
+    # 'previous' (la caché en disco), no de compilaciones de otros tests
+    import src.controllers.main_controller as main_controller
+    from src.generators.lru_memo import LRUMemo
+    memos = []
+    for name in ("PARSE_MEMO", "TABLE_MEMO", "GLOBAL_MEMO"):
+        memo = LRUMemo(getattr(main_controller, name).name, max_entries=0)
+        monkeypatch.setattr(main_controller, name, memo)
+        memos.append(memo)
+    monkeypatch.setattr(main_controller, "MEMOS", tuple(memos))
+
+@pytest.fixture
+def empty_memos():
+    import src.controllers.main_controller as main_controller
+    for memo in main_controller.MEMOS:
+        memo.clear()
+    yield
+    for memo in main_controller.MEMOS:
+        memo.clear()
+
+def test_incremental_rebuild_only_changed_rules(tmp_path, monkeypatch, without_memos):
+    import src.controllers.main_controller as main_controller
+    with open("inputs/lexer.yal", encoding="utf-8") as f:
+        spec_text = f.read()
+    spec = tmp_path / "lexer.yal"
+    output = tmp_path / "thelexer.py"
+    cache_dir = str(tmp_path / "cache")
+    spec.write_text(spec_text, encoding="utf-8")
+    main_controller.generate_lexer(str(spec), str(output), cache_dir)
+
+    built = []
+    real_compile_rule = main_controller.compile_rule
+    monkeypatch.setattr(main_controller, "compile_rule",
+                        lambda rule: (built.append(rule['regex']), real_compile_rule(rule)))
+    real_build_global = main_controller.build_global_dfa
+    monkeypatch.setattr(main_controller, "build_global_dfa",
+                        lambda rules: (built.append("global"), real_build_global(rules))[1])
+
+    # Cambiar sólo una acción: no se construye ningún DFA
+    spec.write_text(spec_text.replace("return (WHILE,", "return (LOOP,"), encoding="utf-8")
+    main_controller.generate_lexer(str(spec), str(output), cache_dir)
+    assert built == []
+    assert "return (LOOP," in output.read_text(encoding="utf-8")
+
+    # Cambiar una regex: se reconstruye esa regla y el DFA global
+    spec.write_text(spec_text.replace('"while"', '"loop"'), encoding="utf-8")
+    main_controller.generate_lexer(str(spec), str(output), cache_dir)
+    assert built == ["loop", "global"]
+
+def test_unchanged_output_is_not_rewritten(tmp_path):
+    import os
+    from src.controllers.main_controller import generate_lexer
+    output = tmp_path / "thelexer.py"
+    generate_lexer(output_filename=str(output), cache_dir=str(tmp_path / "cache"))
+    os.utime(output, (0, 0))
+    generate_lexer(output_filename=str(output), cache_dir=str(tmp_path / "cache"))
+    assert os.stat(output).st_mtime == 0
+
+def test_parallel_compilation_matches_sequential(monkeypatch, without_memos):
+    import src.controllers.main_controller as main_controller
+    from concurrent.futures import ProcessPoolExecutor
+    pools = []
+
+    class SpyExecutor(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(main_controller, "ProcessPoolExecutor", SpyExecutor)
+    sequential = main_controller.compile_spec("inputs/lexer.yal")
+    assert pools == []
+    # Sin memorias, ninguna tabla sale de la compilación secuencial: todo pasa por el pool
+    parallel = main_controller.compile_spec("inputs/lexer.yal", workers=2)
+    assert len(pools) == 1
+    assert [(r['regex'], r['action'], r['table']) for r in parallel['rules']] == \
+           [(r['regex'], r['action'], r['table']) for r in sequential['rules']]
+    assert parallel['global'] == sequential['global']
+
+def test_sync_chars_end_every_token():
+    from src.controllers.main_controller import sync_chars
+    # ':' puede seguir con '=' y ';' nunca continúa un token
+    table = {
+        'initial': 0, 'accepting': {1: 0, 2: 0, 3: 1},
+        'classes': {':': 0, '=': 1, ';': 2}, 'ranges': [],
+        'transitions': {0: {0: 1, 2: 3}, 1: {1: 2}, 2: {}, 3: {}},
+    }
+    assert sync_chars([table], {'(': 'LPAREN'}) == frozenset({'=', ';', '('})
+
+def test_generator_is_silent_by_default(tmp_path, capsys):
+    from src.controllers.main_controller import generate_lexer
+    output = str(tmp_path / "thelexer.py")
+    generate_lexer(output_filename=output, cache_dir=None)
+    assert capsys.readouterr().out == ""
+    lines = []
+    generate_lexer(output_filename=output, cache_dir=None, trace=lines.append)
+    assert f"\nAnalizador léxico sin cambios: {output}" in lines
+
+def load_lexer_module(path):
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("lazy_thelexer", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_lazy_lexer_matches_global_mode(tmp_path):
+    from src.controllers.main_controller import generate_lexer
+    from thelexer import Lexer
+    output = tmp_path / "thelexer.py"
+    generate_lexer(output_filename=str(output), cache_dir=None, lazy=True)
+    lazy_module = load_lexer_module(output)
+    assert lazy_module.GLOBAL_DFA is None
+    with open("inputs/entrada2.txt", encoding="utf-8") as f:
+        text = f.read()
+    assert lazy_module.Lexer(text).get_tokens() == Lexer(text).get_tokens()
+    assert lazy_module.Lexer(text, mode="rules").get_tokens() == Lexer(text).get_tokens()
+    with pytest.raises(ValueError):
+        lazy_module.Lexer(text.encode("utf-8"))
+
+def test_lazy_dfa_flush_keeps_tokens(tmp_path):
+    from src.controllers.main_controller import generate_lexer
+    from thelexer import Lexer
+    output = tmp_path / "thelexer.py"
+    generate_lexer(output_filename=str(output), cache_dir=None, lazy=True)
+
+    class SmallLexer(load_lexer_module(output).Lexer):
+        LAZY_MAX_STATES = 3
+
+    with open("inputs/entrada2.txt", encoding="utf-8") as f:
+        text = f.read()
+    assert SmallLexer(text).get_tokens() == Lexer(text).get_tokens()
+    assert SmallLexer._lazy_dfa.flushes > 0
+    assert len(SmallLexer._lazy_dfa.cache) <= 3
+
+def test_direct_lexer_matches_global_mode(tmp_path):
+    from src.controllers.main_controller import generate_lexer
+    from thelexer import Lexer
+    output = tmp_path / "thelexer.py"
+    generate_lexer(output_filename=str(output), cache_dir=None, direct=True)
+    direct_module = load_lexer_module(output)
+    assert direct_module.Lexer.DEFAULT_MODE == "direct"
+    for name in ("entrada.txt", "entrada2.txt"):
+        with open(f"inputs/{name}", encoding="utf-8") as f:
+            text = f.read()
+        expected = Lexer(text).get_tokens()
+        assert direct_module.Lexer(text).get_tokens() == expected
+        assert direct_module.Lexer(text, stats=True).get_tokens() == expected
+        # Entradas que cortan tokens a medias y caracteres fuera de la gramática
+        for cut in (1, 2, 7):
+            assert direct_module.Lexer(text[:-cut] + "é#").get_tokens() == Lexer(text[:-cut] + "é#").get_tokens()
+    with pytest.raises(ValueError):
+        direct_module.Lexer(text.encode("utf-8"))
+    with pytest.raises(ValueError):
+        generate_lexer(output_filename=str(output), cache_dir=None, lazy=True, direct=True)
+
+def test_definition_change_rebuilds_rules_that_use_it(tmp_path, monkeypatch, without_memos):
+    import src.controllers.main_controller as main_controller
+    with open("inputs/lexer.yal", encoding="utf-8") as f:
+        spec_text = f.read()
+    spec = tmp_path / "lexer.yal"
+    output = tmp_path / "thelexer.py"
+    cache_dir = str(tmp_path / "cache")
+    spec.write_text(spec_text, encoding="utf-8")
+    main_controller.generate_lexer(str(spec), str(output), cache_dir)
+
+    built = []
+    real_compile_rule = main_controller.compile_rule
+    monkeypatch.setattr(main_controller, "compile_rule",
+                        lambda rule: (built.append(rule['regex']), real_compile_rule(rule)))
+    # 'digit' la usan 'number' y, a través de 'alnum', 'id'
+    spec.write_text(spec_text.replace("let digit    = ['0'-'9']", "let digit    = ['0'-'7']"),
+                    encoding="utf-8")
+    main_controller.generate_lexer(str(spec), str(output), cache_dir)
+    assert built == ["id", "number"]
+
+def test_memos_alone_rebuild_only_changed_rules(tmp_path, monkeypatch, empty_memos):
+    import src.controllers.main_controller as main_controller
+    with open("inputs/lexer.yal", encoding="utf-8") as f:
+        spec_text = f.read()
+    spec = tmp_path / "lexer.yal"
+    spec.write_text(spec_text, encoding="utf-8")
+    main_controller.compile_spec(str(spec))
+
+    built = []
+    real_compile_rule = main_controller.compile_rule
+    monkeypatch.setattr(main_controller, "compile_rule",
+                        lambda rule: (built.append(rule['regex']), real_compile_rule(rule)))
+    real_build_global = main_controller.build_global_dfa
+    monkeypatch.setattr(main_controller, "build_global_dfa",
+                        lambda rules: (built.append("global"), real_build_global(rules))[1])
+    # Sin 'previous' ni caché en disco: las reglas sin cambios salen de TABLE_MEMO
+    spec.write_text(spec_text.replace('"while"', '"loop"'), encoding="utf-8")
+    compiled = main_controller.compile_spec(str(spec), previous=None)
+    assert built == ["loop", "global"]
+    assert main_controller.TABLE_MEMO.hits == len(compiled['rules']) - 1
@@ -38,3 +38,25 @@ def test_minimize_preserves_language(make_dfa):
     for s in rejected:
         assert not dfa.simulate(s), f"Original no debe aceptar '{s}'"
         assert not min_dfa.simulate(s), f"Mínimo no debe aceptar '{s}'"
+
+def test_minimize_reaches_minimum_size(make_dfa):
+    """(a|b)*abb tiene un DFA mínimo de 4 estados; (a|b)(a|b)* de 2."""
+    assert len(minimize_dfa(make_dfa("(a|b)*abb#")).states) == 4
+    assert len(minimize_dfa(make_dfa("(a|b)(a|b)*#")).states) == 2
+
+def test_minimize_drops_dead_states():
+    """Los estados que no llegan a aceptación desaparecen sin cambiar el lenguaje."""
+    dfa = DFA.__new__(DFA)
+    dfa.states = { frozenset({s}): s for s in range(4) }
+    # 0 -a-> 1 (acepta), 0 -b-> 2 -a-> 3 -a-> 2: 2 y 3 nunca aceptan
+    dfa.class_transitions = {0: {0: 1, 1: 2}, 1: {}, 2: {0: 3}, 3: {0: 2}}
+    dfa.accepting_states = {1}
+    dfa.initial_state = 0
+    dfa.alphabet = {'a', 'b'}
+    dfa.char_classes = [frozenset({'a'}), frozenset({'b'})]
+    dfa.class_of = {'a': 0, 'b': 1}
+    dfa.wide_ranges = dfa.wide_starts = []
+    dfa.class_ranges = [((97, 97),), ((98, 98),)]
+    min_dfa = minimize_dfa(dfa)
+    assert len(min_dfa.states) == 2
+    assert min_dfa.simulate("a") and not min_dfa.simulate("ba")
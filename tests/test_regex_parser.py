@@ -6,7 +6,7 @@ from src.models.regex_parser import RegexParser, Symbol
     ("a|b#", ["a", "|", "b", ".", "#"],      ["a", "b", "#", ".", "|"]),
     ("ab#",  ["a", ".", "b", ".", "#"],      ["a", "b", ".", "#", "."]),
     ("a*#",  ["a", "*", ".", "#"],           ["a", "*", "#", "."]),
-    ("[0-1]#", ["(", "0", "|", "1", ")", ".", "#"], ["0", "1", "|", "#", "."]),
+    ("[0-1]#", ["[0-1]", ".", "#"],          ["[0-1]", "#", "."]),
  ])
 def test_tokenize_and_postfix(pattern, expected_tokens, expected_postfix):
     parser = RegexParser(pattern)
@@ -17,3 +17,26 @@ def test_tokenize_and_postfix(pattern, expected_tokens, expected_postfix):
     # Ignorar el marcador final en la comprobación de postfix
     assert token_vals[:len(expected_tokens)] == expected_tokens
     assert postfix_vals[:len(expected_postfix)] == expected_postfix
+
+def test_bracket_is_single_range_leaf():
+    tokens = RegexParser("").parse_bracket_expression("A-Za-z_")
+    assert len(tokens) == 1
+    assert tokens[0].ranges == ((ord('A'), ord('Z')), (ord('_'), ord('_')), (ord('a'), ord('z')))
+
+def test_bracket_unicode_and_negated_ranges():
+    parser = RegexParser(r"[\u0000-\uffff][^a-z]#")
+    parser.tokenize()
+    assert parser.tokens[0].ranges == ((0, 0xFFFF),)
+    assert parser.tokens[2].ranges == ((0, ord('a') - 1), (ord('z') + 1, 0x10FFFF))
+
+def test_definition_names_become_references():
+    digit = RegexParser("[0-9]").parse()
+    parser = RegexParser("digit+'digit'", {'digit': digit})
+    parser.tokenize()
+    postfix = parser.to_postfix()
+    # El nombre es un único símbolo que comparte la postfija; dentro de comillas es texto
+    assert postfix[0].definition is digit
+    assert [str(t) for t in postfix[1:]] == ["+", "d", ".", "i", ".", "g", ".", "i", ".", "t", "."]
+    assert parser.references == ["digit"]
+    # Sólo palabras completas: 'digits' no es la definición
+    assert RegexParser("digits", {'digit': digit}).tokenize()[0].definition is None
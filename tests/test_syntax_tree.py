@@ -20,3 +20,23 @@ def test_syntax_tree_properties(pattern, nullable, firstpos, lastpos):
     assert root.nullable == nullable
     assert root.firstpos == firstpos
     assert root.lastpos  == lastpos
+
+def test_syntax_tree_bitsets_match_sets():
+    """Con bitsets=True, firstpos/lastpos son máscaras con los mismos bits."""
+    postfix = RegexParser("(a|b)*abb#").parse()
+    sets = SyntaxTree(postfix).raiz
+    bits = SyntaxTree(postfix, bitsets=True).raiz
+    assert bits.firstpos == sum(1 << p for p in sets.firstpos)
+    assert bits.lastpos == sum(1 << p for p in sets.lastpos)
+
+def test_deep_tree_without_recursion():
+    """Un literal de 50 000 caracteres: más de 100 000 nodos en una cadena de concatenaciones."""
+    from src.models.dfa import DFA
+    from src.models.syntax_tree import recorrer
+    postfix = RegexParser("a" * 50000 + "#").parse()
+    tree = SyntaxTree(postfix)
+    assert sum(1 for _ in recorrer(tree.raiz)) > 100000
+    assert not hasattr(tree.raiz, '__dict__')
+    dfa = DFA(tree, lazy=True)
+    assert dfa.followpos[1] == {2}
+    assert dfa.followpos[50000] == {50001}
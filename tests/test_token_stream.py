@@ -0,0 +1,32 @@
+# tests/test_token_stream.py
+import pytest
+from thelexer import Lexer
+from src.runtime.token_stream import TokenStream
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_stream_matches_get_tokens(binary):
+    with open("inputs/entrada2.txt", encoding="utf-8") as f:
+        src = f.read()
+    expected = Lexer(src).get_tokens()
+    stream = Lexer(src.encode("utf-8") if binary else src).get_token_stream()
+    assert len(stream) == len(expected)
+    assert list(stream) == expected
+    assert stream[3:9] == expected[3:9]
+    assert stream[-1] == expected[-1]
+    # Los lexemas salen de la entrada: ningún token necesitó guardarse completo
+    assert stream.overrides == {}
+
+def test_stream_types_allow_fast_counts():
+    stream = Lexer("a b 1.5 c\n").get_token_stream()
+    assert stream.types.count(stream.type_ids['ID']) == 3
+    assert stream.kind(0) == 'ID' and stream.lexeme(0) == 'a'
+    assert stream.starts[2] == 4 and stream.lengths[2] == 3
+
+def test_stream_keeps_values_changed_by_actions():
+    stream = TokenStream("abc 12")
+    stream.append(('ID', 'abc'), 0, 3)
+    stream.append(('NUMBER', 12), 4, 2)
+    stream.append(('EOF',), 6, 0)
+    assert list(stream) == [('ID', 'abc'), ('NUMBER', 12), ('EOF',)]
+    assert set(stream.overrides) == {1, 2}
+    assert stream.lexeme(1) == 12
@@ -32,3 +32,42 @@ def test_rules_extracted(yalex_parser):
             continue
         assert isinstance(regex, str) and regex != ""
         assert action.strip().startswith("return")
+
+def test_nested_definitions_are_parsed_once(tmp_path):
+    from src.models.syntax_tree import SyntaxTree
+    # Cada definición usa dos veces la anterior: sustituir el texto duplicaría su tamaño en cada nivel
+    lines = ["let d0 = 'a'"] + [f"let d{i} = d{i-1} d{i-1}" for i in range(1, 40)]
+    spec = tmp_path / "nested.yal"
+    spec.write_text("\n".join(lines) + "\nrule tokens =\n    d39 { return None }\n", encoding="utf-8")
+    parser = YALexParser(str(spec))
+    parser.parse()
+    postfix = parser.parse_definitions()
+    assert all(len(postfix[f"d{i}"]) == 3 for i in range(1, 40))
+    assert parser.definition_uses["d3"] == ["d0", "d1", "d2"]
+    # Cada uso se copia con posiciones propias al construir el árbol
+    tree = SyntaxTree(postfix["d3"])
+    assert tree.posicion_actual - 1 == 8
+
+def test_forward_definition_reference(tmp_path):
+    from src.controllers.main_controller import compile_global_table, expand_rules
+    from src.runtime.lexer_interface import match_global
+    # 'letter' se declara después de 'id', que la usa
+    spec = tmp_path / "forward.yal"
+    spec.write_text("let id = letter+\nlet letter = ['a'-'z']\n"
+                    "rule tokens =\n    id { return ID }\n", encoding="utf-8")
+    parser = YALexParser(str(spec))
+    parser.parse()
+    assert parser.definition_order() == ["letter", "id"]
+    parser.parse_definitions()
+    assert parser.definition_uses["id"] == ["letter"]
+    table = compile_global_table(expand_rules(parser))
+    assert match_global(table, "abc letterr", 0, 11)[:2] == (3, 0)
+
+def test_recursive_definition_is_an_error(tmp_path):
+    spec = tmp_path / "cycle.yal"
+    spec.write_text("let a = b 'x'\nlet b = a | 'y'\nrule tokens =\n    a { return None }\n",
+                    encoding="utf-8")
+    parser = YALexParser(str(spec))
+    parser.parse()
+    with pytest.raises(ValueError, match="a -> b -> a"):
+        parser.parse_definitions()
@@ -1,5 +1,5 @@
 # Código generado automáticamente por YALex
-import re
+from src.runtime.lexer_interface import LexerInterface
 from src.runtime.token_types import *
 
 # Mapa de puntuaciones generado según las reglas de la gramática
@@ -30,379 +30,813 @@ PUNCTUATIONS = {
     '#': HASH,
 }
 
-class Lexer:
-    def __init__(self, input_text):
-        self.input_text = input_text
-        self.pos = 0
-
-    def get_tokens(self):
-        tokens = []
-        text = self.input_text
-        pos = 0
-        while pos < len(text):
-            m = re.match(r'\d+\.\d+(?:[eE][+-]?\d+)?', text[pos:])
-            if m:
-                lexeme = m.group(0)
-                tokens.append((NUMBER, lexeme))
-                print(f'⟶ Token: {NUMBER!r}, lexema: {lexeme!r}')
-                pos += len(lexeme)
-                continue
-            longest_match = 0
-            selected_rule = None
-            for rule in self.rules:
-                ml = rule['dfa'].match_prefix(text[pos:])
-                if ml > longest_match:
-                    longest_match = ml
-                    selected_rule = rule
-            if longest_match > 1:
-                lexeme = text[pos:pos+longest_match]
-                action_code = selected_rule['action']
-                local_env = {'lexeme': lexeme, 'text': text}
-                exec(action_code.replace('return', 'token ='), globals(), local_env)
-                tok = local_env.get('token')
-                if tok is not None:
-                    # si la acción ya devolvió (TOKEN, lexeme), lo usamos directamente
-                    if isinstance(tok, tuple):
-                        tokens.append(tok)
-                    else:
-                        tokens.append((tok, lexeme))
-                    print(f'⟶ Token: {tok!r}, lexema: {lexeme!r}')
-                pos += longest_match
-                continue
-            if longest_match == 1:
-                # Ejecutamos la acción (puede ser None para ws)
-                lexeme = text[pos]
-                action_code = selected_rule['action']
-                local_env = {'lexeme': lexeme, 'text': text}
-                exec(action_code.replace('return', 'token ='), globals(), local_env)
-                tok = local_env.get('token')
-                if tok is not None:
-                    # si la acción ya devolvió (TOKEN, lexeme), lo usamos directamente
-                    if isinstance(tok, tuple):
-                        tokens.append(tok)
-                    else:
-                        tokens.append((tok, lexeme))
-                    print(f'⟶ Token: {tok!r}, lexema: {lexeme!r}')
-                pos += 1
-                continue
-            ch = text[pos]
-            mapped = PUNCTUATIONS.get(ch)
-            if mapped is not None:
-                tokens.append((mapped, ch))
-                print(f'⟶ Token: {mapped!r}, lexema: {ch!r}')
-                pos += 1
-                continue
-            # Carácter no declarado en la gramática: lo marcamos como UNKNOWN y continuamos
-            ch = text[pos]
-            print(f"⟶ Token no reconocido: {ch!r} en posición {pos}")
-            tokens.append((None, ch))  # None indica token no reconocido
-            pos += 1
-            continue
-        tokens.append((EOF, ''))
-        return tokens
-
-    @property
-    def rules(self):
-        rules = []
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: (([\  \\t])+)
-        parser = RegexParser('(([\\  \\\\t])+)' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '(([\\  \\\\t])+)', 'action': 'return None', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: \#\#\#.*[\n]
-        parser = RegexParser('\\#\\#\\#.*[\\n]' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '\\#\\#\\#.*[\\n]', 'action': 'return None', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: \n
-        parser = RegexParser('\\n' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '\\n', 'action': 'return EOL', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: if
-        parser = RegexParser('if' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': 'if', 'action': 'return (IF,       lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: else
-        parser = RegexParser('else' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': 'else', 'action': 'return (ELSE,     lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: while
-        parser = RegexParser('while' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': 'while', 'action': 'return (WHILE,    lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: for
-        parser = RegexParser('for' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': 'for', 'action': 'return (FOR,      lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: return
-        parser = RegexParser('return' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': 'return', 'action': 'return (RETURN,   lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: break
-        parser = RegexParser('break' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': 'break', 'action': 'return (BREAK,    lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: continue
-        parser = RegexParser('continue' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': 'continue', 'action': 'return (CONTINUE, lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: (([A-Za-z]) ((([A-Za-z]) | ([0-9]) | _))*)
-        parser = RegexParser('(([A-Za-z]) ((([A-Za-z]) | ([0-9]) | _))*)' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '(([A-Za-z]) ((([A-Za-z]) | ([0-9]) | _))*)', 'action': 'return (ID,       lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: (([0-9])+(\.([0-9])+)?(E(\+|\-)?([0-9])+)?)
-        parser = RegexParser('(([0-9])+(\\.([0-9])+)?(E(\\+|\\-)?([0-9])+)?)' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '(([0-9])+(\\.([0-9])+)?(E(\\+|\\-)?([0-9])+)?)', 'action': 'return (NUMBER,   lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: :=
-        parser = RegexParser(':=' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': ':=', 'action': 'return (ASSIGNOP, lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: \+
-        parser = RegexParser('\\+' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '\\+', 'action': 'return (PLUS,     lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: \-
-        parser = RegexParser('\\-' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '\\-', 'action': 'return (MINUS,    lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: \*
-        parser = RegexParser('\\*' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '\\*', 'action': 'return (TIMES,    lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: /
-        parser = RegexParser('/' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '/', 'action': 'return (DIV,      lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: \(
-        parser = RegexParser('\\(' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '\\(', 'action': 'return (LPAREN,   lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: \)
-        parser = RegexParser('\\)' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '\\)', 'action': 'return (RPAREN,   lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: ,
-        parser = RegexParser(',' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': ',', 'action': 'return (COMMA,    lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: ;
-        parser = RegexParser(';' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': ';', 'action': 'return (SEMICOLON,lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: :
-        parser = RegexParser(':' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': ':', 'action': 'return (COLON,    lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: <
-        parser = RegexParser('<' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '<', 'action': 'return (LT,       lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: =
-        parser = RegexParser('=' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '=', 'action': 'return (EQ,       lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: >
-        parser = RegexParser('>' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '>', 'action': 'return (GT,       lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: \{
-        parser = RegexParser('\\{' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '\\{', 'action': 'return (LBRACE,   lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: \}
-        parser = RegexParser('\\}' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '\\}', 'action': 'return (RBRACE,   lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: \#
-        parser = RegexParser('\\#' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '\\#', 'action': 'return (HASH,     lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: eof
-        parser = RegexParser('eof' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': 'eof', 'action': 'return (EOF,      lexeme)', 'dfa': dfa})
-        from src.models.regex_parser import RegexParser
-        from src.models.syntax_tree import SyntaxTree
-        from src.models.dfa import DFA
-        # Regla: .
-        parser = RegexParser('.' + '#')
-        parser.tokenize()
-        postfix = parser.to_postfix()
-        syntax_tree = SyntaxTree(postfix)
-        dfa = DFA(syntax_tree)
-        rules.append({'regex': '.', 'action': 'return (SYMBOL,   lexeme)', 'dfa': dfa})
-        return rules
+# Acciones de las reglas: una llamada por token, sin exec
+def _action_0(lexeme, text):
+    return None
+
+def _action_1(lexeme, text):
+    return None
+
+def _action_2(lexeme, text):
+    return EOL
+
+def _action_3(lexeme, text):
+    return (IF,       lexeme)
+
+def _action_4(lexeme, text):
+    return (ELSE,     lexeme)
+
+def _action_5(lexeme, text):
+    return (WHILE,    lexeme)
+
+def _action_6(lexeme, text):
+    return (FOR,      lexeme)
+
+def _action_7(lexeme, text):
+    return (RETURN,   lexeme)
+
+def _action_8(lexeme, text):
+    return (BREAK,    lexeme)
+
+def _action_9(lexeme, text):
+    return (CONTINUE, lexeme)
+
+def _action_10(lexeme, text):
+    return (ID,       lexeme)
+
+def _action_11(lexeme, text):
+    return (NUMBER,   lexeme)
+
+def _action_12(lexeme, text):
+    return (ASSIGNOP, lexeme)
+
+def _action_13(lexeme, text):
+    return (PLUS,     lexeme)
+
+def _action_14(lexeme, text):
+    return (MINUS,    lexeme)
+
+def _action_15(lexeme, text):
+    return (TIMES,    lexeme)
+
+def _action_16(lexeme, text):
+    return (DIV,      lexeme)
+
+def _action_17(lexeme, text):
+    return (LPAREN,   lexeme)
+
+def _action_18(lexeme, text):
+    return (RPAREN,   lexeme)
+
+def _action_19(lexeme, text):
+    return (COMMA,    lexeme)
+
+def _action_20(lexeme, text):
+    return (SEMICOLON,lexeme)
+
+def _action_21(lexeme, text):
+    return (COLON,    lexeme)
+
+def _action_22(lexeme, text):
+    return (LT,       lexeme)
+
+def _action_23(lexeme, text):
+    return (EQ,       lexeme)
+
+def _action_24(lexeme, text):
+    return (GT,       lexeme)
+
+def _action_25(lexeme, text):
+    return (LBRACE,   lexeme)
+
+def _action_26(lexeme, text):
+    return (RBRACE,   lexeme)
+
+def _action_27(lexeme, text):
+    return (HASH,     lexeme)
+
+def _action_28(lexeme, text):
+    return (EOF,      lexeme)
+
+def _action_29(lexeme, text):
+    return (SYMBOL,   lexeme)
+
+ACTIONS = [
+    _action_0,
+    _action_1,
+    _action_2,
+    _action_3,
+    _action_4,
+    _action_5,
+    _action_6,
+    _action_7,
+    _action_8,
+    _action_9,
+    _action_10,
+    _action_11,
+    _action_12,
+    _action_13,
+    _action_14,
+    _action_15,
+    _action_16,
+    _action_17,
+    _action_18,
+    _action_19,
+    _action_20,
+    _action_21,
+    _action_22,
+    _action_23,
+    _action_24,
+    _action_25,
+    _action_26,
+    _action_27,
+    _action_28,
+    _action_29,
+]
+
+# Tablas de transición precalculadas: el lexer no reconstruye ningún DFA.
+# 'classes' lleva cada carácter a su clase ('ranges' cubre los intervalos anchos);
+# 'transitions' está indexada por clase.
+RULES = [
+    {
+        'regex': 'ws',
+        'action': 'return None',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '\t': 0, ' ': 0, '\\': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {0: 1},
+        },
+    },
+    {
+        'regex': '"###".*[\\n]',
+        'action': 'return None',
+        'initial': 0,
+        'accepting': frozenset([4]),
+        'classes': {
+            '\n': 0,
+            '.': 1,
+            '\\#': 2,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {2: 1},
+            1: {2: 2},
+            2: {2: 3},
+            3: {0: 4, 1: 3},
+            4: {},
+        },
+    },
+    {
+        'regex': '\\n',
+        'action': 'return EOL',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '\n': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': 'if',
+        'action': 'return (IF,       lexeme)',
+        'initial': 0,
+        'accepting': frozenset([2]),
+        'classes': {
+            'f': 0,
+            'i': 1,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {1: 1},
+            1: {0: 2},
+            2: {},
+        },
+    },
+    {
+        'regex': 'else',
+        'action': 'return (ELSE,     lexeme)',
+        'initial': 0,
+        'accepting': frozenset([4]),
+        'classes': {
+            'e': 0,
+            'l': 1,
+            's': 2,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {1: 2},
+            2: {2: 3},
+            3: {0: 4},
+            4: {},
+        },
+    },
+    {
+        'regex': 'while',
+        'action': 'return (WHILE,    lexeme)',
+        'initial': 0,
+        'accepting': frozenset([5]),
+        'classes': {
+            'e': 0,
+            'h': 1,
+            'i': 2,
+            'l': 3,
+            'w': 4,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {4: 1},
+            1: {1: 2},
+            2: {2: 3},
+            3: {3: 4},
+            4: {0: 5},
+            5: {},
+        },
+    },
+    {
+        'regex': 'for',
+        'action': 'return (FOR,      lexeme)',
+        'initial': 0,
+        'accepting': frozenset([3]),
+        'classes': {
+            'f': 0,
+            'o': 1,
+            'r': 2,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {1: 2},
+            2: {2: 3},
+            3: {},
+        },
+    },
+    {
+        'regex': 'return',
+        'action': 'return (RETURN,   lexeme)',
+        'initial': 0,
+        'accepting': frozenset([6]),
+        'classes': {
+            'e': 0,
+            'n': 1,
+            'r': 2,
+            't': 3,
+            'u': 4,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {2: 1},
+            1: {0: 2},
+            2: {3: 3},
+            3: {4: 4},
+            4: {2: 5},
+            5: {1: 6},
+            6: {},
+        },
+    },
+    {
+        'regex': 'break',
+        'action': 'return (BREAK,    lexeme)',
+        'initial': 0,
+        'accepting': frozenset([5]),
+        'classes': {
+            'a': 0,
+            'b': 1,
+            'e': 2,
+            'k': 3,
+            'r': 4,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {1: 1},
+            1: {4: 2},
+            2: {2: 3},
+            3: {0: 4},
+            4: {3: 5},
+            5: {},
+        },
+    },
+    {
+        'regex': 'continue',
+        'action': 'return (CONTINUE, lexeme)',
+        'initial': 0,
+        'accepting': frozenset([8]),
+        'classes': {
+            'c': 0,
+            'e': 1,
+            'i': 2,
+            'n': 3,
+            'o': 4,
+            't': 5,
+            'u': 6,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {4: 2},
+            2: {3: 3},
+            3: {5: 4},
+            4: {2: 5},
+            5: {3: 6},
+            6: {6: 7},
+            7: {1: 8},
+            8: {},
+        },
+    },
+    {
+        'regex': 'id',
+        'action': 'return (ID,       lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '0': 0, '1': 0, '2': 0, '3': 0, '4': 0, '5': 0, '6': 0, '7': 0, '8': 0, '9': 0, '_': 0,
+            'A': 1, 'B': 1, 'C': 1, 'D': 1, 'E': 1, 'F': 1, 'G': 1, 'H': 1, 'I': 1, 'J': 1, 'K': 1, 'L': 1, 'M': 1, 'N': 1, 'O': 1, 'P': 1, 'Q': 1, 'R': 1, 'S': 1, 'T': 1, 'U': 1, 'V': 1, 'W': 1, 'X': 1, 'Y': 1, 'Z': 1, 'a': 1, 'b': 1, 'c': 1, 'd': 1, 'e': 1, 'f': 1, 'g': 1, 'h': 1, 'i': 1, 'j': 1, 'k': 1, 'l': 1, 'm': 1, 'n': 1, 'o': 1, 'p': 1, 'q': 1, 'r': 1, 's': 1, 't': 1, 'u': 1, 'v': 1, 'w': 1, 'x': 1, 'y': 1, 'z': 1,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {1: 1},
+            1: {0: 1, 1: 1},
+        },
+    },
+    {
+        'regex': 'number',
+        'action': 'return (NUMBER,   lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1, 3, 5, 7, 8]),
+        'classes': {
+            '0': 0, '1': 0, '2': 0, '3': 0, '4': 0, '5': 0, '6': 0, '7': 0, '8': 0, '9': 0,
+            'E': 1,
+            'ε': 2,
+            '\\+': 3, '\\-': 3,
+            '\\.': 4,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {0: 1, 1: 2, 2: 3, 4: 4},
+            2: {0: 5, 2: 6, 3: 6},
+            3: {1: 2, 2: 7},
+            4: {0: 8},
+            5: {0: 5},
+            6: {0: 5},
+            7: {},
+            8: {0: 8, 1: 2, 2: 7},
+        },
+    },
+    {
+        'regex': ':=',
+        'action': 'return (ASSIGNOP, lexeme)',
+        'initial': 0,
+        'accepting': frozenset([2]),
+        'classes': {
+            ':': 0,
+            '=': 1,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {1: 2},
+            2: {},
+        },
+    },
+    {
+        'regex': '\\+',
+        'action': 'return (PLUS,     lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '\\+': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '\\-',
+        'action': 'return (MINUS,    lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '\\-': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '\\*',
+        'action': 'return (TIMES,    lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '\\*': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '/',
+        'action': 'return (DIV,      lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '/': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '\\(',
+        'action': 'return (LPAREN,   lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '\\(': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '\\)',
+        'action': 'return (RPAREN,   lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '\\)': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': ',',
+        'action': 'return (COMMA,    lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            ',': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': ';',
+        'action': 'return (SEMICOLON,lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            ';': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': ':',
+        'action': 'return (COLON,    lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            ':': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '<',
+        'action': 'return (LT,       lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '<': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '=',
+        'action': 'return (EQ,       lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '=': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '>',
+        'action': 'return (GT,       lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '>': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '\\{',
+        'action': 'return (LBRACE,   lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '\\{': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '\\}',
+        'action': 'return (RBRACE,   lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '\\}': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': '\\#',
+        'action': 'return (HASH,     lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '\\#': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+    {
+        'regex': 'eof',
+        'action': 'return (EOF,      lexeme)',
+        'initial': 0,
+        'accepting': frozenset([3]),
+        'classes': {
+            'e': 0,
+            'f': 1,
+            'o': 2,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {2: 2},
+            2: {1: 3},
+            3: {},
+        },
+    },
+    {
+        'regex': '.',
+        'action': 'return (SYMBOL,   lexeme)',
+        'initial': 0,
+        'accepting': frozenset([1]),
+        'classes': {
+            '.': 0,
+        },
+        'ranges': [],
+        'transitions': {
+            0: {0: 1},
+            1: {},
+        },
+    },
+]
+
+# DFA global: todas las reglas en un solo autómata
+GLOBAL_DFA = {
+    'initial': 0,
+    'accepting': {
+        1: 0,
+        2: 2,
+        3: 19,
+        4: 29,
+        5: 16,
+        6: 11,
+        7: 21,
+        8: 20,
+        9: 22,
+        10: 23,
+        11: 24,
+        12: 10,
+        13: 10,
+        14: 10,
+        15: 10,
+        16: 10,
+        17: 10,
+        18: 10,
+        19: 10,
+        20: 27,
+        21: 17,
+        22: 18,
+        23: 15,
+        24: 13,
+        25: 14,
+        26: 25,
+        27: 26,
+        29: 11,
+        31: 12,
+        32: 10,
+        33: 10,
+        34: 10,
+        35: 10,
+        36: 3,
+        37: 10,
+        38: 10,
+        40: 11,
+        42: 11,
+        43: 11,
+        44: 10,
+        45: 10,
+        46: 10,
+        47: 6,
+        48: 10,
+        49: 10,
+        51: 10,
+        52: 10,
+        53: 4,
+        54: 10,
+        55: 10,
+        56: 1,
+        57: 8,
+        58: 10,
+        59: 10,
+        60: 5,
+        61: 10,
+        62: 7,
+        63: 10,
+        64: 9,
+    },
+    'classes': {
+        '\t': 0, ' ': 0, '\\': 0,
+        '\n': 1,
+        ',': 2,
+        '.': 3,
+        '/': 4,
+        '0': 5, '1': 5, '2': 5, '3': 5, '4': 5, '5': 5, '6': 5, '7': 5, '8': 5, '9': 5,
+        ':': 6,
+        ';': 7,
+        '<': 8,
+        '=': 9,
+        '>': 10,
+        'A': 11, 'B': 11, 'C': 11, 'D': 11, 'F': 11, 'G': 11, 'H': 11, 'I': 11, 'J': 11, 'K': 11, 'L': 11, 'M': 11, 'N': 11, 'O': 11, 'P': 11, 'Q': 11, 'R': 11, 'S': 11, 'T': 11, 'U': 11, 'V': 11, 'W': 11, 'X': 11, 'Y': 11, 'Z': 11, 'd': 11, 'g': 11, 'j': 11, 'm': 11, 'p': 11, 'q': 11, 'v': 11, 'x': 11, 'y': 11, 'z': 11,
+        'E': 12,
+        '_': 13,
+        'a': 14,
+        'b': 15,
+        'c': 16,
+        'e': 17,
+        'f': 18,
+        'h': 19,
+        'i': 20,
+        'k': 21,
+        'l': 22,
+        'n': 23,
+        'o': 24,
+        'r': 25,
+        's': 26,
+        't': 27,
+        'u': 28,
+        'w': 29,
+        'ε': 30,
+        '\\#': 31,
+        '\\(': 32,
+        '\\)': 33,
+        '\\*': 34,
+        '\\+': 35,
+        '\\-': 36,
+        '\\.': 37,
+        '\\{': 38,
+        '\\}': 39,
+    },
+    'ranges': [],
+    'transitions': {
+        0: {0: 1, 1: 2, 2: 3, 3: 4, 4: 5, 5: 6, 6: 7, 7: 8, 8: 9, 9: 10, 10: 11, 11: 12, 12: 12, 14: 12, 15: 13, 16: 14, 17: 15, 18: 16, 19: 12, 20: 17, 21: 12, 22: 12, 23: 12, 24: 12, 25: 18, 26: 12, 27: 12, 28: 12, 29: 19, 31: 20, 32: 21, 33: 22, 34: 23, 35: 24, 36: 25, 38: 26, 39: 27},
+        1: {0: 1},
+        2: {},
+        3: {},
+        4: {},
+        5: {},
+        6: {5: 6, 12: 28, 30: 29, 37: 30},
+        7: {9: 31},
+        8: {},
+        9: {},
+        10: {},
+        11: {},
+        12: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        13: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 32, 26: 12, 27: 12, 28: 12, 29: 12},
+        14: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 33, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        15: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 34, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        16: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 35, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        17: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 36, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        18: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 37, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        19: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 38, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        20: {31: 39},
+        21: {},
+        22: {},
+        23: {},
+        24: {},
+        25: {},
+        26: {},
+        27: {},
+        28: {5: 40, 30: 41, 35: 41, 36: 41},
+        29: {12: 28, 30: 42},
+        30: {5: 43},
+        31: {},
+        32: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 44, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        33: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 45, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        34: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 46, 27: 12, 28: 12, 29: 12},
+        35: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 47, 26: 12, 27: 12, 28: 12, 29: 12},
+        36: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        37: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 48, 28: 12, 29: 12},
+        38: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 49, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        39: {31: 50},
+        40: {5: 40},
+        41: {5: 40},
+        42: {},
+        43: {5: 43, 12: 28, 30: 42},
+        44: {5: 12, 11: 12, 12: 12, 13: 12, 14: 51, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        45: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 52, 28: 12, 29: 12},
+        46: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 53, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        47: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        48: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 54, 29: 12},
+        49: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 55, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        50: {1: 56, 3: 50},
+        51: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 57, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        52: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 58, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        53: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        54: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 59, 26: 12, 27: 12, 28: 12, 29: 12},
+        55: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 60, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        56: {},
+        57: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        58: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 61, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        59: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 62, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        60: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        61: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 63, 29: 12},
+        62: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        63: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 64, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+        64: {5: 12, 11: 12, 12: 12, 13: 12, 14: 12, 15: 12, 16: 12, 17: 12, 18: 12, 19: 12, 20: 12, 21: 12, 22: 12, 23: 12, 24: 12, 25: 12, 26: 12, 27: 12, 28: 12, 29: 12},
+    },
+}
+
+# Caracteres tras los cuales siempre termina un token
+SYNC_CHARS = frozenset(['\n', '#', '(', ')', '*', ',', '/', ';', '<', '=', '>', '{', '}'])
+
+class Lexer(LexerInterface):
+    RULES = RULES
+    ACTIONS = ACTIONS
+    GLOBAL_DFA = GLOBAL_DFA
+    PUNCTUATIONS = PUNCTUATIONS
+    SYNC_CHARS = SYNC_CHARS
+    NUMBER_TOKEN = NUMBER
+    EOF_TOKEN = EOF
 